@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from action import Action
+from transition import Transition
+from log_histogram import LogHistogram
+from launcher import load_configs
+from decision_service import DecisionService, build_online_cores, record_latency, latency_report
+
+class SocketClient:
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self.reader: asyncio.StreamReader = None
+        self.writer: asyncio.StreamWriter = None
+        self.next_id = 0
+
+    async def connect(self):
+        (self.reader, self.writer,) = await asyncio.open_unix_connection(self.socket_path)
+
+    async def request(self, request: dict) -> dict:
+        self.next_id += 1
+        self.writer.write(json.dumps({'id': self.next_id, **request}).encode() + b'\n')
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def replay_core(request, core_id, model: Transition, latencies: LogHistogram) -> dict:
+    decisions, misses, sources = 0, 0, {}
+    state, arrived = (await request({'type': 'reset', 'core': core_id}))['state'], 0
+    while True:
+        if arrived == state['task-num'] < model.no_tasks:
+            await request({'type': 'arrival', 'core': core_id, 'task': arrived, 'time': model.tasks.arrival_time.item(arrived)})
+            arrived += 1
+        start = time.perf_counter()
+        response = await request({'type': 'decide', 'core': core_id})
+        record_latency(latencies, time.perf_counter() - start)
+        if response['status'] != 'active':
+            break
+        decisions += 1
+        misses += (response['action'] == str(Action.MISS))
+        sources[response['source']] = sources.get(response['source'], 0) + 1
+        state = response['state']
+        if 'task' in response:
+            state = (await request({'type': 'completion', 'core': core_id, 'task': response['task'], 'time': response['finish']}))['state']
+    return {'status': response['status'], 'decisions': decisions, 'misses': misses, 'consumed-energy': state['consumed-energy'],
+            'sources': sources}
+
+async def generate_load(service: DecisionService, socket_path, rounds) -> dict:
+    latencies, clients, requests = LogHistogram(), [], {}
+    if socket_path is None:
+        await service.start()
+    for core_id in service.models:
+        requests[core_id] = service.request
+        if socket_path is not None:
+            client = SocketClient(socket_path)
+            await client.connect()
+            clients.append(client)
+            requests[core_id] = client.request
+    start, results = time.perf_counter(), []
+    for i in range(rounds):
+        results += await asyncio.gather(*[replay_core(requests[core_id], core_id, model, latencies) 
+                                          for (core_id, model,) in service.models.items()])
+    elapsed = time.perf_counter() - start
+
+    if socket_path is None:
+        await service.stop()
+        service_report = service.report()
+    else:
+        service_report = (await clients[0].request({'type': 'report'}))['report']
+        for client in clients:
+            await client.close()
+    core_ids = [core_id for i in range(rounds) for core_id in service.models]
+    return {
+        'requests': latencies.count,
+        'requests-per-second': latencies.count / elapsed,
+        'client-latency': latency_report(latencies),
+        'replays': [{'core': service.cores[core_id].get_full_name(), **result} for (core_id, result,) in zip(core_ids, results)],
+        'service': service_report
+    }
+
+def run(config_path, seed, socket_path=None, rounds=1, batch_size=None, batch_window_ms=None, learn=True) -> dict:
+    core_config, qscheduler_config, simulation_config = load_configs(config_path)
+    (qscheduler, cores,) = build_online_cores(core_config, qscheduler_config, simulation_config, seed)
+    service = DecisionService(qscheduler, cores, simulation_config['duration'],
+                              (batch_size if batch_size is not None else qscheduler_config['decision-batch-size']),
+                              (batch_window_ms if batch_window_ms is not None else qscheduler_config['decision-batch-window-ms']) / 1000)
+    if socket_path is None:
+        service.prepare(seed, learn)
+    else:
+        service.prepare_models()
+    return asyncio.run(generate_load(service, socket_path, rounds))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Drive the online decision service with a synthetic PTaskGenerator workload.')
+    parser.add_argument('--config-path', default='configs')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--socket', default=None)
+    parser.add_argument('--rounds', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--batch-window-ms', type=float, default=None)
+    parser.add_argument('--no-learn', action='store_true')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    report = run(args.config_path, args.seed, args.socket, args.rounds, args.batch_size, args.batch_window_ms, not args.no_learn)
+    for replay in report['replays']:
+        print(f'{replay["core"]:<24} {replay["status"]:<9} decisions={replay["decisions"]:<6} misses={replay["misses"]:<4} '
+              f'sources={replay["sources"]}')
+    latency = report['client-latency']
+    print(f'{report["requests"]} requests, {report["requests-per-second"]:.0f}/s, latency p50={latency["p50-us"]:.1f}us '
+          f'p95={latency["p95-us"]:.1f}us p99={latency["p99-us"]:.1f}us max={latency["max-us"]:.1f}us')
+    if args.output is not None:
+        json.dump(report, open(args.output, 'w'), indent=4)
@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from core import Core
+from ptask_generator import PTaskGenerator
+from partitioner import PARTITIONERS, map_ptasks
+from launcher import load_configs, build_cores, build_qscheduler
+
+def legacy_worst_fit(cores, ptasks):
+    for ptask in ptasks:
+        candidate_core: Core = None
+        for core in cores:
+            if (core.available_resource >= ptask.needed_resource() and
+                (candidate_core == None or core.available_resource > candidate_core.available_resource)):
+                candidate_core = core
+        if candidate_core == None:
+            raise ValueError('Core mapping failed.')
+        candidate_core.add_ptask(ptask)
+
+def replicate_cores(core_config, simulation_config, no_cores):
+    core_templates = list(simulation_config['cores'].values())
+    cores_config = {str(i + 1): core_templates[i % len(core_templates)] for i in range(no_cores)}
+    return build_cores(core_config, {**simulation_config, 'cores': cores_config})
+
+def generate_ptasks(cores, simulation_config, task_set_size, utilization, seed):
+    random.seed(seed)
+    total_cpu_resource = sum(core.available_resource for core in cores)
+    return PTaskGenerator().generate(task_set_size, utilization, total_cpu_resource, simulation_config['task-periods'],
+                                     simulation_config['real-time-modes'], simulation_config['second-slice-size'])
+
+def mapping_time(core_config, simulation_config, no_cores, task_set_size, utilization, repeat):
+    ptasks = generate_ptasks(replicate_cores(core_config, simulation_config, no_cores), simulation_config, task_set_size, utilization, 0)
+    mappers = {'legacy-worst-fit': legacy_worst_fit,
+               **{name: (lambda cores, ptasks, name=name: map_ptasks(name, cores, ptasks)) for name in PARTITIONERS}}
+    times = {}
+    for (name, mapper,) in mappers.items():
+        runs = []
+        for i in range(repeat):
+            cores = replicate_cores(core_config, simulation_config, no_cores)
+            start = timeit.default_timer()
+            try:
+                mapper(cores, ptasks)
+                mapped = True
+            except ValueError:
+                mapped = False
+            runs.append(timeit.default_timer() - start)
+        times[name] = (min(runs), mapped)
+    return times
+
+def acceptance_ratio(core_config, simulation_config, utilizations, no_task_sets):
+    ratios = {name: [] for name in PARTITIONERS}
+    total_cpu_resource = sum(core.available_resource for core in build_cores(core_config, simulation_config))
+    for utilization in utilizations:
+        accepted = {name: 0 for name in PARTITIONERS}
+        batch = PTaskGenerator().generate_batch(no_task_sets, simulation_config['task-set-size'], utilization, total_cpu_resource,
+                                                simulation_config['task-periods'], simulation_config['real-time-modes'],
+                                                simulation_config['second-slice-size'], seed=0)
+        for index in range(no_task_sets):
+            ptasks = batch.ptasks(index)
+            for name in PARTITIONERS:
+                try:
+                    map_ptasks(name, build_cores(core_config, simulation_config), ptasks)
+                    accepted[name] += 1
+                except ValueError:
+                    pass
+        for name in PARTITIONERS:
+            ratios[name].append(accepted[name] / no_task_sets)
+    return ratios
+
+def schedulability(core_config, qscheduler_config, simulation_config, utilization, no_task_sets):
+    qscheduler_config = {**qscheduler_config, 'seed': 0, 'execution-mode': 'sequential', 'retry': 1}
+    results = {}
+    for name in PARTITIONERS:
+        scheduled_cores, total_cores, missed_tasks = 0, 0, 0
+        for seed in range(no_task_sets):
+            ptasks = generate_ptasks(build_cores(core_config, simulation_config), simulation_config,
+                                     simulation_config['task-set-size'], utilization, seed)
+            cores = build_cores(core_config, simulation_config)
+            qscheduler = build_qscheduler({**qscheduler_config, 'mapping-algorithm': name}, simulation_config)
+            try:
+                qscheduler.map_ptasks_to_cores(cores, ptasks)
+            except ValueError:
+                total_cores += len(cores)
+                continue
+            for core in cores:
+                total_cores += 1
+                try:
+                    qscheduler.schedule_core(core, simulation_config['duration'], seed)
+                    scheduled_cores += 1
+                    missed_tasks += len(core.missed_tasks)
+                except ValueError:
+                    pass
+        results[name] = {'scheduled-cores': scheduled_cores / total_cores, 'missed-tasks': missed_tasks}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare core mapping algorithms by mapping time and resulting schedulability.')
+    parser.add_argument('--config-path', default='configs')
+    parser.add_argument('--cores', type=int, default=512)
+    parser.add_argument('--ptasks', type=int, default=8192)
+    parser.add_argument('--task-sets', type=int, default=200)
+    parser.add_argument('--learn', action='store_true')
+    parser.add_argument('--episodes', type=int, default=2000)
+    parser.add_argument('--duration', type=int, default=5)
+    args = parser.parse_args()
+    core_config, qscheduler_config, simulation_config = load_configs(args.config_path)
+
+    times = mapping_time(core_config, simulation_config, args.cores, args.ptasks, 0.7, 3)
+    print(f'Mapping {args.ptasks} ptasks onto {args.cores} cores at utilization 0.7:')
+    for (name, (seconds, mapped,),) in times.items():
+        print(f'  {name:<22} {seconds * 1000:9.2f} ms   speedup over legacy: {times["legacy-worst-fit"][0] / seconds:6.2f}x   '
+              f'{"mapped" if mapped else "failed"}')
+
+    utilizations = [0.5, 0.6, 0.7, 0.8, 0.9, 0.95]
+    ratios = acceptance_ratio(core_config, simulation_config, utilizations, args.task_sets)
+    print(f'Acceptance ratio over {args.task_sets} task sets of {simulation_config["task-set-size"]} ptasks:')
+    print(f'  {"utilization":<22} ' + ' '.join(f'{utilization:6.2f}' for utilization in utilizations))
+    for (name, values,) in ratios.items():
+        print(f'  {name:<22} ' + ' '.join(f'{value:6.2f}' for value in values))
+
+    if args.learn:
+        results = schedulability(core_config, {**qscheduler_config, 'episodes': args.episodes},
+                                 {**simulation_config, 'duration': args.duration}, simulation_config['utilization'], 5)
+        print(f'Schedulability after learning at utilization {simulation_config["utilization"]}:')
+        print(json.dumps(results, indent=4))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import random
+import timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from qstate import QState
+
+class LegacyQState:
+    def __init__(self, time: int, task_num: int, dvfs_level: int, dvfs_lock_from: int, consumed_energy: int, delayed: tuple[int]):
+        self.time = time
+        self.task_num = task_num
+        self.dvfs_level = dvfs_level
+        self.dvfs_lock_from = dvfs_lock_from
+        self.consumed_energy = consumed_energy
+        self.delayed = delayed
+
+    def __hash__(self):
+        return hash((self.time, self.task_num, self.delayed, self.dvfs_level, self.dvfs_lock_from, self.consumed_energy,))
+
+    def __eq__(self, other):
+        return ((self.time, self.task_num, self.delayed, self.dvfs_level, self.dvfs_lock_from, self.consumed_energy,) == 
+                (other.time, other.task_num, other.delayed, other.dvfs_level, other.dvfs_lock_from, other.consumed_energy,))
+
+def generate_fields(no_states, delayed_ratio, seed):
+    rng, fields = random.Random(seed), []
+    for i in range(no_states):
+        delayed = tuple(rng.randrange(100) for j in range(rng.randint(1, 3))) if rng.random() < delayed_ratio else ()
+        fields.append((rng.randrange(30_000_000), rng.randrange(1000), rng.randrange(5), rng.randrange(30_000_000), 
+                       rng.randrange(10_000), delayed))
+    return fields
+
+def benchmark(qstate_class, fields, repeat, lookups_per_state):
+    qstates = [qstate_class(*f) for f in fields]
+    probes = [qstate_class(*f) for f in fields]
+
+    def build():
+        return {qstate: i for (i, qstate,) in enumerate(qstates)}
+
+    table = build()
+
+    def lookup():
+        for qstate in probes:
+            for i in range(lookups_per_state):
+                table[qstate]
+
+    def construct():
+        for f in fields:
+            qstate_class(*f)
+
+    def step():
+        for f in fields:
+            qstate = qstate_class(*f)
+            for i in range(lookups_per_state):
+                table[qstate]
+
+    return {
+        'construct': min(timeit.repeat(construct, number=1, repeat=repeat)),
+        'insert': min(timeit.repeat(build, number=1, repeat=repeat)),
+        'lookup': min(timeit.repeat(lookup, number=1, repeat=repeat)),
+        'step': min(timeit.repeat(step, number=1, repeat=repeat)),
+    }
+
+def main():
+    no_states, repeat, lookups_per_state = 200_000, 5, 3
+    for delayed_ratio in (0.0, 0.3):
+        fields = generate_fields(no_states, delayed_ratio, 0)
+        legacy = benchmark(LegacyQState, fields, repeat, lookups_per_state)
+        current = benchmark(QState, fields, repeat, lookups_per_state)
+        print(f'{no_states} states, {int(delayed_ratio * 100)}% with delayed tasks:')
+        for phase in legacy:
+            operations = no_states * (lookups_per_state if phase == 'lookup' else 1)
+            print(f'  {phase:<10} legacy: {operations / legacy[phase] / 1e6:6.2f} Mops/s   '
+                  f'current: {operations / current[phase] / 1e6:6.2f} Mops/s   speedup: {legacy[phase] / current[phase]:5.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import platform
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from ptask_generator import PTaskGenerator
+from ptask_stat import PTaskStat
+from launcher import load_configs, build_qscheduler, draw_charts
+from partitioning import replicate_cores
+
+STAGES = ['extract-tasks', 'map-ptasks', 'learn-qtable', 'schedule-with-qtable', 'extract-ptask-stats', 'draw-charts']
+
+def timed(stage_times, stage, function, *args):
+    start = timeit.default_timer()
+    try:
+        return function(*args)
+    finally:
+        stage_times[stage] = stage_times.get(stage, 0.0) + timeit.default_timer() - start
+
+def run_scenario(scenario, core_config, qscheduler_config, simulation_config) -> tuple[dict, list[str]]:
+    simulation_config = {**simulation_config, 'task-set-size': scenario['task-set-size'], 'utilization': scenario['utilization'],
+                         'duration': scenario['duration']}
+    qscheduler_config = {**qscheduler_config, 'episodes': scenario['episodes'], 'mapping-algorithm': scenario.get('mapping-algorithm', 'worst-fit'),
+                         'early-stopping': False, 'qtable-cache': None, 'instrumentation': False, 'hyperperiod-mode': False}
+    duration, stage_times, failures = scenario['duration'], {}, []
+
+    random.seed(scenario['seed'])
+    cores = replicate_cores(core_config, simulation_config, scenario['cores'])
+    ptasks = PTaskGenerator().generate(scenario['task-set-size'], scenario['utilization'], sum(core.available_resource for core in cores),
+                                       simulation_config['task-periods'], simulation_config['real-time-modes'],
+                                       simulation_config['second-slice-size'])
+    qscheduler = build_qscheduler(qscheduler_config, simulation_config)
+    timed(stage_times, 'map-ptasks', qscheduler.map_ptasks_to_cores, cores, ptasks)
+    core_tasks = [timed(stage_times, 'extract-tasks', qscheduler.extract_tasks_from_ptasks, core.ptasks, duration) for core in cores]
+
+    learned_cores = [(core, tasks,) for (core, tasks,) in zip(cores, core_tasks) if len(tasks) > 0][:scenario['learn-cores']]
+    for (core, tasks,) in learned_cores:
+        random.seed(f'{scenario["seed"]}/{core.core_id}')
+        qtable = timed(stage_times, 'learn-qtable', qscheduler.learn_qtable, core, tasks, duration)
+        try:
+            timed(stage_times, 'schedule-with-qtable', qscheduler.schedule_with_qtable, core, tasks, qtable, duration)
+        except ValueError as e:
+            failures.append(f'{core.get_full_name()}: {e}')
+
+    scheduled_cores = [core for (core, tasks,) in learned_cores if len(core.scheduled_tasks) + len(core.missed_tasks) > 0]
+    ptask_stats = timed(stage_times, 'extract-ptask-stats', PTaskStat.extract_ptask_stats, scheduled_cores, simulation_config['second-slice-size'])
+    with tempfile.TemporaryDirectory() as charts_path:
+        timed(stage_times, 'draw-charts', draw_charts, scheduled_cores, ptask_stats, simulation_config, charts_path)
+    return stage_times, failures
+
+def run_suite(scenarios, config_path='configs', names=None) -> dict:
+    core_config, qscheduler_config, simulation_config = load_configs(config_path)
+    results = {'python': platform.python_version(), 'platform': platform.platform(), 'scenarios': {}}
+    for scenario in scenarios:
+        if names is not None and scenario['name'] not in names:
+            continue
+        runs = [run_scenario(scenario, core_config, qscheduler_config, simulation_config) for i in range(scenario.get('repeat', 1))]
+        results['scenarios'][scenario['name']] = {
+            'seconds': {stage: min(stage_times[stage] for (stage_times, failures,) in runs) for stage in STAGES if stage in runs[0][0]},
+            'failures': runs[0][1]
+        }
+        print(f'{scenario["name"]}: ' + ', '.join(f'{stage} {seconds * 1000:.1f} ms' 
+                                                   for (stage, seconds,) in results['scenarios'][scenario['name']]['seconds'].items()))
+    return results
+
+def compare(results, baseline, threshold, min_seconds) -> bool:
+    passed = True
+    for (name, scenario,) in results['scenarios'].items():
+        if name not in baseline['scenarios']:
+            print(f'{name}: not in baseline, skipped')
+            continue
+        for (stage, seconds,) in scenario['seconds'].items():
+            baseline_seconds = baseline['scenarios'][name]['seconds'].get(stage)
+            if baseline_seconds is None:
+                continue
+            if max(seconds, baseline_seconds) < min_seconds:
+                status = 'ok (below noise floor)'
+            elif seconds > baseline_seconds * (1 + threshold):
+                status, passed = 'REGRESSION', False
+            else:
+                status = 'ok'
+            print(f'  {name:<8} {stage:<22} baseline {baseline_seconds * 1000:10.2f} ms   current {seconds * 1000:10.2f} ms   '
+                  f'ratio {seconds / baseline_seconds if baseline_seconds > 0 else float("inf"):5.2f}   {status}')
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the scheduler hot paths over fixed-seed scenarios and compare them with a baseline.')
+    parser.add_argument('--scenarios', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios.json'))
+    parser.add_argument('--config-path', default='configs')
+    parser.add_argument('--only', nargs='*', default=None)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default=None)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--min-seconds', type=float, default=0.005)
+    args = parser.parse_args()
+
+    results = run_suite(json.load(open(args.scenarios, 'r'))['scenarios'], args.config_path, args.only)
+    if args.output is not None:
+        json.dump(results, open(args.output, 'w'), indent=4)
+    if args.baseline is not None:
+        passed = compare(results, json.load(open(args.baseline, 'r')), args.threshold, args.min_seconds)
+        print('PASSED' if passed else f'FAILED: slower than the baseline by more than {args.threshold * 100:.0f}%')
+        sys.exit(0 if passed else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import numpy as np
+from array import array
+from action import Action, MASK_ACTIONS
+from qstate import QState
+from qtable import QTable
+
+class AbstractQTable(QTable):
+    def __init__(self, capacity: int = 1024):
+        super().__init__(capacity)
+        self.seen_masks = array('B')
+
+    def add_state(self, qstate: QState) -> int:
+        self.seen_masks.append(0)
+        return super().add_state(qstate)
+
+    def load(self, stored_qstates, action_masks: array, status: array, qvalues: np.ndarray, rewards: np.ndarray):
+        super().load(stored_qstates, action_masks, status, qvalues, rewards)
+        self.seen_masks = array('B', action_masks)
+
+    def known_action_masks(self) -> array:
+        return self.seen_masks
+
+    def set_actions(self, state_id: int, action_mask: int, rewards: np.ndarray):
+        seen_mask = self.seen_masks[state_id]
+        new_mask = action_mask & ~seen_mask
+        if new_mask:
+            self.seen_masks[state_id] = seen_mask | new_mask
+            for action in MASK_ACTIONS[new_mask]:
+                self.qvalues[state_id, action] = 0
+                self.rewards[state_id, action] = rewards[action]
+        self.action_masks[state_id] = action_mask
+
+    def masked_qvalues(self, state_id: int, action_mask: int = None) -> np.ndarray:
+        action_mask = (action_mask if action_mask is not None else self.action_masks[state_id])
+        return self.qvalues[state_id] + QTable.MASK_QVALUES[action_mask]
+
+    def max_qvalue_action(self, state_id: int) -> Action:
+        qvalues = self.masked_qvalues(state_id)
+        action = int(qvalues.argmax())
+        if qvalues[action] == float('-inf'):
+            return MASK_ACTIONS[self.action_masks[state_id]][0]
+        return Action(action)
+
+    def max_qvalue(self, state_id: int, action_mask: int = None):
+        if self.is_terminal(state_id):
+            return self.qvalues[state_id].max()
+        return self.masked_qvalues(state_id, action_mask).max()
@@ -0,0 +1,22 @@
+from enum import IntEnum
+
+class Action(IntEnum):
+    STALL_TO_FINISH = 0
+    STALL_TO_DVFS_LOCK = 1
+    SCHEDULE = 2
+    MISS = 3
+    DELAY = 4
+    SCHEDULE_DELAYED = 5
+    DVFS_UP = 6
+    DVFS_DOWN = 7
+
+    def __str__(self):
+        return self.name.lower().replace('_', '-')
+
+def action_mask(*actions: Action) -> int:
+    mask = 0
+    for action in actions:
+        mask |= 1 << action
+    return mask
+
+MASK_ACTIONS = tuple(tuple(action for action in Action if mask >> action & 1) for mask in range(1 << len(Action)))
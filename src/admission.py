@@ -0,0 +1,72 @@
+import numpy as np
+from core import Core
+from task_table import TaskTable
+
+class AdmissionTest:
+    def __init__(self, core: Core, tasks: TaskTable, duration, second_slice_size, steady_state=False):
+        core.load_tasks(tasks)
+        self.core = core
+        self.tasks = tasks
+        self.horizon = round(duration * second_slice_size)
+        self.energy_budget = core.allowed_avg_power * duration
+        self.steady_state = steady_state
+        self.hard = tasks.priority == TaskTable.HARD
+        self.power = np.array([coefficient * core.one_ghz_power / core.second_slice_size for coefficient in core.power_coefficients])
+        self.instruction_rate = np.array([core.instruction_per_time_unit(dvfs_level) for dvfs_level in range(len(core.dvfs_levels))])
+        self.reason = None
+
+    def hard_utilization(self, dvfs_level) -> float:
+        demand = int(self.core.execution_times[self.hard, dvfs_level].sum())
+        return (demand / self.horizon if self.horizon > 0 else float('inf'))
+
+    def hard_deadlines_met(self) -> bool:
+        top_level = len(self.core.dvfs_levels) - 1
+        execution_times = self.core.execution_times[self.hard, top_level]
+        if len(execution_times) == 0:
+            return True
+        demand = np.cumsum(execution_times)
+        latest_release = np.maximum.accumulate(self.tasks.arrival_time[self.hard] - (demand - execution_times))
+        return bool(np.all(demand + latest_release <= self.tasks.deadline[self.hard]))
+
+    def dvfs_floor_energy(self) -> float:
+        core, top_level = self.core, len(self.core.dvfs_levels) - 1
+        (dvfs_level, dvfs_lock_from,) = ((core.default_dvfs_level, -core.dvfs_change_lock,) if self.steady_state else (top_level, 0,))
+        if core.dvfs_change_lock <= 0:
+            return self.power[0] * self.horizon
+        energy, time = 0.0, 0
+        segment_end = min(max(dvfs_lock_from + core.dvfs_change_lock, 0), self.horizon)
+        while time < self.horizon:
+            energy += self.power[dvfs_level] * (segment_end - time)
+            time = segment_end
+            dvfs_level = max(dvfs_level - 1, 0)
+            segment_end = (self.horizon if dvfs_level == 0 else min(time + core.dvfs_change_lock, self.horizon))
+        return energy
+
+    def hard_work_energy(self) -> float:
+        no_hard_tasks = int(self.hard.sum())
+        work = float(self.tasks.ins_count[self.hard].sum()) - no_hard_tasks * self.instruction_rate[-1]
+        rate = work / self.horizon
+        if rate <= self.instruction_rate[0]:
+            return self.power[0] * self.horizon
+        power = min((self.power[dvfs_level] for dvfs_level in range(len(self.power)) if self.instruction_rate[dvfs_level] >= rate),
+                    default=float('inf'))
+        for lower in range(len(self.power)):
+            for upper in range(lower + 1, len(self.power)):
+                if self.instruction_rate[lower] < rate < self.instruction_rate[upper]:
+                    share = (rate - self.instruction_rate[lower]) / (self.instruction_rate[upper] - self.instruction_rate[lower])
+                    power = min(power, self.power[lower] + share * (self.power[upper] - self.power[lower]))
+        return power * self.horizon
+
+    def energy_lower_bound(self) -> float:
+        rounding_slack = len(self.tasks) + len(self.core.dvfs_levels) + 2
+        return max(self.dvfs_floor_energy(), self.hard_work_energy()) - rounding_slack
+
+    def check(self) -> bool:
+        top_level = len(self.core.dvfs_levels) - 1
+        if self.hard_utilization(top_level) > 1:
+            self.reason = 'hard tasks exceed the core capacity at the highest DVFS level'
+        elif not self.hard_deadlines_met():
+            self.reason = 'a hard deadline is missed even at the highest DVFS level'
+        elif self.energy_lower_bound() > self.energy_budget:
+            self.reason = 'the energy lower bound exceeds the energy budget'
+        return self.reason is None
@@ -1,15 +1,37 @@
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 from matplotlib.colors import hsv_to_rgb
 from core import Core
 from ptask_stat import PTaskStat
 
 class Chart:
+    def __init__(self, resolution=800):
+        self.resolution = resolution
+
+    def new_figure(self):
+        fig = Figure()
+        return fig, fig.subplots()
+
+    def decimate(self, history) -> tuple[np.ndarray, np.ndarray]:
+        history = np.array(history, dtype=np.float64).reshape(-1, 2)
+        (times, values,) = (history[:, 0], history[:, 1],)
+        if len(history) <= 4 * self.resolution:
+            return times, values
+
+        bounds = np.searchsorted(times, np.linspace(times[0], times[-1], self.resolution + 1)[1:-1])
+        bounds = np.unique(np.concatenate(([0], bounds, [len(times)])))
+        (starts, ends,) = (bounds[:-1], bounds[1:],)
+        mins = np.array([start + values[start:end].argmin() for (start, end,) in zip(starts.tolist(), ends.tolist())], dtype=np.int64)
+        maxs = np.array([start + values[start:end].argmax() for (start, end,) in zip(starts.tolist(), ends.tolist())], dtype=np.int64)
+        kept = np.unique(np.concatenate((starts, ends - 1, mins, maxs)))
+        return times[kept], values[kept]
+
     def draw_core_timeline(self, cores: list[Core], second_slice_size, duration):
         no_ptasks = 0
         for core in cores:
             no_ptasks += len(core.ptasks)
 
-        fig, ax = plt.subplots()
+        fig, ax = self.new_figure()
         fig.set_size_inches((8, 6))
         fig.subplots_adjust(left=0.15, right=0.95, top=0.90, bottom=0.10)
         ax.set_title('Timeline of Cores')
@@ -19,17 +41,22 @@ class Chart:
         ax.set_yticks([1.25 + i for i in range(len(cores))], [core.get_full_name() for core in cores], fontsize=7.0)
 
         for i in range(len(cores)):
-            for task in cores[i].scheduled_tasks:
-                if task.start_time != -1:
-                    ax.broken_barh(xranges=[(task.start_time / second_slice_size, (task.finish_time - task.start_time) / second_slice_size)], 
-                                    yrange=(i + 1, 0.5,), facecolor=hsv_to_rgb(((task.ptask_id / no_ptasks), 0.5, 1.0)))
+            tasks = cores[i].tasks
+            if tasks is None or len(cores[i].scheduled_tasks) == 0:
+                continue
+            scheduled = np.array(cores[i].scheduled_tasks, dtype=np.int64)
+            scheduled = scheduled[tasks.start_time[scheduled] != -1]
+            (ptask_ids, start_times, finish_times,) = (tasks.ptask_id[scheduled], tasks.start_time[scheduled], tasks.finish_time[scheduled])
+            xranges = np.column_stack((start_times / second_slice_size, (finish_times - start_times) / second_slice_size))
+            colors = hsv_to_rgb(np.column_stack((np.mod(ptask_ids / no_ptasks, 1.0), np.full(len(ptask_ids), 0.5), np.ones(len(ptask_ids)))))
+            ax.broken_barh(xranges=xranges, yrange=(i + 1, 0.5,), facecolors=colors)
 
         return fig
     
     def draw_ptask_schedulability(self, ptask_stats: list[PTaskStat]):
         ptask_stats = sorted(ptask_stats, key=lambda x: x.id)
 
-        fig, ax = plt.subplots()
+        fig, ax = self.new_figure()
         fig.set_size_inches((8, 6))
         fig.subplots_adjust(left=0.10, right=0.90, top=0.90, bottom=0.10)
         ax.set_title('Schedulability of Priodic Tasks')
@@ -59,7 +86,7 @@ class Chart:
     def draw_ptask_timing(self, ptask_stats: list[PTaskStat]):
         ptask_stats = sorted(ptask_stats, key=lambda x: x.id)
 
-        fig, ax = plt.subplots()
+        fig, ax = self.new_figure()
         fig.set_size_inches((8, 6))
         fig.subplots_adjust(left=0.10, right=0.90, top=0.90, bottom=0.10)
         ax.set_title('Timing of Priodic Tasks')
@@ -84,7 +111,7 @@ class Chart:
         return fig
     
     def draw_core_frequency(self, cores: list[Core]):
-        fig, ax = plt.subplots()
+        fig, ax = self.new_figure()
         fig.set_size_inches((8, 6))
         fig.subplots_adjust(left=0.10, right=0.90, top=0.90, bottom=0.10)
         ax.set_title('Frequency of Cores')
@@ -93,14 +120,14 @@ class Chart:
         ax.grid(True)
 
         for core in cores:
-            ax.plot([time for (time, freq,) in core.freq_history], [freq for (time, freq,) in core.freq_history], 
-                    color=hsv_to_rgb((float(core.core_id) / len(cores), 0.5, 1.0)), label=core.get_full_name())
+            (times, freqs,) = self.decimate(core.freq_history)
+            ax.plot(times, freqs, color=hsv_to_rgb(((float(core.core_id) / len(cores)) % 1.0, 0.5, 1.0)), label=core.get_full_name())
         ax.legend()
 
         return fig
     
     def draw_core_energy(self, cores: list[Core], duration: int):
-        fig, ax = plt.subplots()
+        fig, ax = self.new_figure()
         fig.set_size_inches((8, 6))
         fig.subplots_adjust(left=0.10, right=0.90, top=0.90, bottom=0.10)
         ax.set_title('Energy Consumption of Cores')
@@ -109,9 +136,9 @@ class Chart:
         ax.grid(True)
 
         for core in cores:
-            ax.plot([time for (time, energy,) in core.energy_history], [energy for (time, energy,) in core.energy_history], 
-                    color=hsv_to_rgb((float(core.core_id) / len(cores), 0.5, 1.0)), label=core.get_full_name())
-            ax.axhline(core.allowed_avg_power * duration, linestyle='--', color=hsv_to_rgb((float(core.core_id) / len(cores), 0.5, 1.0)))
+            (times, energies,) = self.decimate(core.energy_history)
+            ax.plot(times, energies, color=hsv_to_rgb(((float(core.core_id) / len(cores)) % 1.0, 0.5, 1.0)), label=core.get_full_name())
+            ax.axhline(core.allowed_avg_power * duration, linestyle='--', color=hsv_to_rgb(((float(core.core_id) / len(cores)) % 1.0, 0.5, 1.0)))
         ax.legend()
 
         return fig
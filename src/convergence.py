@@ -0,0 +1,40 @@
+class ConvergenceMonitor:
+    def __init__(self, patience: int, tolerance: float):
+        self.patience = patience
+        self.tolerance = tolerance
+        self.curve: list[dict] = []
+        self.stable_checks = 0
+        self.stopping_episode = None
+        self.previous_return = None
+        self.previous_qvalues: dict[tuple[int, int], float] = None
+
+    def observe(self, episode: int, greedy_return: float, finished: bool, qvalues: dict[tuple[int, int], float]) -> bool:
+        return_delta, qvalue_delta = None, None
+        if self.previous_qvalues is not None:
+            return_delta = abs(greedy_return - self.previous_return)
+            if qvalues.keys() == self.previous_qvalues.keys():
+                qvalue_delta = max((abs(qvalues[key] - self.previous_qvalues[key]) for key in qvalues), default=0.0)
+
+        stable = (finished and return_delta is not None and qvalue_delta is not None and
+                  return_delta <= self.tolerance and qvalue_delta <= self.tolerance)
+        self.stable_checks = (self.stable_checks + 1 if stable else 0)
+        self.previous_return, self.previous_qvalues = greedy_return, qvalues
+        self.curve.append({
+            'episode': episode,
+            'greedy-return': greedy_return,
+            'finished': finished,
+            'return-delta': return_delta,
+            'qvalue-delta': qvalue_delta
+        })
+
+        if self.stable_checks >= self.patience:
+            self.stopping_episode = episode
+            return True
+        return False
+
+    def report(self, episodes: int):
+        return {
+            'episodes': episodes,
+            'stopping-episode': self.stopping_episode,
+            'curve': self.curve
+        }
@@ -1,10 +1,16 @@
+import copy
 import math
+from collections import deque
+import numpy as np
 from ptask import PTask
-from task import Task
+from task_table import TaskTable
+from ptask_stat_accumulator import PTaskStatAccumulator
+from metrics import CoreMetrics
+from schedule_trace import TraceEvent, TraceWriter
 
 class Core:
     def __init__(self, name, core_id, cpi, one_ghz_power, dvfs_change_lock, dvfs_levels, default_dvfs_level, 
-                 allowed_avg_power, second_slice_size):
+                 allowed_avg_power, second_slice_size, history_limit=None):
         self.name = name
         self.core_id = core_id
         self.cpi = cpi
@@ -16,66 +22,139 @@ class Core:
         self.dvfs_level = len(self.dvfs_levels) - 1
         self.allowed_avg_power = allowed_avg_power
         self.second_slice_size = second_slice_size
+        self.history_limit = history_limit
+        self.recording = True
+        self.last_finish = 0
         self.available_resource = self.default_instruction_per_time_unit()
         self.ptasks: list[PTask] = []
-        self.scheduled_tasks: list[Task] = []
-        self.missed_tasks: list[Task] = []
-        self.freq_history = [(0, self.dvfs_levels[self.dvfs_level])]
-        self.energy_history = [(0, 0)]
+        self.tasks: TaskTable = None
+        self.execution_times: np.ndarray = None
+        self.power_coefficients = [dvfs_level ** 3 for dvfs_level in self.dvfs_levels]
+        self.scheduled_tasks: list[int] = []
+        self.missed_tasks: list[int] = []
+        self.stat_accumulator: PTaskStatAccumulator = None
+        self.learning_report: dict = None
+        self.metrics: CoreMetrics = None
+        self.trace: TraceWriter = None
+        self.freq_history = self.new_history((0, self.dvfs_levels[self.dvfs_level]))
+        self.energy_history = self.new_history((0, 0))
+
+    def new_history(self, initial_entry):
+        if self.history_limit is None:
+            return [initial_entry]
+        return deque([initial_entry], maxlen=self.history_limit)
 
     def default_instruction_per_time_unit(self):
         return (self.dvfs_levels[self.default_dvfs_level] * (1000_000_000 / self.second_slice_size)) / self.cpi
     
-    def instruction_per_time_unit(self):
-        return (self.dvfs_levels[self.dvfs_level] * (1000_000_000 / self.second_slice_size)) / self.cpi
+    def instruction_per_time_unit(self, dvfs_level=None):
+        dvfs_level = self.dvfs_level if dvfs_level is None else dvfs_level
+        return (self.dvfs_levels[dvfs_level] * (1000_000_000 / self.second_slice_size)) / self.cpi
 
     def add_ptask(self, ptask: PTask):
         self.ptasks.append(ptask)
         self.available_resource -= ptask.needed_resource()
 
-    def is_schedulable(self, task: Task):
-        final_deadline = (task.deadline if not task.is_delayed else task.deadline + (task.deadline - task.arrival_time))
-        last_finish_time = (0 if len(self.scheduled_tasks) == 0 else self.scheduled_tasks[-1].finish_time)
-        execution_time = math.floor(task.ins_count / self.instruction_per_time_unit())
-        return max(task.arrival_time, last_finish_time) + execution_time <= final_deadline
+    def load_tasks(self, tasks: TaskTable):
+        if self.tasks is tasks and self.execution_times is not None:
+            return
+        self.tasks = tasks
+        self.execution_times = np.empty((len(tasks), len(self.dvfs_levels)), dtype=np.int64)
+        for dvfs_level in range(len(self.dvfs_levels)):
+            self.execution_times[:, dvfs_level] = np.floor(tasks.ins_count / self.instruction_per_time_unit(dvfs_level))
+
+    def execution_time(self, task_index: int):
+        return self.execution_times.item(task_index, self.dvfs_level)
+
+    def last_finish_time(self):
+        return self.last_finish
+
+    def is_schedulable(self, task_index: int):
+        arrival_time, deadline = self.tasks.arrival_time.item(task_index), self.tasks.deadline.item(task_index)
+        final_deadline = (deadline if not self.tasks.is_delayed.item(task_index) else deadline + (deadline - arrival_time))
+        return max(arrival_time, self.last_finish_time()) + self.execution_time(task_index) <= final_deadline
     
-    def schedule(self, task: Task):
-        last_finish_time = (0 if len(self.scheduled_tasks) == 0 else self.scheduled_tasks[-1].finish_time)
-        execution_time = math.floor(task.ins_count / self.instruction_per_time_unit())
-        task.start_time = max(task.arrival_time, last_finish_time)
-        task.finish_time = task.start_time + execution_time
-        self.scheduled_tasks.append(task)
-        energy_consumption = self.energy_consumption(task.finish_time - last_finish_time)
-        self.energy_history.append((task.finish_time / self.second_slice_size, self.energy_history[-1][1] + energy_consumption))
-        self.freq_history.append((task.finish_time / self.second_slice_size, self.dvfs_levels[self.dvfs_level]))
+    def schedule(self, task_index: int, delayed=False):
+        last_finish_time = self.last_finish_time()
+        start_time = max(self.tasks.arrival_time.item(task_index), last_finish_time)
+        finish_time = start_time + self.execution_time(task_index)
+        self.last_finish = finish_time
+        energy_consumption = self.energy_consumption(finish_time - last_finish_time)
+        if self.recording:
+            self.tasks.start_time[task_index] = start_time
+            self.tasks.finish_time[task_index] = finish_time
+            self.scheduled_tasks.append(task_index)
+            if self.stat_accumulator is not None:
+                self.stat_accumulator.add_scheduled(self.tasks.ptask_id.item(task_index), self.tasks.arrival_time.item(task_index), 
+                                                    self.tasks.deadline.item(task_index), start_time, finish_time, 
+                                                    self.tasks.is_delayed.item(task_index))
+            self.energy_history.append((finish_time / self.second_slice_size, self.energy_history[-1][1] + energy_consumption))
+            self.freq_history.append((finish_time / self.second_slice_size, self.dvfs_levels[self.dvfs_level]))
+            self.record_event((TraceEvent.SCHEDULE_DELAYED if delayed or self.tasks.is_delayed.item(task_index) else TraceEvent.SCHEDULE), 
+                              start_time, finish_time, task_index)
         return energy_consumption
     
     def stall(self, time_interval):
         energy_consumption = self.energy_consumption(time_interval)
-        self.energy_history.append((self.energy_history[-1][0] + time_interval / self.second_slice_size, self.energy_history[-1][1] + energy_consumption))
-        self.freq_history.append((self.freq_history[-1][0] + time_interval / self.second_slice_size, self.dvfs_levels[self.dvfs_level]))
+        self.last_finish += time_interval
+        if self.recording:
+            self.energy_history.append((self.energy_history[-1][0] + time_interval / self.second_slice_size, self.energy_history[-1][1] + energy_consumption))
+            self.freq_history.append((self.freq_history[-1][0] + time_interval / self.second_slice_size, self.dvfs_levels[self.dvfs_level]))
+            self.record_event(TraceEvent.STALL, self.last_finish - time_interval, self.last_finish)
         return energy_consumption
 
-    def energy_consumption(self, time_interval):
-        return math.floor((time_interval / self.second_slice_size) * (self.dvfs_levels[self.dvfs_level] ** 3) * self.one_ghz_power)
+    def energy_consumption(self, time_interval, dvfs_level=None):
+        dvfs_level = self.dvfs_level if dvfs_level is None else dvfs_level
+        return math.floor((time_interval / self.second_slice_size) * self.power_coefficients[dvfs_level] * self.one_ghz_power)
 
-    def miss(self, task: Task):
-        self.missed_tasks.append(task)
+    def miss(self, task_index: int):
+        if self.recording:
+            self.missed_tasks.append(task_index)
+            if self.stat_accumulator is not None:
+                self.stat_accumulator.add_missed(self.tasks.ptask_id.item(task_index))
+            self.record_event(TraceEvent.MISS, self.last_finish, self.last_finish, task_index)
+
+    def delay(self, task_index: int):
+        if self.recording:
+            self.record_event(TraceEvent.DELAY, self.last_finish, self.last_finish, task_index)
 
     def dvfs_up(self, time):
         self.dvfs_lock_from = time
         self.dvfs_level += 1
+        if self.recording:
+            self.record_event(TraceEvent.DVFS_UP, time, time)
     
     def dvfs_down(self, time):
         self.dvfs_lock_from = time
         self.dvfs_level -= 1
+        if self.recording:
+            self.record_event(TraceEvent.DVFS_DOWN, time, time)
 
-    def reset(self):
-        self.dvfs_level = len(self.dvfs_levels) - 1
+    def record_event(self, kind: TraceEvent, start, end, task_index: int = -1):
+        if self.trace is None:
+            return
+        ptask_id = (self.tasks.ptask_id.item(task_index) if task_index >= 0 else -1)
+        self.trace.append(kind, start, end, task_index, ptask_id, self.dvfs_level, self.energy_history[-1][1])
+
+    def reset(self, recording=True, dvfs_level=None, dvfs_lock_from=0):
+        self.dvfs_level = (len(self.dvfs_levels) - 1 if dvfs_level is None else dvfs_level)
+        self.dvfs_lock_from = dvfs_lock_from
+        self.last_finish = 0
+        self.recording = recording
         self.scheduled_tasks = []
         self.missed_tasks = []
-        self.freq_history = [(0, self.dvfs_levels[self.dvfs_level])]
-        self.energy_history = [(0, 0)]
+        if recording:
+            if self.trace is not None:
+                self.trace.reset()
+            self.stat_accumulator = PTaskStatAccumulator(self.second_slice_size)
+            self.freq_history = self.new_history((0, self.dvfs_levels[self.dvfs_level]))
+            self.energy_history = self.new_history((0, 0))
+
+    def chart_view(self) -> 'Core':
+        view = copy.copy(self)
+        view.execution_times, view.missed_tasks, view.stat_accumulator = None, [], None
+        view.learning_report, view.metrics, view.trace = None, None, None
+        return view
 
     def get_full_name(self):
         return f'{self.name} / {self.core_id}' 
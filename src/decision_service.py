@@ -0,0 +1,336 @@
+import os
+import time
+import json
+import signal
+import random
+import asyncio
+import argparse
+import numpy as np
+from contextlib import suppress
+from core import Core
+from qstate import QState
+from qtable import QTable
+from action import Action, MASK_ACTIONS
+from transition import Transition
+from qscheduler import QScheduler
+from log_histogram import LogHistogram
+from launcher import load_configs, build_cores, build_ptasks, build_qscheduler
+
+STATUS_NAMES = ('active', 'failure', 'finished')
+SOURCES = ('qtable', 'edf')
+LATENCY_PERCENTILES = (50, 95, 99)
+
+def build_online_cores(core_config, qscheduler_config, simulation_config, seed) -> tuple[QScheduler, list[Core]]:
+    cores = build_cores(core_config, simulation_config)
+    ptasks = build_ptasks(cores, simulation_config, (qscheduler_config['seed'] if qscheduler_config['seed'] is not None else seed))
+    qscheduler = build_qscheduler(qscheduler_config, simulation_config)
+    qscheduler.map_ptasks_to_cores(cores, ptasks)
+    return qscheduler, cores
+
+def state_to_dict(qstate: QState) -> dict:
+    return {
+        'time': qstate.time,
+        'task-num': qstate.task_num,
+        'dvfs-level': qstate.dvfs_level,
+        'dvfs-lock-from': qstate.dvfs_lock_from,
+        'consumed-energy': qstate.consumed_energy,
+        'delayed': list(qstate.delayed)
+    }
+
+class DecisionService:
+    def __init__(self, qscheduler: QScheduler, cores: list[Core], duration, batch_size: int = 64, batch_window: float = 0.0):
+        if batch_size <= 0 or batch_window < 0:
+            raise ValueError('Decision batching is not valid.')
+        self.qscheduler = qscheduler
+        self.cores = {core.core_id: core for core in cores}
+        self.duration = duration
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.models: dict[str, Transition] = {}
+        self.qtables: dict[str, QTable] = {}
+        self.states: dict[str, QState] = {}
+        self.running: dict[str, tuple[int, QState]] = {}
+        self.arrival_times: dict[str, np.ndarray] = {}
+        self.source_latencies = {source: LogHistogram() for source in SOURCES}
+        self.core_latencies = {core_id: LogHistogram() for core_id in self.cores}
+        self.batches, self.batched_requests, self.max_batch_size = 0, 0, 0
+        self.queue: asyncio.Queue = None
+        self.batcher: asyncio.Task = None
+
+    def prepare_models(self):
+        for (core_id, core,) in self.cores.items():
+            tasks = self.qscheduler.extract_tasks_from_ptasks(core.ptasks, self.duration)
+            self.models[core_id] = self.qscheduler.transition_model(core, tasks, self.duration)
+            self.qtables[core_id] = None
+            self.arrival_times[core_id] = tasks.arrival_time.copy()
+            self.reset_core(core_id)
+
+    def prepare(self, seed=None, learn=True):
+        seed = (self.qscheduler.seed if self.qscheduler.seed is not None else seed)
+        self.prepare_models()
+        for (core_id, model,) in self.models.items():
+            self.qtables[core_id] = self.load_qtable(self.cores[core_id], model.tasks, seed, learn)
+
+    def load_qtable(self, core: Core, tasks, seed, learn) -> QTable:
+        qtable_key, qtable = None, None
+        if self.qscheduler.qtable_store is not None:
+            qtable_key = self.qscheduler.qtable_key(core, tasks, self.duration)
+            qtable = self.qscheduler.qtable_store.load(qtable_key, self.qscheduler.new_qtable(0))
+        if qtable is None and learn:
+            random.seed(f'{seed}/{core.core_id}')
+            qtable = self.qscheduler.learn_qtable(core, tasks, self.duration)
+            if qtable_key is not None:
+                self.qscheduler.qtable_store.save(qtable_key, qtable)
+        return qtable
+
+    def reset_core(self, core_id) -> QState:
+        model = self.model(core_id)
+        model.tasks.arrival_time[:] = self.arrival_times[core_id]
+        self.states[core_id] = model.initial_state()
+        self.running.pop(core_id, None)
+        return self.states[core_id]
+
+    def arrival(self, core_id, task_index: int, time: int) -> QState:
+        model = self.model(core_id)
+        qstate = self.states[core_id]
+        if not qstate.task_num <= task_index < model.no_tasks:
+            raise ValueError('Arrival is not valid.')
+        if time < 0 or time >= model.tasks.deadline.item(task_index):
+            raise ValueError('Event time is not valid.')
+        model.tasks.arrival_time[task_index] = time
+        return qstate
+
+    def completion(self, core_id, task_index: int, time: int) -> QState:
+        model = self.model(core_id)
+        if self.running.get(core_id, (None,))[0] != task_index:
+            raise ValueError('Completion is not valid.')
+        (task_index, started_from,) = self.running[core_id]
+        if time < max(model.tasks.arrival_time.item(task_index), started_from.time):
+            raise ValueError('Event time is not valid.')
+        qstate = self.states[core_id]
+        self.states[core_id] = QState(time, qstate.task_num, qstate.dvfs_level, qstate.dvfs_lock_from, 
+                                      started_from.consumed_energy + model.energy_consumption(time - started_from.time, started_from.dvfs_level),
+                                      qstate.delayed)
+        del self.running[core_id]
+        return self.states[core_id]
+
+    def decide(self, core_id) -> tuple[int, Action, str]:
+        model = self.model(core_id)
+        if core_id in self.running:
+            raise ValueError('Core is busy.')
+        qstate = self.states[core_id]
+        (status, action_mask, rewards,) = model.actions(qstate)
+        if status != Transition.ACTIVE:
+            return status, None, None
+        (action, source,) = self.select_action(core_id, qstate, status, action_mask, model)
+        if action == Action.SCHEDULE or action == Action.SCHEDULE_DELAYED:
+            self.running[core_id] = ((qstate.task_num if action == Action.SCHEDULE else qstate.delayed[0]), qstate)
+        self.states[core_id] = model.step(qstate, action)[0]
+        return status, action, source
+
+    def decide_batch(self, core_ids: list[str]) -> list:
+        results = []
+        for core_id in core_ids:
+            try:
+                results.append(self.decide(core_id))
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    def select_action(self, core_id, qstate: QState, status: int, action_mask: int, model: Transition) -> tuple[Action, str]:
+        state_id = self.lookup(core_id, qstate, status, model)
+        if state_id is not None:
+            qvalues = self.qtables[core_id].qvalues[state_id] + QTable.MASK_QVALUES[action_mask]
+            action = int(qvalues.argmax())
+            if qvalues[action] != float('-inf'):
+                return Action(action), 'qtable'
+        return self.edf_action(qstate, action_mask, model), 'edf'
+
+    def model(self, core_id) -> Transition:
+        model = self.models.get(core_id)
+        if model is None:
+            raise ValueError('Core is not supported.')
+        return model
+
+    def lookup(self, core_id, qstate: QState, status: int, model: Transition) -> int:
+        qtable = self.qtables[core_id]
+        if qtable is None:
+            return None
+        state_id = qtable.state_id(self.qscheduler.state_encoder.encode(qstate, status, model))
+        if state_id is None or not qtable.is_explored(state_id):
+            return None
+        return state_id
+
+    def edf_action(self, qstate: QState, action_mask: int, model: Transition) -> Action:
+        legal = MASK_ACTIONS[action_mask]
+        action, task_index = None, None
+        if Action.SCHEDULE_DELAYED in legal:
+            delayed_arrival, delayed_deadline = model.tasks.arrival_time.item(qstate.delayed[0]), model.tasks.deadline.item(qstate.delayed[0])
+            if (Action.SCHEDULE not in legal or
+                2 * delayed_deadline - delayed_arrival <= model.tasks.deadline.item(qstate.task_num)):
+                action, task_index = Action.SCHEDULE_DELAYED, qstate.delayed[0]
+        if action is None and Action.SCHEDULE in legal:
+            action, task_index = Action.SCHEDULE, qstate.task_num
+        if action is not None:
+            slower_state = QState(qstate.time, qstate.task_num, qstate.dvfs_level - 1, qstate.dvfs_lock_from, qstate.consumed_energy, 
+                                  qstate.delayed)
+            if Action.DVFS_DOWN in legal and model.is_schedulable(slower_state, task_index):
+                return Action.DVFS_DOWN
+            return action
+        if qstate.task_num < model.no_tasks:
+            for action in (Action.DVFS_UP, Action.DELAY, Action.MISS,):
+                if action in legal:
+                    return action
+        for action in (Action.DVFS_DOWN, Action.STALL_TO_DVFS_LOCK, Action.STALL_TO_FINISH,):
+            if action in legal:
+                return action
+        return legal[0]
+
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self.run_batches())
+
+    async def stop(self):
+        self.batcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.batcher
+
+    async def submit(self, core_id) -> tuple[int, Action, str]:
+        self.model(core_id)
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((core_id, time.perf_counter(), future,))
+        return await future
+
+    async def run_batches(self):
+        while True:
+            batch = [await self.queue.get()]
+            if self.batch_window > 0 and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            self.batches += 1
+            self.batched_requests += len(batch)
+            self.max_batch_size = max(self.max_batch_size, len(batch))
+
+            results = self.decide_batch([core_id for (core_id, submitted, future,) in batch])
+            for ((core_id, submitted, future,), result,) in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, ValueError):
+                    future.set_exception(result)
+                    continue
+                latency = time.perf_counter() - submitted
+                record_latency(self.core_latencies[core_id], latency)
+                if result[2] is not None:
+                    record_latency(self.source_latencies[result[2]], latency)
+                future.set_result(result)
+
+    async def request(self, request: dict) -> dict:
+        kind = request.get('type', 'decide')
+        if kind == 'report':
+            return {'report': self.report()}
+        core_id, response = str(request['core']), {}
+        if kind == 'decide':
+            (status, action, source,) = await self.submit(core_id)
+            response = {'status': STATUS_NAMES[status], 'action': (str(action) if action is not None else None), 'source': source}
+            if action == Action.SCHEDULE or action == Action.SCHEDULE_DELAYED:
+                (task_index, started_from,) = self.running[core_id]
+                response.update({'task': task_index, 'start': max(self.models[core_id].tasks.arrival_time.item(task_index), started_from.time),
+                                 'finish': self.states[core_id].time})
+        elif kind == 'arrival':
+            self.arrival(core_id, int(request['task']), int(request['time']))
+        elif kind == 'completion':
+            self.completion(core_id, int(request['task']), int(request['time']))
+        elif kind == 'reset':
+            self.reset_core(core_id)
+        else:
+            raise ValueError('Request type is not supported.')
+        response['state'] = state_to_dict(self.states[core_id])
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = set()
+        while line := await reader.readline():
+            task = asyncio.create_task(self.respond(line, writer))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if len(pending) > 0:
+            await asyncio.wait(pending)
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            response = {'id': request_id, **await self.request(request)}
+        except KeyError as e:
+            response = {'id': request_id, 'error': f'Request field {e} is missing.'}
+        except (ValueError, TypeError) as e:
+            response = {'id': request_id, 'error': str(e)}
+        writer.write(json.dumps(response).encode() + b'\n')
+        with suppress(ConnectionError):
+            await writer.drain()
+
+    async def serve(self, socket_path):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        await self.start()
+        server = await asyncio.start_unix_server(self.handle_connection, socket_path)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.stop()
+            with suppress(FileNotFoundError):
+                os.remove(socket_path)
+
+    def report(self) -> dict:
+        return {
+            'decisions': {source: self.source_latencies[source].count for source in SOURCES},
+            'batches': {
+                'count': self.batches,
+                'mean-size': (self.batched_requests / self.batches if self.batches > 0 else None),
+                'max-size': self.max_batch_size
+            },
+            'latency': {source: latency_report(self.source_latencies[source]) for source in SOURCES},
+            'cores': {self.cores[core_id].get_full_name(): {
+                'qtable-states': (len(self.qtables[core_id]) if self.qtables.get(core_id) is not None else 0),
+                'latency': latency_report(self.core_latencies[core_id])
+            } for core_id in self.cores}
+        }
+
+def record_latency(latencies: LogHistogram, seconds: float):
+    latencies.add(round(seconds * 1_000_000_000))
+
+def latency_report(latencies: LogHistogram) -> dict:
+    if latencies.count == 0:
+        return {'count': 0, 'mean-us': None, **{f'p{percentile}-us': None for percentile in LATENCY_PERCENTILES}, 'max-us': None}
+    return {
+        'count': latencies.count,
+        'mean-us': latencies.total / latencies.count / 1000,
+        **{f'p{percentile}-us': value / 1000 for (percentile, value,) in zip(LATENCY_PERCENTILES, latencies.percentiles(LATENCY_PERCENTILES))},
+        'max-us': latencies.max_value / 1000
+    }
+
+def launch(socket_path, seed, config_path='configs', learn=True):
+    core_config, qscheduler_config, simulation_config = load_configs(config_path)
+    (qscheduler, cores,) = build_online_cores(core_config, qscheduler_config, simulation_config, seed)
+    service = DecisionService(qscheduler, cores, simulation_config['duration'], qscheduler_config['decision-batch-size'],
+                              qscheduler_config['decision-batch-window-ms'] / 1000)
+    service.prepare(seed, learn)
+    print(f'Serving decisions for {len(cores)} cores on {socket_path}.', flush=True)
+    with suppress(KeyboardInterrupt, asyncio.CancelledError):
+        asyncio.run(service.serve(socket_path))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve online scheduling decisions from learned Q-tables over a local socket.')
+    parser.add_argument('--socket', default='./decision-service.sock')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--config-path', default='configs')
+    parser.add_argument('--no-learn', action='store_true')
+    args = parser.parse_args()
+    launch(args.socket, args.seed, args.config_path, not args.no_learn)
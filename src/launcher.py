@@ -1,56 +1,94 @@
-import os
+import csv
+import random
 import json
+import argparse
+from contextlib import nullcontext
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from core import Core
+from ptask import PTask
 from ptask_generator import PTaskGenerator
 from ptask_stat import PTaskStat
 from qscheduler import QScheduler
+from results_store import ResultsStore
+from schedule_trace import TraceWriter
 from chart import Chart
 
-def launch():
-    core_config = json.load(open('configs/core_config.json', 'r'))
-    qscheduler_config = json.load(open('configs/qscheduler_config.json', 'r'))
-    simulation_config = json.load(open('configs/simulation_config.json', 'r'))
+def load_configs(config_path='configs'):
+    core_config = json.load(open(f'{config_path}/core_config.json', 'r'))
+    qscheduler_config = json.load(open(f'{config_path}/qscheduler_config.json', 'r'))
+    simulation_config = json.load(open(f'{config_path}/simulation_config.json', 'r'))
+    return core_config, qscheduler_config, simulation_config
 
+def build_cores(core_config, simulation_config) -> list[Core]:
     cores: list[Core] = []
     for core_id in simulation_config['cores']:
         core_name, allowed_avg_power = simulation_config['cores'][core_id]['name'], simulation_config['cores'][core_id]['allowed-average-power-mW']
         cores.append(Core(core_name, core_id, core_config[core_name]['average-cpi'], core_config[core_name]['1-GHz-power-mW'], 
                             core_config[core_name]['dvfs-change-lock'], core_config[core_name]['dfvs-levels'], 
-                            simulation_config['cores'][core_id]['default-dvfs-level'], allowed_avg_power, simulation_config['second-slice-size']))
-            
+                            simulation_config['cores'][core_id]['default-dvfs-level'], allowed_avg_power, simulation_config['second-slice-size'],
+                            simulation_config['history-limit']))
+    return cores
+
+def build_qscheduler(qscheduler_config, simulation_config) -> QScheduler:
+    return QScheduler(qscheduler_config['mapping-algorithm'], qscheduler_config['learning-rate'], qscheduler_config['exploration-proboblity'],
+                      qscheduler_config['exploration-decay-factor'], qscheduler_config['episodes'], qscheduler_config['soft-schedule-reward'], 
+                      qscheduler_config['soft-delay-reward'], qscheduler_config['soft-miss-penalty'], qscheduler_config['firm-schedule-reward'], 
+                      qscheduler_config['firm-miss-penalty'], qscheduler_config['dvfs-up-reward'], qscheduler_config['dvfs-down-reward'], 
+                      qscheduler_config['finish-reward'], qscheduler_config['retry'], simulation_config['second-slice-size'],
+                      qscheduler_config['execution-mode'], qscheduler_config['workers'], qscheduler_config['seed'], 
+                      qscheduler_config['early-stopping'], qscheduler_config['convergence-check-interval'], 
+                      qscheduler_config['convergence-patience'], qscheduler_config['convergence-tolerance'], 
+                      qscheduler_config['qtable-cache'], qscheduler_config['hyperperiod-mode'], qscheduler_config['instrumentation'], 
+                      qscheduler_config['profile'], qscheduler_config['admission-test'], qscheduler_config['retry-mode'], 
+                      qscheduler_config['retry-selection'], qscheduler_config['retry-exploration-probs'], 
+                      qscheduler_config['state-encoder'], qscheduler_config['state-time-granularity'], 
+                      qscheduler_config['state-energy-buckets'], qscheduler_config['state-max-delayed'], qscheduler_config['learner'], 
+                      qscheduler_config['n-step'], qscheduler_config['replay-buffer-size'], qscheduler_config['replay-updates'])
+
+def build_ptasks(cores: list[Core], simulation_config, seed=None) -> list[PTask]:
     total_cpu_resource = 0
     for core in cores:
         total_cpu_resource += core.available_resource
 
     ptask_generator = PTaskGenerator()
-    ptasks = ptask_generator.generate(simulation_config['task-set-size'], simulation_config['utilization'], total_cpu_resource,
-                             simulation_config['task-periods'], simulation_config['real-time-modes'], simulation_config['second-slice-size'])
-    
-    qscheduler = QScheduler(qscheduler_config['mapping-algorithm'], qscheduler_config['learning-rate'], qscheduler_config['exploration-proboblity'],
-                            qscheduler_config['exploration-decay-factor'], qscheduler_config['episodes'], qscheduler_config['soft-schedule-reward'], 
-                            qscheduler_config['soft-delay-reward'], qscheduler_config['soft-miss-penalty'], qscheduler_config['firm-schedule-reward'], 
-                            qscheduler_config['firm-miss-penalty'], qscheduler_config['dvfs-up-reward'], qscheduler_config['dvfs-down-reward'], 
-                            qscheduler_config['finish-reward'], qscheduler_config['retry'], simulation_config['second-slice-size'])
-
-    qscheduler.map_ptasks_to_cores(cores, ptasks)
+    return ptask_generator.generate(simulation_config['task-set-size'], simulation_config['utilization'], total_cpu_resource,
+                                    simulation_config['task-periods'], simulation_config['real-time-modes'], 
+                                    simulation_config['second-slice-size'], simulation_config['harmonic-periods'], 
+                                    (random.Random(f'{seed}/ptasks') if seed is not None else None))
 
+def attach_traces(cores: list[Core], results_store: ResultsStore, run_id: int, simulation_config):
     for core in cores:
-        qscheduler.schedule(core, simulation_config['duration'])
-
-    if not os.path.exists('./simulation-results'):
-        os.mkdir('simulation-results')
+        core.trace = TraceWriter(results_store.trace_path(run_id, core.core_id), simulation_config['second-slice-size'], 
+                                 simulation_config['trace-chunk-size'])
 
-    simulation_number = len(os.listdir('./simulation-results')) + 1
-    simulation_path = f'./simulation-results/{simulation_number}'
-    if os.path.exists(simulation_path):
-        os.rmdir(simulation_path)
-    os.mkdir(simulation_path)
+def simulate(core_config, qscheduler_config, simulation_config, results_store: ResultsStore = None, run_id: int = None):
+    cores = build_cores(core_config, simulation_config)
+    if results_store is not None and simulation_config['trace']:
+        attach_traces(cores, results_store, run_id, simulation_config)
+    ptasks = build_ptasks(cores, simulation_config, qscheduler_config['seed'])
+    
+    qscheduler = build_qscheduler(qscheduler_config, simulation_config)
+    qscheduler.map_ptasks_to_cores(cores, ptasks)
+    qscheduler.schedule_cores(cores, simulation_config['duration'])
 
-    config = { "core": core_config, "qscheduler": qscheduler_config, "simulation": simulation_config}
     ptask_stats = PTaskStat.extract_ptask_stats(cores, simulation_config['second-slice-size'])
-    json.dump(config, open(f'{simulation_path}/config.json', 'w'), indent=4)
-    json.dump(list(map(PTaskStat.ptask_stat_to_dict, ptask_stats)), open(f'{simulation_path}/ptasks.json', 'w'), indent=4)
-    
+    return cores, ptask_stats
+
+def write_metrics(cores: list[Core], simulation_path):
+    cores = [core for core in cores if core.metrics is not None]
+    if len(cores) == 0:
+        return
+    json.dump({core.get_full_name(): core.metrics.report() for core in cores}, open(f'{simulation_path}/metrics.json', 'w'), indent=4)
+    rows = [core.metrics.csv_row() for core in cores]
+    with open(f'{simulation_path}/metrics.csv', 'w', newline='') as metrics_file:
+        writer = csv.DictWriter(metrics_file, fieldnames=list(dict.fromkeys(key for row in rows for key in row)))
+        writer.writeheader()
+        writer.writerows(rows)
+    for core in cores:
+        if core.metrics.profile is not None:
+            open(f'{simulation_path}/profile-core-{core.core_id}.prof', 'wb').write(core.metrics.profile)
+
+def draw_charts(cores: list[Core], ptask_stats: list[PTaskStat], simulation_config, simulation_path):
     chart = Chart()
     core_timeline_fig = chart.draw_core_timeline(cores, simulation_config['second-slice-size'], simulation_config['duration'])
     core_timeline_fig.savefig(f'{simulation_path}/core_timeline.jpg')
@@ -63,5 +101,31 @@ def launch():
     core_energy_fig = chart.draw_core_energy(cores, simulation_config['duration'])
     core_energy_fig.savefig(f'{simulation_path}/core_energy.jpg')
 
+def launch(charts=True, chart_executor: Executor = None) -> Future:
+    core_config, qscheduler_config, simulation_config = load_configs()
+    results_store = ResultsStore()
+    run_id = results_store.create_run()
+    try:
+        cores, ptask_stats = simulate(core_config, qscheduler_config, simulation_config, results_store, run_id)
+    except BaseException:
+        results_store.discard_run(run_id)
+        raise
+    simulation_path = results_store.run_path(run_id)
+
+    with (ProcessPoolExecutor(max_workers=1) if charts and chart_executor is None else nullcontext(chart_executor)) as executor:
+        chart_future = (executor.submit(draw_charts, [core.chart_view() for core in cores], ptask_stats, simulation_config, simulation_path) 
+                        if charts else None)
+        config = { "core": core_config, "qscheduler": qscheduler_config, "simulation": simulation_config}
+        results_store.write_json(run_id, 'config.json', config)
+        results_store.write_json(run_id, 'ptasks.json', list(map(PTaskStat.ptask_stat_to_dict, ptask_stats)), compact=True)
+        results_store.write_json(run_id, 'convergence.json', {core.get_full_name(): core.learning_report for core in cores})
+        write_metrics(cores, simulation_path)
+        if chart_future is not None and chart_executor is None:
+            chart_future.result()
+    return chart_future
+
 if __name__ == '__main__':
-    launch()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Run a single simulation and store its results.')
+    parser.add_argument('--no-charts', action='store_true')
+    args = parser.parse_args()
+    launch(not args.no_charts)
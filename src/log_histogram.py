@@ -0,0 +1,70 @@
+import math
+import numpy as np
+
+class LogHistogram:
+    BUCKETS_PER_OCTAVE = 32
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min_value = None
+        self.max_value = None
+
+    def bucket(self, value: int) -> int:
+        if value == 0:
+            return 0
+        bucket = math.floor(math.log2(abs(value)) * LogHistogram.BUCKETS_PER_OCTAVE) + 1
+        return (bucket if value > 0 else -bucket)
+
+    def buckets(self, values: np.ndarray) -> np.ndarray:
+        magnitudes = np.abs(values)
+        buckets = np.floor(np.log2(np.maximum(magnitudes, 1)) * LogHistogram.BUCKETS_PER_OCTAVE).astype(np.int64) + 1
+        return np.where(values == 0, 0, np.where(values > 0, buckets, -buckets))
+
+    def bucket_value(self, bucket: int) -> float:
+        if bucket == 0:
+            return 0.0
+        magnitude = 2 ** ((abs(bucket) - 0.5) / LogHistogram.BUCKETS_PER_OCTAVE)
+        return (magnitude if bucket > 0 else -magnitude)
+
+    def add(self, value: int):
+        bucket = self.bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min_value = (value if self.min_value is None else min(self.min_value, value))
+        self.max_value = (value if self.max_value is None else max(self.max_value, value))
+
+    def add_array(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+        (buckets, counts,) = np.unique(self.buckets(values), return_counts=True)
+        for (bucket, count,) in zip(buckets.tolist(), counts.tolist()):
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += len(values)
+        self.total += int(values.sum())
+        (min_value, max_value,) = (int(values.min()), int(values.max()))
+        self.min_value = (min_value if self.min_value is None else min(self.min_value, min_value))
+        self.max_value = (max_value if self.max_value is None else max(self.max_value, max_value))
+
+    def merge(self, other: 'LogHistogram'):
+        for (bucket, count,) in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count > 0:
+            self.min_value = (other.min_value if self.min_value is None else min(self.min_value, other.min_value))
+            self.max_value = (other.max_value if self.max_value is None else max(self.max_value, other.max_value))
+
+    def percentiles(self, percentiles: tuple) -> tuple[float]:
+        if self.count == 0:
+            return tuple(None for percentile in percentiles)
+        buckets = sorted(self.counts)
+        cumulative = np.cumsum([self.counts[bucket] for bucket in buckets])
+        values = []
+        for percentile in percentiles:
+            rank = max(math.ceil(self.count * percentile / 100), 1)
+            bucket = buckets[int(np.searchsorted(cumulative, rank))]
+            values.append(min(max(self.bucket_value(bucket), self.min_value), self.max_value))
+        return tuple(values)
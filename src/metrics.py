@@ -0,0 +1,90 @@
+import sys
+import time
+import resource
+import tracemalloc
+from array import array
+from contextlib import contextmanager
+from action import Action
+
+class CoreMetrics:
+    QTABLE_SIZE_SAMPLES = 100
+
+    def __init__(self, core_name):
+        self.core_name = core_name
+        self.episode_steps = array('l')
+        self.episode_inserts = array('l')
+        self.qtable_sizes = array('l')
+        self.action_counts = [0] * len(Action)
+        self.phase_times: dict[str, float] = {}
+        self.phase_peak_kb: dict[str, int] = {}
+        self.open_phases: list[list[int]] = []
+        self.process_peak_rss_kb = None
+        self.profile: bytes = None
+
+    @contextmanager
+    def phase(self, name):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            self.open_phase()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+            if tracing:
+                self.close_phase(name)
+
+    def open_phase(self):
+        (current, peak,) = tracemalloc.get_traced_memory()
+        if len(self.open_phases) > 0:
+            self.open_phases[-1][1] = max(self.open_phases[-1][1], peak)
+        self.open_phases.append([current, current])
+        tracemalloc.reset_peak()
+
+    def close_phase(self, name):
+        (start, peak,) = self.open_phases.pop()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        self.phase_peak_kb[name] = max(self.phase_peak_kb.get(name, 0), (peak - start) // 1024)
+        if len(self.open_phases) > 0:
+            self.open_phases[-1][1] = max(self.open_phases[-1][1], peak)
+
+    def record_episode(self, steps: int, new_states: int, qtable_size: int):
+        self.episode_steps.append(steps)
+        self.episode_inserts.append(new_states)
+        self.qtable_sizes.append(qtable_size)
+
+    def record_process_peak_rss(self):
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        self.process_peak_rss_kb = (peak_rss // 1024 if sys.platform == 'darwin' else peak_rss)
+
+    def report(self) -> dict:
+        episodes, steps, inserts = len(self.episode_steps), sum(self.episode_steps), sum(self.episode_inserts)
+        sample_interval = max(1, -(-episodes // CoreMetrics.QTABLE_SIZE_SAMPLES))
+        learn_time = self.phase_times.get('learn', 0.0)
+        return {
+            'core': self.core_name,
+            'episodes': episodes,
+            'steps': steps,
+            'average-steps-per-episode': (steps / episodes if episodes > 0 else None),
+            'max-steps-per-episode': max(self.episode_steps, default=None),
+            'qtable-size': (self.qtable_sizes[-1] if episodes > 0 else 0),
+            'new-states': inserts,
+            'new-states-per-episode': (inserts / episodes if episodes > 0 else None),
+            'new-states-per-second': (inserts / learn_time if learn_time > 0 else None),
+            'steps-per-second': (steps / learn_time if learn_time > 0 else None),
+            'action-distribution': {str(action): self.action_counts[action] for action in Action},
+            'phase-seconds': self.phase_times,
+            'phase-peak-allocated-kB': self.phase_peak_kb,
+            'process-peak-rss-kB': self.process_peak_rss_kb,
+            'qtable-size-curve': [{'episode': episode + 1, 'qtable-size': self.qtable_sizes[episode]}
+                                  for episode in range(sample_interval - 1, episodes, sample_interval)]
+        }
+
+    def csv_row(self) -> dict:
+        report = self.report()
+        row = {key: value for (key, value,) in report.items() 
+               if key not in ('action-distribution', 'phase-seconds', 'phase-peak-allocated-kB', 'qtable-size-curve')}
+        row.update({f'{phase}-seconds': seconds for (phase, seconds,) in report['phase-seconds'].items()})
+        row.update({f'{phase}-peak-allocated-kB': size for (phase, size,) in report['phase-peak-allocated-kB'].items()})
+        row.update({f'action-{action}': count for (action, count,) in report['action-distribution'].items()})
+        return row
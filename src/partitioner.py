@@ -0,0 +1,161 @@
+import heapq
+import random
+from core import Core
+from ptask import PTask
+
+class CoreIndex:
+    def __init__(self, values: list[float]):
+        self.size = 1
+        while self.size < max(len(values), 1):
+            self.size *= 2
+        self.tree = [float('-inf')] * (2 * self.size)
+        self.tree[self.size:self.size + len(values)] = values
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def update(self, index: int, value: float):
+        node = self.size + index
+        self.tree[node] = value
+        node //= 2
+        while node > 0:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def first_at_least(self, value: float) -> int:
+        if self.tree[1] < value:
+            return None
+        node = 1
+        while node < self.size:
+            node = (2 * node if self.tree[2 * node] >= value else 2 * node + 1)
+        return node - self.size
+
+class FitTree:
+    def __init__(self, values: list[float]):
+        self.rng = random.Random()
+        self.root = None
+        for (index, value,) in enumerate(values):
+            self.insert(value, index)
+
+    def split(self, node: list, key: tuple) -> tuple[list, list]:
+        if node is None:
+            return None, None
+        if node[0] < key:
+            (node[3], right,) = self.split(node[3], key)
+            return node, right
+        (left, node[2],) = self.split(node[2], key)
+        return left, node
+
+    def merge(self, left: list, right: list) -> list:
+        if left is None or right is None:
+            return (left if right is None else right)
+        if left[1] > right[1]:
+            left[3] = self.merge(left[3], right)
+            return left
+        right[2] = self.merge(left, right[2])
+        return right
+
+    def insert(self, value: float, index: int):
+        (left, right,) = self.split(self.root, (value, index,))
+        self.root = self.merge(self.merge(left, [(value, index,), self.rng.random(), None, None]), right)
+
+    def pop_at_least(self, value: float) -> int:
+        (left, right,) = self.split(self.root, (value, -1,))
+        if right is None:
+            self.root = left
+            return None
+        (parent, node,) = (None, right)
+        while node[2] is not None:
+            (parent, node,) = (node, node[2])
+        if parent is None:
+            right = node[3]
+        else:
+            parent[2] = node[3]
+        self.root = self.merge(left, right)
+        return node[0][1]
+
+def decreasing(ptasks: list[PTask]) -> list[int]:
+    return sorted(range(len(ptasks)), key=lambda ptask_index: ptasks[ptask_index].needed_resource(), reverse=True)
+
+def first_fit(cores: list[Core], ptasks: list[PTask]) -> list[int]:
+    available = [core.available_resource for core in cores]
+    index, assignment = CoreIndex(available), []
+    for ptask in ptasks:
+        core_index = index.first_at_least(ptask.needed_resource())
+        if core_index is None:
+            raise ValueError('Core mapping failed.')
+        available[core_index] -= ptask.needed_resource()
+        index.update(core_index, available[core_index])
+        assignment.append(core_index)
+    return assignment
+
+def best_fit(cores: list[Core], ptasks: list[PTask]) -> list[int]:
+    available = [core.available_resource for core in cores]
+    index, assignment = FitTree(available), []
+    for ptask in ptasks:
+        core_index = index.pop_at_least(ptask.needed_resource())
+        if core_index is None:
+            raise ValueError('Core mapping failed.')
+        available[core_index] -= ptask.needed_resource()
+        index.insert(available[core_index], core_index)
+        assignment.append(core_index)
+    return assignment
+
+def worst_fit(cores: list[Core], ptasks: list[PTask]) -> list[int]:
+    available = [core.available_resource for core in cores]
+    index, assignment = [(-resource, core_index,) for (core_index, resource,) in enumerate(available)], []
+    heapq.heapify(index)
+    for ptask in ptasks:
+        if len(index) == 0 or available[index[0][1]] < ptask.needed_resource():
+            raise ValueError('Core mapping failed.')
+        core_index = index[0][1]
+        available[core_index] -= ptask.needed_resource()
+        heapq.heapreplace(index, (-available[core_index], core_index,))
+        assignment.append(core_index)
+    return assignment
+
+def worst_fit_decreasing(cores: list[Core], ptasks: list[PTask]) -> list[int]:
+    order = decreasing(ptasks)
+    return reorder(worst_fit(cores, [ptasks[i] for i in order]), order)
+
+def energy_cost(core: Core) -> float:
+    default_power = core.power_coefficients[core.default_dvfs_level] * core.one_ghz_power
+    return default_power / core.default_instruction_per_time_unit()
+
+def energy_aware(cores: list[Core], ptasks: list[PTask]) -> list[int]:
+    core_order = sorted(range(len(cores)), key=lambda core_index: energy_cost(cores[core_index]))
+    costs = [energy_cost(cores[core_index]) for core_index in core_order]
+    available = [cores[core_index].available_resource for core_index in core_order]
+    power_headroom = [cores[core_index].allowed_avg_power for core_index in core_order]
+    index = CoreIndex([min(resource, headroom / cost) for (resource, headroom, cost,) in zip(available, power_headroom, costs)])
+    order, assignment = decreasing(ptasks), []
+    for ptask_index in order:
+        needed_resource = ptasks[ptask_index].needed_resource()
+        position = index.first_at_least(needed_resource)
+        if position is None:
+            raise ValueError('Core mapping failed.')
+        available[position] -= needed_resource
+        power_headroom[position] -= needed_resource * costs[position]
+        index.update(position, min(available[position], power_headroom[position] / costs[position]))
+        assignment.append(core_order[position])
+    return reorder(assignment, order)
+
+def reorder(assignment: list[int], order: list[int]) -> list[int]:
+    result = [None] * len(assignment)
+    for (core_index, ptask_index,) in zip(assignment, order):
+        result[ptask_index] = core_index
+    return result
+
+PARTITIONERS = {
+    'first-fit': first_fit,
+    'best-fit': best_fit,
+    'worst-fit': worst_fit,
+    'worst-fit-decreasing': worst_fit_decreasing,
+    'energy-aware': energy_aware
+}
+
+def map_ptasks(mapping_algorithm, cores: list[Core], ptasks: list[PTask]):
+    if mapping_algorithm not in PARTITIONERS:
+        raise ValueError('Core mapping algorithm is not supported.')
+    assignment = PARTITIONERS[mapping_algorithm](cores, ptasks)
+    for (ptask, core_index,) in zip(ptasks, assignment):
+        cores[core_index].add_ptask(ptask)
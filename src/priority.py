@@ -0,0 +1,18 @@
+from enum import IntEnum
+
+class Priority(IntEnum):
+    SOFT = 0
+    FIRM = 1
+    HARD = 2
+
+    def __str__(self):
+        return self.name.lower()
+
+    @staticmethod
+    def parse(priority) -> 'Priority':
+        if isinstance(priority, Priority):
+            return priority
+        try:
+            return Priority[priority.upper()]
+        except KeyError:
+            raise ValueError('Priority is not supported.')
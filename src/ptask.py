@@ -1,9 +1,13 @@
+from priority import Priority
+
 class PTask:
+    __slots__ = ('id', 'ins_count', 'period', 'priority')
+
     def __init__(self, id, ins_count, period, priority):
         self.id = id
         self.ins_count = ins_count
         self.period = period
-        self.priority = priority
+        self.priority = Priority.parse(priority)
 
     def needed_resource(self):
         return self.ins_count / self.period
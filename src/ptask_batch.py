@@ -0,0 +1,23 @@
+import numpy as np
+from ptask import PTask
+from priority import Priority
+
+class PTaskBatch:
+    def __init__(self, utilization: np.ndarray, ins_count: np.ndarray, period: np.ndarray, priority: np.ndarray):
+        self.utilization = utilization
+        self.ins_count = ins_count
+        self.period = period
+        self.priority = priority
+
+    def __len__(self):
+        return self.utilization.shape[0]
+
+    def task_set_size(self):
+        return self.utilization.shape[1]
+
+    def needed_resource(self) -> np.ndarray:
+        return self.ins_count / self.period
+
+    def ptasks(self, index: int) -> list[PTask]:
+        return [PTask(i + 1, ins_count, period, Priority(priority)) for (i, (ins_count, period, priority,),) in 
+                enumerate(zip(self.ins_count[index].tolist(), self.period[index].tolist(), self.priority[index].tolist()))]
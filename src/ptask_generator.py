@@ -1,16 +1,51 @@
 import math
 import random
-from uunifast import generate_uunifastdiscard
+import numpy as np
+from uunifast import generate_uunifastdiscard, generate_uunifastdiscard_batch
 from ptask import PTask
+from ptask_batch import PTaskBatch
+from priority import Priority
 
 class PTaskGenerator:
     def generate(self, task_set_size, utilization, total_cpu_resource, periods, real_time_modes, 
-                 second_slice_size) -> list[PTask]:
-        task_set, ptasks, next_id = generate_uunifastdiscard(1, utilization, task_set_size)[0], [], 1
+                 second_slice_size, harmonic_periods=False, rng: random.Random = None) -> list[PTask]:
+        rng = (rng if rng is not None else random)
+        task_set, ptasks, next_id = generate_uunifastdiscard(1, utilization, task_set_size, rng)[0], [], 1
+        base_period = max(math.floor(min(period_segment[0] for period_segment in periods.values()) * second_slice_size), 1)
         for u in task_set:
-            period_segment = random.choice(list(periods.values()))
-            period = math.floor(random.uniform(*period_segment) * second_slice_size)
-            priority = random.choice(real_time_modes)
+            period_segment = rng.choice(list(periods.values()))
+            period = math.floor(rng.uniform(*period_segment) * second_slice_size)
+            if harmonic_periods:
+                period = self.harmonize_period(period, base_period)
+            priority = Priority.parse(rng.choice(real_time_modes))
             ptasks.append(PTask(next_id, math.floor(u * total_cpu_resource * period), period, priority))
             next_id += 1
-        return ptasks
\ No newline at end of file
+        return ptasks
+
+    def generate_batch(self, no_task_sets, task_set_size, utilization, total_cpu_resource, periods, real_time_modes, 
+                       second_slice_size, harmonic_periods=False, seed=None) -> PTaskBatch:
+        rng = np.random.default_rng(seed)
+        shape = (no_task_sets, task_set_size)
+        utilizations = generate_uunifastdiscard_batch(no_task_sets, utilization, task_set_size, rng)
+        period_segments = np.array(list(periods.values()), dtype=np.float64)
+        segment_indices = rng.integers(len(period_segments), size=shape)
+        period = np.floor(rng.uniform(period_segments[segment_indices, 0], period_segments[segment_indices, 1]) * second_slice_size)
+        period = period.astype(np.int64)
+        if harmonic_periods:
+            base_period = max(math.floor(period_segments[:, 0].min() * second_slice_size), 1)
+            period = self.harmonize_periods(period, base_period)
+        priority_codes = np.array([Priority.parse(real_time_mode) for real_time_mode in real_time_modes], dtype=np.int8)
+        priority = priority_codes[rng.integers(len(priority_codes), size=shape)]
+        ins_count = np.floor(utilizations * total_cpu_resource * period).astype(np.int64)
+        return PTaskBatch(utilizations, ins_count, period, priority)
+
+    def harmonize_periods(self, period: np.ndarray, base_period) -> np.ndarray:
+        harmonic_period = base_period * (2 ** np.maximum(np.floor(np.log2(period / base_period)), 0).astype(np.int64))
+        harmonic_period = np.where((harmonic_period > period) & (harmonic_period > base_period), harmonic_period // 2, harmonic_period)
+        return np.where(harmonic_period * 2 <= period, harmonic_period * 2, harmonic_period)
+
+    def harmonize_period(self, period, base_period):
+        harmonic_period = base_period
+        while harmonic_period * 2 <= period:
+            harmonic_period *= 2
+        return harmonic_period
\ No newline at end of file
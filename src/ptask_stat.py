@@ -1,9 +1,11 @@
 from core import Core
-from ptask import PTask
+from priority import Priority
+from ptask_stat_accumulator import PTaskStatAccumulator
 
 class PTaskStat:
     def __init__(self, id, ins_count, period, priority, no_tasks, missed_tasks, delayed_tasks, avg_execution_time, 
-                 avg_waiting_time, avg_slack_time, avg_response_time, processing_core):
+                 avg_waiting_time, avg_slack_time, avg_response_time, processing_core, response_time_percentiles=(None, None, None), 
+                 slack_time_percentiles=(None, None, None), max_lateness=None):
         self.id = id
         self.ins_count = ins_count
         self.period = period
@@ -16,55 +18,26 @@ class PTaskStat:
         self.avg_slack_time = avg_slack_time
         self.avg_response_time = avg_response_time
         self.processing_core = processing_core
+        (self.p50_response_time, self.p95_response_time, self.p99_response_time,) = response_time_percentiles
+        (self.p50_slack_time, self.p95_slack_time, self.p99_slack_time,) = slack_time_percentiles
+        self.max_lateness = max_lateness
     
     @staticmethod
     def extract_ptask_stats(cores: list[Core], second_slice_size):
-        ptasks: list[PTask] = []
+        stat_accumulator = PTaskStatAccumulator(second_slice_size)
         for core in cores:
-            for ptask in core.ptasks:
-                ptasks.append(ptask)
-        temp_stats = [{ 'number-of-tasks': 0, 
-                        'missed-tasks': 0,
-                        'delayed-tasks': 0,
-                        'total-execution-time': 0,
-                        'total-waiting-time': 0,
-                        'total-slack-time': 0,
-                        'total-response-time': 0,
-                        'processing-core': ''} for i in range(len(ptasks))]
+            if core.stat_accumulator is not None:
+                stat_accumulator.merge(core.stat_accumulator)
+            elif core.tasks is not None:
+                stat_accumulator.add_task_table(core.tasks, core.scheduled_tasks, core.missed_tasks)
+
+        ptask_stats: list[PTaskStat] = []
         for core in cores:
             for ptask in core.ptasks:
-                temp_stats[ptask.id - 1]['processing-core'] = core.get_full_name()
-        
-        for core in cores:
-            for task in core.scheduled_tasks:
-                temp_stats[task.ptask_id - 1]['number-of-tasks'] += 1
-                temp_stats[task.ptask_id - 1]['delayed-tasks'] += (task.is_delayed)
-                temp_stats[task.ptask_id - 1]['total-execution-time'] += (task.finish_time - task.start_time) / second_slice_size
-                temp_stats[task.ptask_id - 1]['total-waiting-time'] += (task.start_time - task.arrival_time) / second_slice_size
-                temp_stats[task.ptask_id - 1]['total-slack-time'] += (task.deadline - task.finish_time) / second_slice_size
-                temp_stats[task.ptask_id - 1]['total-response-time'] += (task.finish_time - task.arrival_time) / second_slice_size
-            for task in core.missed_tasks:
-                temp_stats[task.ptask_id - 1]['number-of-tasks'] += 1
-                temp_stats[task.ptask_id - 1]['missed-tasks'] += 1
-        
-        ptask_stats: list[PTaskStat] = []
-        for ptask in ptasks:
-            no_scheduled_tasks = temp_stats[ptask.id - 1]['number-of-tasks'] - temp_stats[ptask.id - 1]['missed-tasks']
-            if no_scheduled_tasks > 0:
-                ptask_stat = PTaskStat(ptask.id, ptask.ins_count, ptask.period / second_slice_size, ptask.priority, temp_stats[ptask.id - 1]['number-of-tasks'],
-                                       temp_stats[ptask.id - 1]['missed-tasks'], temp_stats[ptask.id - 1]['delayed-tasks'], 
-                                       temp_stats[ptask.id - 1]['total-execution-time'] / no_scheduled_tasks,
-                                       temp_stats[ptask.id - 1]['total-waiting-time'] / no_scheduled_tasks,
-                                       temp_stats[ptask.id - 1]['total-slack-time'] / no_scheduled_tasks,
-                                       temp_stats[ptask.id - 1]['total-response-time'] / no_scheduled_tasks,
-                                       temp_stats[ptask.id - 1]['processing-core'])
-                ptask_stats.append(ptask_stat)
-            else:
-                ptask_stat = PTaskStat(ptask.id, ptask.ins_count, ptask.period / second_slice_size, ptask.priority, temp_stats[ptask.id - 1]['number-of-tasks'],
-                                       temp_stats[ptask.id - 1]['missed-tasks'], temp_stats[ptask.id - 1]['delayed-tasks'], None, None, None, None,
-                                       temp_stats[ptask.id - 1]['processing-core'])
-                ptask_stats.append(ptask_stat)
-                
+                summary = stat_accumulator.summary(ptask.id)
+                ptask_stats.append(PTaskStat(ptask.id, ptask.ins_count, ptask.period / second_slice_size, ptask.priority, summary['no-tasks'],
+                                             summary['missed-tasks'], summary['delayed-tasks'], *summary['averages'], core.get_full_name(),
+                                             summary['response-percentiles'], summary['slack-percentiles'], summary['max-lateness']))
         return ptask_stats
     
     @staticmethod
@@ -73,7 +46,7 @@ class PTaskStat:
             'id': ptask_stat.id,
             'instruction-count': ptask_stat.ins_count,
             'period': ptask_stat.period,
-            'priority': ptask_stat.priority,
+            'priority': str(ptask_stat.priority),
             'number-of-tasks': ptask_stat.no_tasks,
             'missed-tasks': ptask_stat.missed_tasks,
             'delayed-tasks': ptask_stat.delayed_tasks,
@@ -81,14 +54,21 @@ class PTaskStat:
             'average-waiting-time': ptask_stat.avg_waiting_time,
             'average-slack-time': ptask_stat.avg_slack_time,
             'average-response-time': ptask_stat.avg_response_time,
-            'processing-core': ptask_stat.processing_core
+            'processing-core': ptask_stat.processing_core,
+            'p50-response-time': ptask_stat.p50_response_time,
+            'p95-response-time': ptask_stat.p95_response_time,
+            'p99-response-time': ptask_stat.p99_response_time,
+            'p50-slack-time': ptask_stat.p50_slack_time,
+            'p95-slack-time': ptask_stat.p95_slack_time,
+            'p99-slack-time': ptask_stat.p99_slack_time,
+            'max-lateness': ptask_stat.max_lateness
         }
     
     @staticmethod
     def priority_short_form(priority):
-        if priority == 'hard':
+        if priority == Priority.HARD:
             return 'H'
-        elif priority == 'soft':
+        elif priority == Priority.SOFT:
             return 'S'
         else:
             return 'F'
\ No newline at end of file
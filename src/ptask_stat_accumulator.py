@@ -0,0 +1,119 @@
+import numpy as np
+from task_table import TaskTable
+from log_histogram import LogHistogram
+
+class PTaskStatAccumulator:
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, second_slice_size):
+        self.second_slice_size = second_slice_size
+        self.slots: dict[int, int] = {}
+        self.no_tasks: list[int] = []
+        self.missed_tasks: list[int] = []
+        self.delayed_tasks: list[int] = []
+        self.total_execution_time: list[float] = []
+        self.total_waiting_time: list[float] = []
+        self.total_slack_time: list[float] = []
+        self.total_response_time: list[float] = []
+        self.max_lateness: list[int] = []
+        self.response_times: list[LogHistogram] = []
+        self.slack_times: list[LogHistogram] = []
+
+    def slot(self, ptask_id: int) -> int:
+        slot = self.slots.get(ptask_id)
+        if slot is not None:
+            return slot
+        slot = self.slots[ptask_id] = len(self.no_tasks)
+        for column in (self.no_tasks, self.missed_tasks, self.delayed_tasks):
+            column.append(0)
+        for column in (self.total_execution_time, self.total_waiting_time, self.total_slack_time, self.total_response_time):
+            column.append(0.0)
+        self.max_lateness.append(None)
+        self.response_times.append(LogHistogram())
+        self.slack_times.append(LogHistogram())
+        return slot
+
+    def add_scheduled(self, ptask_id: int, arrival_time: int, deadline: int, start_time: int, finish_time: int, is_delayed: bool):
+        slot = self.slot(ptask_id)
+        self.no_tasks[slot] += 1
+        if is_delayed:
+            self.delayed_tasks[slot] += 1
+        self.total_execution_time[slot] += (finish_time - start_time) / self.second_slice_size
+        self.total_waiting_time[slot] += (start_time - arrival_time) / self.second_slice_size
+        self.total_slack_time[slot] += (deadline - finish_time) / self.second_slice_size
+        self.total_response_time[slot] += (finish_time - arrival_time) / self.second_slice_size
+        lateness = finish_time - deadline
+        if self.max_lateness[slot] is None or lateness > self.max_lateness[slot]:
+            self.max_lateness[slot] = lateness
+        self.response_times[slot].add(finish_time - arrival_time)
+        self.slack_times[slot].add(deadline - finish_time)
+
+    def add_missed(self, ptask_id: int):
+        slot = self.slot(ptask_id)
+        self.no_tasks[slot] += 1
+        self.missed_tasks[slot] += 1
+
+    def add_task_table(self, tasks: TaskTable, scheduled_tasks: list[int], missed_tasks: list[int]):
+        scheduled, missed = np.array(scheduled_tasks, dtype=np.int64), np.array(missed_tasks, dtype=np.int64)
+        (ptask_ids, group_ids,) = np.unique(tasks.ptask_id[np.concatenate((scheduled, missed))], return_inverse=True)
+        slots = [self.slot(ptask_id) for ptask_id in ptask_ids.tolist()]
+        scheduled_groups, missed_groups = group_ids[:len(scheduled)], group_ids[len(scheduled):]
+        (arrival_time, deadline, start_time, finish_time,) = (tasks.arrival_time[scheduled], tasks.deadline[scheduled],
+                                                              tasks.start_time[scheduled], tasks.finish_time[scheduled])
+        no_groups = len(ptask_ids)
+        no_scheduled = np.bincount(scheduled_groups, minlength=no_groups)
+        no_missed = np.bincount(missed_groups, minlength=no_groups)
+        no_delayed = np.bincount(scheduled_groups[tasks.is_delayed[scheduled]], minlength=no_groups)
+        totals = [np.bincount(scheduled_groups, weights=times / self.second_slice_size, minlength=no_groups).tolist()
+                  for times in (finish_time - start_time, start_time - arrival_time, deadline - finish_time, finish_time - arrival_time)]
+        max_lateness = np.full(no_groups, np.iinfo(np.int64).min)
+        np.maximum.at(max_lateness, scheduled_groups, finish_time - deadline)
+
+        order = np.argsort(scheduled_groups, kind='stable')
+        bounds = np.searchsorted(scheduled_groups[order], np.arange(no_groups + 1))
+        response_times, slack_times = (finish_time - arrival_time)[order], (deadline - finish_time)[order]
+        for (group, slot,) in enumerate(slots):
+            self.no_tasks[slot] += int(no_scheduled[group] + no_missed[group])
+            self.missed_tasks[slot] += int(no_missed[group])
+            self.delayed_tasks[slot] += int(no_delayed[group])
+            self.total_execution_time[slot] += totals[0][group]
+            self.total_waiting_time[slot] += totals[1][group]
+            self.total_slack_time[slot] += totals[2][group]
+            self.total_response_time[slot] += totals[3][group]
+            if no_scheduled[group] > 0 and (self.max_lateness[slot] is None or max_lateness[group] > self.max_lateness[slot]):
+                self.max_lateness[slot] = int(max_lateness[group])
+            self.response_times[slot].add_array(response_times[bounds[group]:bounds[group + 1]])
+            self.slack_times[slot].add_array(slack_times[bounds[group]:bounds[group + 1]])
+
+    def merge(self, other):
+        for (ptask_id, other_slot,) in other.slots.items():
+            slot = self.slot(ptask_id)
+            self.no_tasks[slot] += other.no_tasks[other_slot]
+            self.missed_tasks[slot] += other.missed_tasks[other_slot]
+            self.delayed_tasks[slot] += other.delayed_tasks[other_slot]
+            self.total_execution_time[slot] += other.total_execution_time[other_slot]
+            self.total_waiting_time[slot] += other.total_waiting_time[other_slot]
+            self.total_slack_time[slot] += other.total_slack_time[other_slot]
+            self.total_response_time[slot] += other.total_response_time[other_slot]
+            if other.max_lateness[other_slot] is not None and (self.max_lateness[slot] is None or
+                                                               other.max_lateness[other_slot] > self.max_lateness[slot]):
+                self.max_lateness[slot] = other.max_lateness[other_slot]
+            self.response_times[slot].merge(other.response_times[other_slot])
+            self.slack_times[slot].merge(other.slack_times[other_slot])
+
+    def summary(self, ptask_id: int) -> dict:
+        slot = self.slot(ptask_id)
+        no_scheduled_tasks = self.no_tasks[slot] - self.missed_tasks[slot]
+        summary = {'no-tasks': self.no_tasks[slot], 'missed-tasks': self.missed_tasks[slot], 'delayed-tasks': self.delayed_tasks[slot],
+                   'averages': (None, None, None, None), 'response-percentiles': (None, None, None), 
+                   'slack-percentiles': (None, None, None), 'max-lateness': None}
+        if no_scheduled_tasks > 0:
+            summary['averages'] = (self.total_execution_time[slot] / no_scheduled_tasks, self.total_waiting_time[slot] / no_scheduled_tasks,
+                                   self.total_slack_time[slot] / no_scheduled_tasks, self.total_response_time[slot] / no_scheduled_tasks)
+            summary['response-percentiles'] = self.percentiles(self.response_times[slot])
+            summary['slack-percentiles'] = self.percentiles(self.slack_times[slot])
+            summary['max-lateness'] = self.max_lateness[slot] / self.second_slice_size
+        return summary
+
+    def percentiles(self, times: LogHistogram) -> tuple[float]:
+        return tuple(value / self.second_slice_size for value in times.percentiles(PTaskStatAccumulator.PERCENTILES))
@@ -1,13 +1,43 @@
+import os
+import math
 import random
+import cProfile
+import marshal
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from core import Core
 from ptask import PTask
-from task import Task
+from task_table import TaskTable
 from qstate import QState
+from qtable import QTable
+from abstract_qtable import AbstractQTable
+from qtable_store import QTableStore
+from action import Action
+from transition import Transition
+from convergence import ConvergenceMonitor
+from partitioner import map_ptasks
+from metrics import CoreMetrics
+from admission import AdmissionTest
+from state_encoder import build_state_encoder
+from trajectory_learner import TrajectoryLearner
+
+attempt_stop_event = None
+
+def init_attempt_worker(stop_event):
+    global attempt_stop_event
+    attempt_stop_event = stop_event
 
 class QScheduler:
+    STOP_CHECK_INTERVAL = 50
+
     def __init__(self, mapping_algorithm, learning_rate, exploration_prob, exploration_decay, episodes, soft_schedule_reward, 
                  soft_delay_reward, soft_miss_penalty, firm_schedule_reward, firm_miss_penalty, dvfs_up_reward, dvfs_down_reward, 
-                 finish_reward, retry, second_slice_size):
+                 finish_reward, retry, second_slice_size, execution_mode='sequential', workers=None, seed=None, early_stopping=False, 
+                 convergence_check_interval=100, convergence_patience=10, convergence_tolerance=1.0, qtable_cache=None, 
+                 hyperperiod_mode=False, instrumentation=False, profile=False, admission_test=True, retry_mode='serial', 
+                 retry_selection='first', retry_exploration_probs=None, state_encoder='exact', state_time_granularity=0.05, 
+                 state_energy_buckets=20, state_max_delayed=2, learner='one-step', n_step=8, replay_buffer_size=32, replay_updates=4):
         self.mapping_algorithm = mapping_algorithm
         self.learning_rate = learning_rate
         self.exploration_prob = exploration_prob
@@ -23,189 +53,431 @@ class QScheduler:
         self.finish_reward = finish_reward
         self.retry = retry
         self.second_slice_size = second_slice_size
+        self.execution_mode = execution_mode
+        self.workers = workers
+        self.seed = seed
+        self.early_stopping = early_stopping
+        self.convergence_check_interval = convergence_check_interval
+        self.convergence_patience = convergence_patience
+        self.convergence_tolerance = convergence_tolerance
+        self.qtable_store = (QTableStore(qtable_cache) if qtable_cache is not None else None)
+        self.hyperperiod_mode = hyperperiod_mode
+        self.instrumentation = instrumentation
+        self.profile = profile
+        self.admission_test = admission_test
+        self.retry_mode = retry_mode
+        self.retry_selection = retry_selection
+        self.retry_exploration_probs = retry_exploration_probs
+        self.state_encoder = build_state_encoder(state_encoder, state_time_granularity, state_energy_buckets, state_max_delayed, 
+                                                 second_slice_size)
+        self.learner = learner
+        self.n_step = n_step
+        self.replay_buffer_size = replay_buffer_size
+        self.replay_updates = replay_updates
 
     def map_ptasks_to_cores(self, cores: list[Core], ptasks: list[PTask]):
-        if self.mapping_algorithm == 'worst-fit':
-            for ptask in ptasks:
-                candidate_core: Core = None
-                for core in cores:
-                    if (core.available_resource >= ptask.needed_resource() and 
-                        (candidate_core == None or core.available_resource > candidate_core.available_resource)):
-                        candidate_core = core
-                if candidate_core == None:
-                    raise ValueError('Core mapping failed.')
-                candidate_core.add_ptask(ptask)
+        map_ptasks(self.mapping_algorithm, cores, ptasks)
 
+    def schedule_cores(self, cores: list[Core], duration):
+        seed = self.seed if self.seed is not None else random.getrandbits(64)
+        if self.execution_mode == 'sequential':
+            for core in cores:
+                self.schedule_core(core, duration, seed)
+        elif self.execution_mode == 'parallel':
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = executor.map(self.schedule_core, cores, [duration] * len(cores), [seed] * len(cores))
+                for (core, (tasks, scheduled_tasks, missed_tasks, stat_accumulator, freq_history, energy_history, 
+                            learning_report, metrics,),) in zip(cores, results):
+                    core.load_tasks(tasks)
+                    core.learning_report = learning_report
+                    core.metrics = metrics
+                    core.scheduled_tasks = scheduled_tasks
+                    core.missed_tasks = missed_tasks
+                    core.stat_accumulator = stat_accumulator
+                    core.freq_history = freq_history
+                    core.energy_history = energy_history
         else:
-            raise ValueError('Core mapping algorithm is not supported.')
-        
+            raise ValueError('Execution mode is not supported.')
+
+    def schedule_core(self, core: Core, duration, seed):
+        random.seed(f'{seed}/{core.core_id}')
+        core.metrics = (CoreMetrics(core.get_full_name()) if self.instrumentation else None)
+        profiler = (cProfile.Profile() if core.metrics is not None and self.profile else None)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            self.schedule(core, duration)
+        finally:
+            if core.trace is not None:
+                core.trace.close()
+        if profiler is not None:
+            profiler.disable()
+            profiler.create_stats()
+            core.metrics.profile = marshal.dumps(profiler.stats)
+        if core.metrics is not None:
+            core.metrics.record_process_peak_rss()
+        return (core.tasks, core.scheduled_tasks, core.missed_tasks, core.stat_accumulator, core.freq_history, core.energy_history, 
+                core.learning_report, core.metrics)
+
+    def phase(self, core: Core, name):
+        return (core.metrics.phase(name) if core.metrics is not None else nullcontext())
+
     def schedule(self, core: Core, duration):
-        retries, tasks = 0, self.extract_tasks_from_ptasks(core.ptasks, duration)
+        if self.hyperperiod_mode and self.schedule_hyperperiod(core, duration):
+            return
+        tasks = self.extract_tasks_from_ptasks(core.ptasks, duration)
+        (trajectory, model,) = self.learn_schedule(core, tasks, duration)
+        with self.phase(core, 'replay'):
+            self.replay_trajectory(core, tasks, trajectory, model)
+
+    def schedule_hyperperiod(self, core: Core, duration):
+        horizon = duration * self.second_slice_size
+        hyperperiod = math.lcm(*[ptask.period for ptask in core.ptasks])
+        if len(core.ptasks) == 0 or hyperperiod >= horizon:
+            return False
+
+        window = TaskTable.from_ptasks(core.ptasks, hyperperiod, whole_periods=True)
+        try:
+            (trajectory, model,) = self.learn_schedule(core, window, hyperperiod / self.second_slice_size, steady_state=True)
+        except ValueError:
+            return False
+        if not self.is_tileable(trajectory, model):
+            return False
+
+        with self.phase(core, 'replay'):
+            tasks = TaskTable.tile(window, hyperperiod, horizon)
+            core.load_tasks(tasks)
+            core.reset(dvfs_level=model.initial_dvfs_level, dvfs_lock_from=model.initial_dvfs_lock_from)
+            for tile_start in range(0, horizon, hyperperiod):
+                self.replay_tile(core, trajectory, model, (tile_start // hyperperiod) * len(window), tile_start, 
+                                 min(tile_start + hyperperiod, horizon))
+        return core.energy_history[-1][1] <= core.allowed_avg_power * duration
+
+    def is_tileable(self, trajectory: list[tuple[QState, int, Action]], model: Transition) -> bool:
+        if len(trajectory) == 0:
+            return False
+        states = [qstate for (qstate, state_id, action,) in trajectory]
+        states.append(model.step(trajectory[-1][0], trajectory[-1][2])[0])
+        end_state = states[-1]
+        if any(qstate.time > model.horizon for qstate in states) or end_state.time != model.horizon:
+            return False
+        return model.is_start_dvfs_state(end_state)
+
+    def replay_tile(self, core: Core, trajectory: list[tuple[QState, int, Action]], model: Transition, first_task: int, tile_start: int, 
+                    tile_end: int):
+        for (qstate, state_id, action,) in trajectory:
+            if tile_start + qstate.time >= tile_end and action != Action.MISS:
+                continue
+            if action == Action.SCHEDULE or action == Action.MISS or action == Action.DELAY:
+                task_index = first_task + qstate.task_num
+            elif action == Action.SCHEDULE_DELAYED:
+                task_index = first_task + qstate.delayed[0]
+            else:
+                task_index = None
+            if task_index is not None and task_index >= len(core.tasks):
+                continue
+
+            if action == Action.SCHEDULE or action == Action.SCHEDULE_DELAYED:
+                if max(core.tasks.arrival_time.item(task_index), core.last_finish_time()) + core.execution_time(task_index) > tile_end:
+                    core.miss(task_index)
+                else:
+                    core.schedule(task_index, action == Action.SCHEDULE_DELAYED)
+            elif action == Action.MISS:
+                core.miss(task_index)
+            elif action == Action.DELAY:
+                core.delay(task_index)
+            elif action == Action.DVFS_UP:
+                core.dvfs_up(tile_start + qstate.time)
+            elif action == Action.DVFS_DOWN:
+                core.dvfs_down(tile_start + qstate.time)
+            elif action == Action.STALL_TO_FINISH:
+                core.stall(min(model.horizon - qstate.time, tile_end - core.last_finish_time()))
+            elif action == Action.STALL_TO_DVFS_LOCK:
+                core.stall(min(core.dvfs_change_lock - (qstate.time - qstate.dvfs_lock_from), tile_end - core.last_finish_time()))
+        if core.last_finish_time() < tile_end:
+            core.stall(tile_end - core.last_finish_time())
+
+    def learn_schedule(self, core: Core, tasks: TaskTable, duration, steady_state=False):
+        if self.admission_test:
+            with self.phase(core, 'admission'):
+                admission = AdmissionTest(core, tasks, duration, self.second_slice_size, steady_state)
+                admitted = admission.check()
+            if not admitted:
+                raise ValueError(f'Scheduling failed: {admission.reason}.')
+        if self.retry_mode not in ('serial', 'speculative'):
+            raise ValueError('Retry mode is not supported.')
+        retries, qtable_key, qtable = 0, None, None
+        if self.qtable_store is not None:
+            qtable_key = self.qtable_key(core, tasks, duration, steady_state)
+            qtable = self.qtable_store.load(qtable_key, self.new_qtable(0))
+        if self.retry_mode == 'speculative':
+            with self.phase(core, 'speculative-retries'):
+                (trajectory, qtable,) = self.speculative_retries(core, tasks, duration, qtable, steady_state)
+            if self.qtable_store is not None:
+                with self.phase(core, 'qtable-cache'):
+                    self.qtable_store.save(qtable_key, qtable)
+            return trajectory, self.transition_model(core, tasks, duration, steady_state)
         while True:
             try:
-                qtable = self.learn_qtable(core, tasks, duration)
-                self.schedule_with_qtable(core, tasks, qtable, duration)
-                return
+                with self.phase(core, 'learn'):
+                    qtable = self.learn_qtable(core, tasks, duration, qtable, steady_state)
+                if self.qtable_store is not None:
+                    with self.phase(core, 'qtable-cache'):
+                        self.qtable_store.save(qtable_key, qtable)
+                with self.phase(core, 'greedy'):
+                    return self.solve_with_qtable(core, tasks, qtable, duration, steady_state)
             except ValueError as e:
                 retries += 1
                 if retries == self.retry:
                     raise e
 
-    def learn_qtable(self, core: Core, tasks: list[Task], duration: int):
-        qtable, exploration_prob = {}, self.exploration_prob
+    def speculative_retries(self, core: Core, tasks: TaskTable, duration, qtable: QTable = None, steady_state=False):
+        seeds, best = [random.getrandbits(64) for attempt in range(self.retry)], None
+        workers = min(self.retry, self.workers or os.cpu_count() or 1)
+        if workers == 1 or multiprocessing.parent_process() is not None:
+            for (attempt, seed,) in enumerate(seeds):
+                result = self.learn_attempt(attempt, core, tasks, duration, qtable, steady_state, seed)
+                if result is not None and (best is None or result[1] < best[1]):
+                    best = result
+                if best is not None and self.retry_selection == 'first':
+                    break
+        else:
+            context = multiprocessing.get_context()
+            stop_event = context.Event()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_attempt_worker, 
+                                     initargs=(stop_event,)) as executor:
+                futures = [executor.submit(self.learn_attempt, attempt, core, tasks, duration, qtable, steady_state, seed) 
+                           for (attempt, seed,) in enumerate(seeds)]
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result is None:
+                        continue
+                    if best is None or result[1] < best[1]:
+                        best = result
+                    if self.retry_selection == 'first':
+                        stop_event.set()
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        break
+        if best is None:
+            raise ValueError('Scheduling failed.')
+        (trajectory, score, learning_report, qtable,) = best
+        core.learning_report = learning_report
+        return trajectory, qtable
+
+    def learn_attempt(self, attempt: int, core: Core, tasks: TaskTable, duration, qtable: QTable, steady_state, seed):
+        random.seed(seed)
+        exploration_prob = (self.retry_exploration_probs[attempt % len(self.retry_exploration_probs)] 
+                            if self.retry_exploration_probs else self.exploration_prob)
+        qtable = self.learn_qtable(core, tasks, duration, qtable, steady_state, exploration_prob, attempt_stop_event)
+        if attempt_stop_event is not None and attempt_stop_event.is_set():
+            return None
+        try:
+            (trajectory, model,) = self.solve_with_qtable(core, tasks, qtable, duration, steady_state)
+        except ValueError:
+            return None
+        return trajectory, (*self.trajectory_score(trajectory, model), attempt,), core.learning_report, qtable
+
+    def trajectory_score(self, trajectory: list[tuple[QState, int, Action]], model: Transition) -> tuple[int, int]:
+        if len(trajectory) == 0:
+            return 0, 0
+        (qstate, state_id, action,) = trajectory[-1]
+        (final_qstate, reward, energy,) = model.step(qstate, action)
+        return sum(1 for (qstate, state_id, action,) in trajectory if action == Action.MISS), final_qstate.consumed_energy
+
+    def qtable_key(self, core: Core, tasks: TaskTable, duration, steady_state=False) -> str:
+        model_config = ({**self.reward_config(), 'steady-state': True} if steady_state else self.reward_config())
+        model_config.update(self.state_encoder.config())
+        model_config.update(self.learner_config())
+        return self.qtable_store.key(core, tasks, duration, model_config)
+
+    def transition_model(self, core: Core, tasks: TaskTable, duration, steady_state=False) -> Transition:
+        core.load_tasks(tasks)
+        return Transition(core, tasks, duration, self.second_slice_size, 
+                          (self.soft_schedule_reward, self.firm_schedule_reward, 0), (self.soft_miss_penalty, self.firm_miss_penalty, None), 
+                          (self.soft_delay_reward, None, None), self.dvfs_up_reward, self.dvfs_down_reward, steady_state)
+
+    def learner_config(self) -> dict:
+        learner_config = {'learner': self.learner, 'learning-rate': self.learning_rate}
+        if self.learner == 'n-step':
+            learner_config['n-step'] = self.n_step
+        if self.learner != 'one-step':
+            learner_config.update({'replay-buffer-size': self.replay_buffer_size, 'replay-updates': self.replay_updates})
+        return learner_config
+
+    def reward_config(self) -> dict:
+        return {
+            'soft-schedule-reward': self.soft_schedule_reward,
+            'soft-delay-reward': self.soft_delay_reward,
+            'soft-miss-penalty': self.soft_miss_penalty,
+            'firm-schedule-reward': self.firm_schedule_reward,
+            'firm-miss-penalty': self.firm_miss_penalty,
+            'dvfs-up-reward': self.dvfs_up_reward,
+            'dvfs-down-reward': self.dvfs_down_reward,
+            'finish-reward': self.finish_reward
+        }
+
+    def learn_qtable(self, core: Core, tasks: TaskTable, duration: int, qtable: QTable = None, steady_state=False, exploration_prob=None, 
+                     stop_event=None):
+        qtable = (qtable if qtable is not None else self.new_qtable())
+        exploration_prob = (exploration_prob if exploration_prob is not None else self.exploration_prob)
+        model = self.transition_model(core, tasks, duration, steady_state)
+        monitor = (ConvergenceMonitor(self.convergence_patience, self.convergence_tolerance) if self.early_stopping else None)
+        episodes, metrics, learner = 0, core.metrics, self.trajectory_learner()
+        action_counts = (metrics.action_counts if metrics is not None else None)
         for episode in range(self.episodes):
-            Task.reset(tasks)
-            core.reset()
-            qstate, terminated = QState(0, 0, core.dvfs_level, 0, 0, ()), False
-            self.add_qstate_to_qtable(qstate, qtable, tasks, core, duration)
+            qstate, terminated, steps, qtable_size = model.initial_state(), False, 0, len(qtable)
+            trajectory = ([] if learner is not None else None)
+            state_id = self.add_qstate_to_qtable(qstate, qtable, model)
             while not terminated:
-                (qstate, terminated,) = self.learning_step(qstate, qtable, tasks, core, duration, exploration_prob)
+                (qstate, state_id, terminated,) = self.learning_step(qstate, state_id, qtable, model, exploration_prob, action_counts, 
+                                                                     trajectory)
+                steps += 1
+            if learner is not None:
+                learner.learn(qtable, trajectory, qtable.is_finished(state_id))
             exploration_prob *= self.exploration_decay
+            episodes = episode + 1
+            if metrics is not None:
+                metrics.record_episode(steps - 1, len(qtable) - qtable_size, len(qtable))
+            if monitor is not None and episodes % self.convergence_check_interval == 0:
+                with self.phase(core, 'convergence-check'):
+                    converged = self.check_convergence(monitor, episodes, qtable, model)
+                if converged:
+                    break
+            if stop_event is not None and episodes % QScheduler.STOP_CHECK_INTERVAL == 0 and stop_event.is_set():
+                break
+        core.learning_report = (monitor.report(episodes) if monitor is not None else {'episodes': episodes, 'stopping-episode': None, 'curve': []})
         return qtable
 
-    def schedule_with_qtable(self, core: Core, tasks: list[Task], qtable: dict[QState, dict], duration: int):
-        Task.reset(tasks)
-        core.reset()
-        qstate, terminated = QState(0, 0, core.dvfs_level, 0, 0, ()), False
-        self.add_qstate_to_qtable(qstate, qtable, tasks, core, duration)
+    def trajectory_learner(self) -> TrajectoryLearner:
+        if self.learner == 'one-step':
+            return None
+        elif self.learner == 'backward':
+            return TrajectoryLearner(self.learning_rate, 1, self.replay_buffer_size, self.replay_updates)
+        elif self.learner == 'n-step':
+            return TrajectoryLearner(self.learning_rate, self.n_step, self.replay_buffer_size, self.replay_updates)
+        raise ValueError('Learner is not supported.')
+
+    def check_convergence(self, monitor: ConvergenceMonitor, episode: int, qtable: QTable, model: Transition):
+        (trajectory, state_id,) = self.greedy_rollout(qtable, model)
+        greedy_return = sum(qtable.rewards.item(step_state_id, action) for (qstate, step_state_id, action,) in trajectory)
+        finished = qtable.is_finished(state_id)
+        if finished:
+            greedy_return += self.finish_reward
+        qvalues = {(step_state_id, int(action),): qtable.qvalues.item(step_state_id, action) for (qstate, step_state_id, action,) in trajectory}
+        return monitor.observe(episode, greedy_return, finished, qvalues)
+
+    def greedy_rollout(self, qtable: QTable, model: Transition):
+        qstate, terminated, trajectory = model.initial_state(), False, []
+        state_id = self.add_qstate_to_qtable(qstate, qtable, model)
         while not terminated:
-            (qstate, terminated,) = self.solution_step(qstate, qtable, tasks, core, duration)
-        
-        if not 'finished' in qtable[qstate]:
+            (qstate, state_id, terminated,) = self.solution_step(qstate, state_id, qtable, model, trajectory)
+        return trajectory, state_id
+
+    def solve_with_qtable(self, core: Core, tasks: TaskTable, qtable: QTable, duration: int, steady_state=False):
+        model = self.transition_model(core, tasks, duration, steady_state)
+        (trajectory, state_id,) = self.greedy_rollout(qtable, model)
+        if not qtable.is_finished(state_id):
             raise ValueError('Scheduling failed.')
+        return trajectory, model
 
-    def learning_step(self, qstate: QState, qtable: dict[QState, dict], tasks: list[Task], core: Core, duration: int, exploration_prob: float):
-        if 'failure' in qtable[qstate]:
-            return qstate, True
-        if 'finished' in qtable[qstate]:
-            return qstate, True
+    def schedule_with_qtable(self, core: Core, tasks: TaskTable, qtable: QTable, duration: int):
+        (trajectory, model,) = self.solve_with_qtable(core, tasks, qtable, duration)
+        self.replay_trajectory(core, tasks, trajectory, model)
+        if core.trace is not None:
+            core.trace.close()
 
-        action = None
+    def replay_trajectory(self, core: Core, tasks: TaskTable, trajectory: list[tuple[QState, int, Action]], model: Transition):
+        tasks.reset()
+        core.reset()
+        for (qstate, state_id, action,) in trajectory:
+            if action == Action.SCHEDULE:
+                core.schedule(qstate.task_num)
+            elif action == Action.SCHEDULE_DELAYED:
+                core.schedule(qstate.delayed[0], True)
+            elif action == Action.MISS:
+                core.miss(qstate.task_num)
+            elif action == Action.DELAY:
+                core.delay(qstate.task_num)
+            elif action == Action.DVFS_UP:
+                core.dvfs_up(qstate.time)
+            elif action == Action.DVFS_DOWN:
+                core.dvfs_down(qstate.time)
+            elif action == Action.STALL_TO_FINISH:
+                core.stall(model.horizon - qstate.time)
+            elif action == Action.STALL_TO_DVFS_LOCK:
+                core.stall(core.dvfs_change_lock - (qstate.time - qstate.dvfs_lock_from))
+
+    def learning_step(self, qstate: QState, state_id: int, qtable: QTable, model: Transition, exploration_prob: float, 
+                      action_counts: list[int] = None, trajectory: list[tuple[int, Action, int, int, bool]] = None):
+        if qtable.is_terminal(state_id):
+            return qstate, state_id, True
+
+        action, explored = None, False
         if random.uniform(0, 1) < exploration_prob:
-            action = random.choice(list(qtable[qstate].keys()))
+            action, explored = qtable.random_action(state_id), True
         else:
-            action = self.max_qvalue_action(qstate, qtable)
+            action = self.max_qvalue_action(state_id, qtable)
+        if action_counts is not None:
+            action_counts[action] += 1
         
-        next_qstate = self.do_action(qstate, tasks, core, action, duration)
-        self.add_qstate_to_qtable(next_qstate, qtable, tasks, core, duration)
-        self.update_qtable(qstate, qtable, next_qstate, action)
-        return next_qstate, False
+        (next_qstate, reward, energy,) = model.step(qstate, action)
+        next_state_id = self.add_qstate_to_qtable(next_qstate, qtable, model)
+        if trajectory is not None:
+            trajectory.append((state_id, action, next_state_id, qtable.action_masks[next_state_id], explored))
+        else:
+            self.update_qtable(state_id, qtable, next_state_id, action)
+        return next_qstate, next_state_id, False
     
-    def solution_step(self, qstate: QState, qtable: dict[QState, dict], tasks: list[Task], core: Core, duration: int):
-        if 'failure' in qtable[qstate]:
-            return qstate, True
-        if 'finished' in qtable[qstate]:
-            return qstate, True
-
-        action = self.max_qvalue_action(qstate, qtable)
-        next_qstate = self.do_action(qstate, tasks, core, action, duration)
-        self.add_qstate_to_qtable(next_qstate, qtable, tasks, core, duration)
-        return next_qstate, False
-
-    def add_qstate_to_qtable(self, qstate: QState, qtable: dict[QState, dict], tasks: list[Task], core: Core, duration: int):
-        if qstate in qtable:
-            return
-        
-        qtable[qstate] = {}
-        if core.allowed_avg_power * duration < qstate.consumed_energy:
-            qtable[qstate] = {'failure': {'qvalue': float('-inf'), 'reward': None}}
-            return
-
-        if len(qstate.delayed) == 0 and qstate.task_num == len(tasks):
-            if qstate.time == duration * self.second_slice_size:
-                qtable[qstate] = {'finished': {'qvalue': self.finish_reward, 'reward': None}}
-                return
-            else:
-                qtable[qstate]['stall-to-finish'] = {'qvalue': 0, 'reward': 0}
+    def solution_step(self, qstate: QState, state_id: int, qtable: QTable, model: Transition, trajectory: list[tuple[QState, int, Action]]):
+        if qtable.is_terminal(state_id):
+            return qstate, state_id, True
 
-                time_interval = core.dvfs_change_lock - (qstate.time - qstate.dvfs_lock_from)
-                if time_interval > 0 and qstate.time + time_interval <= duration * self.second_slice_size:
-                    qtable[qstate]['stall-to-dvfs-lock'] = {'qvalue': 0, 'reward': 0}
-        
-        if qstate.task_num < len(tasks):
-            if core.is_schedulable(tasks[qstate.task_num]):
-                if tasks[qstate.task_num].priority == 'soft':
-                    qtable[qstate]['schedule'] = {'qvalue': 0, 'reward': self.soft_schedule_reward}
-                elif tasks[qstate.task_num].priority == 'firm':
-                    qtable[qstate]['schedule'] = {'qvalue': 0, 'reward': self.firm_schedule_reward}
-                else:
-                    qtable[qstate]['schedule'] = {'qvalue': 0, 'reward': 0}
-            else:
-                if tasks[qstate.task_num].priority == 'hard':
-                    qtable[qstate] = {'failure': {'qvalue': float('-inf'), 'reward': None}}
-                    return
-                
-            if tasks[qstate.task_num].priority == 'soft':
-                qtable[qstate]['miss'] = {'qvalue': 0, 'reward': self.soft_miss_penalty}
-            elif tasks[qstate.task_num].priority == 'firm':
-                qtable[qstate]['miss'] = {'qvalue': 0, 'reward': self.firm_miss_penalty}
-            
-            if tasks[qstate.task_num].priority == 'soft':
-                qtable[qstate]['delay'] = {'qvalue': 0, 'reward': self.soft_delay_reward}
-        
-        if len(qstate.delayed) > 0:
-            if core.is_schedulable(tasks[qstate.delayed[0]]):
-                qtable[qstate]['schedule-delayed'] = {'qvalue': 0, 'reward': 0}
-            else:
-                qtable[qstate] = {'failure': {'qvalue': float('-inf'), 'reward': None}}
-                return
+        action = self.max_qvalue_action(state_id, qtable)
+        trajectory.append((qstate, state_id, action,))
+        (next_qstate, reward, energy,) = model.step(qstate, action)
+        next_state_id = self.add_qstate_to_qtable(next_qstate, qtable, model)
+        return next_qstate, next_state_id, False
 
-        if qstate.dvfs_level < len(core.dvfs_levels) - 1 and core.dvfs_change_lock + qstate.dvfs_lock_from <= qstate.time:
-            qtable[qstate]['dvfs-up'] = {'qvalue': 0, 'reward': self.dvfs_up_reward}
+    def new_qtable(self, capacity: int = 1024) -> QTable:
+        return (QTable(capacity) if self.state_encoder.exact else AbstractQTable(capacity))
 
-        if qstate.dvfs_level > 0 and core.dvfs_change_lock + qstate.dvfs_lock_from <= qstate.time:
-            qtable[qstate]['dvfs-down'] = {'qvalue': 0, 'reward': self.dvfs_down_reward}
-    
-    def do_action(self, qstate: QState, tasks: list[Task], core: Core, action: str, duration: int):
-        if action == 'schedule':
-            task = tasks[qstate.task_num]
-            energy_consumption = core.schedule(task)
-            return QState(task.finish_time, qstate.task_num + 1, qstate.dvfs_level, qstate.dvfs_lock_from, qstate.consumed_energy + energy_consumption, qstate.delayed)
-        elif action == 'schedule-delayed':
-            task = tasks[qstate.delayed[0]]
-            energy_consumption = core.schedule(task)
-            return QState(task.finish_time, qstate.task_num, qstate.dvfs_level, qstate.dvfs_lock_from, qstate.consumed_energy + energy_consumption, qstate.delayed[1:])
-        elif action == 'miss':
-            task = tasks[qstate.task_num]
-            core.miss(task)
-            return QState(qstate.time, qstate.task_num + 1, qstate.dvfs_level, qstate.dvfs_lock_from, qstate.consumed_energy, qstate.delayed)
-        elif action == 'delay':
-            return QState(qstate.time, qstate.task_num + 1, qstate.dvfs_level, qstate.dvfs_lock_from, qstate.consumed_energy, (*qstate.delayed, qstate.task_num,))
-        elif action == 'dvfs-up':
-            core.dvfs_up(qstate.time)
-            return QState(qstate.time, qstate.task_num, qstate.dvfs_level + 1, qstate.time, qstate.consumed_energy, qstate.delayed)
-        elif action == 'dvfs-down':
-            core.dvfs_down(qstate.time)
-            return QState(qstate.time, qstate.task_num, qstate.dvfs_level - 1, qstate.time, qstate.consumed_energy, qstate.delayed)
-        elif action == 'stall-to-finish':
-            energy_consumption = core.stall(duration * self.second_slice_size - qstate.time)
-            return QState(duration * self.second_slice_size, qstate.task_num, qstate.dvfs_level, qstate.dvfs_lock_from, 
-                          qstate.consumed_energy + energy_consumption, qstate.delayed)
+    def add_qstate_to_qtable(self, qstate: QState, qtable: QTable, model: Transition) -> int:
+        if not self.state_encoder.exact:
+            return self.add_abstract_qstate_to_qtable(qstate, qtable, model)
+        state_id = qtable.state_id(qstate)
+        if state_id is not None:
+            return state_id
+        
+        state_id = qtable.add_state(qstate)
+        (status, action_mask, rewards,) = model.actions(qstate)
+        if status == Transition.FAILURE:
+            qtable.set_failure(state_id)
+        elif status == Transition.FINISHED:
+            qtable.set_finished(state_id, self.finish_reward)
         else:
-            time_interval = core.dvfs_change_lock - (qstate.time - qstate.dvfs_lock_from)
-            energy_consumption = core.stall(time_interval)
-            return QState(qstate.time + time_interval, qstate.task_num, qstate.dvfs_level, qstate.dvfs_lock_from, 
-                          qstate.consumed_energy + energy_consumption, qstate.delayed)
+            qtable.set_actions(state_id, action_mask, rewards)
+        return state_id
         
-    def update_qtable(self, qstate: QState, qtable: dict[QState, dict], next_qstate: QState, action: str):
-        qtable[qstate][action]['qvalue'] = ((1 - self.learning_rate) * qtable[qstate][action]['qvalue'] + 
-                                            self.learning_rate * (qtable[qstate][action]['reward'] + 
-                                                                  qtable[next_qstate][self.max_qvalue_action(next_qstate, qtable)]['qvalue']))
+    def add_abstract_qstate_to_qtable(self, qstate: QState, qtable: AbstractQTable, model: Transition) -> int:
+        (status, action_mask, rewards,) = model.actions(qstate)
+        key = self.state_encoder.encode(qstate, status, model)
+        state_id = qtable.state_id(key)
+        if state_id is None:
+            state_id = qtable.add_state(key)
+            if status == Transition.FAILURE:
+                qtable.set_failure(state_id)
+            elif status == Transition.FINISHED:
+                qtable.set_finished(state_id, self.finish_reward)
+        if status == Transition.ACTIVE:
+            qtable.set_actions(state_id, action_mask, rewards)
+        return state_id
+
+    def update_qtable(self, state_id: int, qtable: QTable, next_state_id: int, action: Action):
+        qtable.update(state_id, action, next_state_id, self.learning_rate)
         
-    def max_qvalue_action(self, qstate: QState, qtable: dict[QState, dict]):
-        candidate_action, candidate_qvalue = None, None
-        for action in qtable[qstate]:
-            if candidate_action == None or (qtable[qstate][action]['qvalue'] > candidate_qvalue):
-                candidate_action = action
-                candidate_qvalue = qtable[qstate][action]['qvalue']
-        return candidate_action
-
-    def extract_tasks_from_ptasks(self, ptasks: list[PTask], duration) -> list[Task]:
-        tasks: list[Task] = []
-        for ptask in ptasks:
-            t = 0
-            while t + ptask.period < duration * self.second_slice_size:
-                tasks.append(Task(ptask.id, ptask.ins_count, t, t + ptask.period, ptask.priority))
-                t += ptask.period
-        tasks = sorted(tasks, key=lambda x: x.deadline)
-        return tasks
\ No newline at end of file
+    def max_qvalue_action(self, state_id: int, qtable: QTable) -> Action:
+        return qtable.max_qvalue_action(state_id)
+
+    def extract_tasks_from_ptasks(self, ptasks: list[PTask], duration) -> TaskTable:
+        return TaskTable.from_ptasks(ptasks, duration * self.second_slice_size)
@@ -1,23 +1,45 @@
-from task import Task
-
 class QState:
+    __slots__ = ('time', 'task_num', 'dvfs_level', 'dvfs_lock_from', 'consumed_energy', 'delayed', 'hash')
+
     def __init__(self, time: int, task_num: int, dvfs_level: int, dvfs_lock_from: int, consumed_energy: int, delayed: tuple[int]):
-        self.time = time
-        self.task_num = task_num
-        self.dvfs_level = dvfs_level
-        self.dvfs_lock_from = dvfs_lock_from
-        self.consumed_energy = consumed_energy
-        self.delayed = delayed
+        set_field = object.__setattr__
+        set_field(self, 'time', time)
+        set_field(self, 'task_num', task_num)
+        set_field(self, 'dvfs_level', dvfs_level)
+        set_field(self, 'dvfs_lock_from', dvfs_lock_from)
+        set_field(self, 'consumed_energy', consumed_energy)
+        set_field(self, 'delayed', delayed)
+        set_field(self, 'hash', hash((time, task_num, dvfs_level, dvfs_lock_from, consumed_energy, delayed,)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Assigning QState fields is not supported.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Deleting QState fields is not supported.')
+
+    def __reduce__(self):
+        return (QState, self.fields())
+
+    def fields(self) -> tuple:
+        return (self.time, self.task_num, self.dvfs_level, self.dvfs_lock_from, self.consumed_energy, self.delayed,)
+
+    def __iter__(self):
+        return iter(self.fields())
+
+    def __len__(self):
+        return 6
 
     def __hash__(self):
-        return hash((self.time, self.task_num, self.delayed, self.dvfs_level, self.dvfs_lock_from, self.consumed_energy,))
+        return self.hash
 
     def __eq__(self, other):
-        return ((self.time, self.task_num, self.delayed, self.dvfs_level, self.dvfs_lock_from, self.consumed_energy,) == 
-                (other.time, other.task_num, other.delayed, other.dvfs_level, other.dvfs_lock_from, other.consumed_energy,))
+        if not isinstance(other, QState):
+            return NotImplemented
+        return (self.hash == other.hash and self.time == other.time and self.task_num == other.task_num and
+                self.dvfs_level == other.dvfs_level and self.dvfs_lock_from == other.dvfs_lock_from and
+                self.consumed_energy == other.consumed_energy and self.delayed == other.delayed)
 
-    def __ne__(self, other):
-        return not self.__eq__(self, other)
-    
     def __str__(self):
-        return f'QState - time: {self.time}, task number: {self.task_num}, dvfs level: {self.dvfs_level}, dvfs lock from: {self.dvfs_lock_from}, consumed energy: {self.consumed_energy}, delayed queue: {self.delayed}'
\ No newline at end of file
+        return f'QState - time: {self.time}, task number: {self.task_num}, dvfs level: {self.dvfs_level}, dvfs lock from: {self.dvfs_lock_from}, consumed energy: {self.consumed_energy}, delayed queue: {self.delayed}'
+
+    __repr__ = __str__
@@ -0,0 +1,115 @@
+import random
+import numpy as np
+from array import array
+from action import Action, MASK_ACTIONS
+from qstate import QState
+
+class QTable:
+    ACTIVE = 0
+    FAILURE = 1
+    FINISHED = 2
+    MASK_QVALUES = np.array([[(0.0 if mask >> action & 1 else float('-inf')) for action in Action] for mask in range(len(MASK_ACTIONS))])
+    MASK_LEGAL = np.array([[mask >> action & 1 for action in Action] for mask in range(len(MASK_ACTIONS))], dtype=np.float64)
+
+    def __init__(self, capacity: int = 1024):
+        self.state_ids: dict[QState, int] = {}
+        self.qstates: list[QState] = []
+        self.stored_qstates = None
+        self.no_stored = 0
+        self.action_masks = array('B')
+        self.status = array('b')
+        self.qvalues = np.full((capacity, len(Action)), float('-inf'))
+        self.rewards = np.zeros((capacity, len(Action)))
+
+    def __len__(self):
+        return self.no_stored + len(self.qstates)
+
+    def __contains__(self, qstate: QState):
+        return self.state_id(qstate) is not None
+
+    def state_id(self, qstate: QState):
+        state_id = self.state_ids.get(qstate)
+        if state_id is None and self.stored_qstates is not None:
+            state_id = self.stored_qstates.find(qstate)
+            if state_id is not None:
+                self.state_ids[qstate] = state_id
+        return state_id
+
+    def qstate(self, state_id: int) -> QState:
+        if state_id < self.no_stored:
+            return self.stored_qstates.qstate(state_id)
+        return self.qstates[state_id - self.no_stored]
+
+    def add_state(self, qstate: QState) -> int:
+        state_id = len(self)
+        if state_id == self.qvalues.shape[0]:
+            self.grow()
+        self.state_ids[qstate] = state_id
+        self.qstates.append(qstate)
+        self.action_masks.append(0)
+        self.status.append(QTable.ACTIVE)
+        return state_id
+
+    def grow(self):
+        capacity = max(self.qvalues.shape[0], 1)
+        self.qvalues = np.concatenate((self.qvalues, np.full((capacity, len(Action)), float('-inf'))))
+        self.rewards = np.concatenate((self.rewards, np.zeros((capacity, len(Action)))))
+
+    def load(self, stored_qstates, action_masks: array, status: array, qvalues: np.ndarray, rewards: np.ndarray):
+        self.state_ids = {}
+        self.qstates = []
+        self.stored_qstates = stored_qstates
+        self.no_stored = len(stored_qstates)
+        self.action_masks = action_masks
+        self.status = status
+        self.qvalues = qvalues
+        self.rewards = rewards
+
+    def known_action_masks(self) -> array:
+        return self.action_masks
+
+    def legal_actions(self, state_id: int) -> tuple[Action]:
+        return MASK_ACTIONS[self.action_masks[state_id]]
+
+    def set_actions(self, state_id: int, action_mask: int, rewards: np.ndarray):
+        self.action_masks[state_id] = action_mask
+        self.qvalues[state_id] = QTable.MASK_QVALUES[action_mask]
+        np.multiply(rewards, QTable.MASK_LEGAL[action_mask], out=self.rewards[state_id])
+
+    def set_failure(self, state_id: int):
+        self.status[state_id] = QTable.FAILURE
+        self.action_masks[state_id] = 0
+        self.qvalues[state_id] = float('-inf')
+
+    def set_finished(self, state_id: int, finish_reward: int):
+        self.status[state_id] = QTable.FINISHED
+        self.action_masks[state_id] = 0
+        self.qvalues[state_id] = finish_reward
+
+    def is_terminal(self, state_id: int):
+        return self.status[state_id] != QTable.ACTIVE
+
+    def is_explored(self, state_id: int):
+        return self.status[state_id] == QTable.ACTIVE and self.action_masks[state_id] != 0
+
+    def is_finished(self, state_id: int):
+        return self.status[state_id] == QTable.FINISHED
+
+    def random_action(self, state_id: int) -> Action:
+        return random.choice(MASK_ACTIONS[self.action_masks[state_id]])
+
+    def max_qvalue_action(self, state_id: int) -> Action:
+        action = int(self.qvalues[state_id].argmax())
+        if self.qvalues[state_id, action] == float('-inf'):
+            return MASK_ACTIONS[self.action_masks[state_id]][0]
+        return Action(action)
+
+    def max_qvalue(self, state_id: int, action_mask: int = None):
+        return self.qvalues[state_id].max()
+
+    def update(self, state_id: int, action: Action, next_state_id: int, learning_rate: float):
+        self.qvalues[state_id, action] = ((1 - learning_rate) * self.qvalues[state_id, action] + 
+                                          learning_rate * (self.rewards[state_id, action] + self.max_qvalue(next_state_id)))
+
+    def update_towards(self, state_id: int, action: Action, target: float, learning_rate: float):
+        self.qvalues[state_id, action] = (1 - learning_rate) * self.qvalues[state_id, action] + learning_rate * target
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import uuid
+import shutil
+import hashlib
+import numpy as np
+from array import array
+from core import Core
+from qstate import QState
+from qtable import QTable
+from task_table import TaskTable
+
+class QTableStore:
+    FORMAT_VERSION = 3
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def key(self, core: Core, tasks: TaskTable, duration, reward_config: dict) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            'format-version': QTableStore.FORMAT_VERSION,
+            'cpi': core.cpi,
+            'one-ghz-power': core.one_ghz_power,
+            'dvfs-levels': core.dvfs_levels,
+            'dvfs-change-lock': core.dvfs_change_lock,
+            'allowed-avg-power': core.allowed_avg_power,
+            'second-slice-size': core.second_slice_size,
+            'duration': duration,
+            'rewards': reward_config
+        }, sort_keys=True).encode())
+        for column in (tasks.ptask_id, tasks.ins_count, tasks.arrival_time, tasks.deadline, tasks.priority):
+            digest.update(np.ascontiguousarray(column).tobytes())
+        return digest.hexdigest()
+
+    def save(self, key: str, qtable: QTable):
+        no_states = len(qtable)
+        columns = self.qstate_columns(qtable)
+        hashes = columns.pop('hashes')
+        hash_order = np.argsort(hashes, kind='stable')
+        columns.update({
+            'hashes': hashes[hash_order],
+            'hash-order': hash_order.astype(np.int64),
+            'action-masks': np.frombuffer(qtable.known_action_masks(), dtype=np.uint8),
+            'status': np.frombuffer(qtable.status, dtype=np.int8),
+            'qvalues': qtable.qvalues[:no_states],
+            'rewards': qtable.rewards[:no_states]
+        })
+
+        temp_path = f'{self.path}/.{key}-{uuid.uuid4().hex}'
+        os.mkdir(temp_path)
+        for (name, column,) in columns.items():
+            np.save(f'{temp_path}/{name}.npy', column)
+        with open(f'{temp_path}/meta.json', 'w') as meta_file:
+            json.dump({'format-version': QTableStore.FORMAT_VERSION, 'states': no_states, 'hash-version': QTableStore.hash_version()}, meta_file)
+
+        table_path = f'{self.path}/{key}'
+        if os.path.exists(table_path):
+            stale_path = f'{self.path}/.{key}-{uuid.uuid4().hex}'
+            os.rename(table_path, stale_path)
+            shutil.rmtree(stale_path, ignore_errors=True)
+        os.rename(temp_path, table_path)
+
+    def qstate_columns(self, qtable: QTable) -> dict:
+        stored, qstates = qtable.stored_qstates, qtable.qstates
+        delayed_lengths = np.fromiter((len(qstate.delayed) for qstate in qstates), dtype=np.int64, count=len(qstates))
+        columns = {
+            'time': np.fromiter((qstate.time for qstate in qstates), dtype=np.int64, count=len(qstates)),
+            'task-num': np.fromiter((qstate.task_num for qstate in qstates), dtype=np.int64, count=len(qstates)),
+            'dvfs-level': np.fromiter((qstate.dvfs_level for qstate in qstates), dtype=np.int8, count=len(qstates)),
+            'dvfs-lock-from': np.fromiter((qstate.dvfs_lock_from for qstate in qstates), dtype=np.int64, count=len(qstates)),
+            'consumed-energy': np.fromiter((qstate.consumed_energy for qstate in qstates), dtype=np.int64, count=len(qstates)),
+            'delayed-offsets': np.cumsum(delayed_lengths),
+            'delayed': np.fromiter((task_num for qstate in qstates for task_num in qstate.delayed), dtype=np.int64, 
+                                   count=int(delayed_lengths.sum())),
+            'hashes': np.fromiter((hash(qstate) for qstate in qstates), dtype=np.int64, count=len(qstates))
+        }
+        if stored is None:
+            columns['delayed-offsets'] = np.concatenate(([0], columns['delayed-offsets'])).astype(np.int64)
+            return columns
+
+        stored_delayed_offsets = stored.columns['delayed-offsets']
+        columns['delayed-offsets'] = np.concatenate((stored_delayed_offsets, stored_delayed_offsets[-1] + columns['delayed-offsets']))
+        columns['hashes'] = np.concatenate((stored.hashes_by_state(), columns['hashes']))
+        for name in StoredQStates.FIELDS + ('delayed',):
+            columns[name] = np.concatenate((stored.columns[name], columns[name])).astype(stored.columns[name].dtype)
+        return columns
+
+    def load(self, key: str, qtable: QTable = None) -> QTable:
+        table_path = f'{self.path}/{key}'
+        try:
+            with open(f'{table_path}/meta.json', 'r') as meta_file:
+                meta = json.load(meta_file)
+            if meta['format-version'] != QTableStore.FORMAT_VERSION or meta['hash-version'] != QTableStore.hash_version():
+                return None
+            columns = {name: np.load(f'{table_path}/{name}.npy', mmap_mode='c') 
+                       for name in (*StoredQStates.FIELDS, 'delayed-offsets', 'delayed', 'hashes', 'hash-order', 'action-masks', 'status', 
+                                    'qvalues', 'rewards')}
+        except FileNotFoundError:
+            return None
+
+        qtable = (qtable if qtable is not None else QTable(0))
+        qtable.load(StoredQStates(columns), array('B', columns['action-masks'].tobytes()), array('b', columns['status'].tobytes()), 
+                    columns['qvalues'], columns['rewards'])
+        return qtable
+
+    @staticmethod
+    def hash_version() -> str:
+        return f'{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}-{sys.hash_info.width}'
+
+class StoredQStates:
+    FIELDS = ('time', 'task-num', 'dvfs-level', 'dvfs-lock-from', 'consumed-energy')
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self.hashes = columns['hashes']
+        self.hash_order = columns['hash-order']
+        self.no_states = len(columns['time'])
+
+    def __len__(self):
+        return self.no_states
+
+    def qstate(self, state_id: int) -> QState:
+        columns = self.columns
+        (delayed_start, delayed_end,) = (columns['delayed-offsets'].item(state_id), columns['delayed-offsets'].item(state_id + 1))
+        return QState(*(columns[name].item(state_id) for name in StoredQStates.FIELDS), 
+                      tuple(columns['delayed'][delayed_start:delayed_end].tolist()))
+
+    def find(self, qstate: QState) -> int:
+        qstate_hash = hash(qstate)
+        i = int(np.searchsorted(self.hashes, qstate_hash))
+        while i < self.no_states and self.hashes.item(i) == qstate_hash:
+            state_id = self.hash_order.item(i)
+            if self.qstate(state_id) == qstate:
+                return state_id
+            i += 1
+        return None
+
+    def hashes_by_state(self) -> np.ndarray:
+        hashes = np.empty(self.no_states, dtype=np.int64)
+        hashes[self.hash_order] = self.hashes
+        return hashes
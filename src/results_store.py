@@ -0,0 +1,39 @@
+import os
+import json
+import shutil
+
+class ResultsStore:
+    def __init__(self, path='./simulation-results'):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def run_ids(self) -> list[int]:
+        return sorted(int(name) for name in os.listdir(self.path) if name.isdigit())
+
+    def create_run(self) -> int:
+        run_ids = self.run_ids()
+        run_id = (run_ids[-1] + 1 if len(run_ids) > 0 else 1)
+        while True:
+            try:
+                os.mkdir(self.run_path(run_id))
+                return run_id
+            except FileExistsError:
+                run_id += 1
+
+    def run_path(self, run_id: int) -> str:
+        return f'{self.path}/{run_id}'
+
+    def trace_path(self, run_id: int, core_id) -> str:
+        return f'{self.run_path(run_id)}/trace-core-{core_id}.bin'
+
+    def write_json(self, run_id: int, name, value, compact=False):
+        temp_path = f'{self.run_path(run_id)}/.{name}'
+        with open(temp_path, 'w') as json_file:
+            if compact:
+                json.dump(value, json_file, separators=(',', ':'))
+            else:
+                json.dump(value, json_file, indent=4)
+        os.replace(temp_path, f'{self.run_path(run_id)}/{name}')
+
+    def discard_run(self, run_id: int):
+        shutil.rmtree(self.run_path(run_id), ignore_errors=True)
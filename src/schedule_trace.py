@@ -0,0 +1,190 @@
+import mmap
+import zlib
+import struct
+import numpy as np
+from enum import IntEnum
+
+class TraceEvent(IntEnum):
+    SCHEDULE = 0
+    SCHEDULE_DELAYED = 1
+    MISS = 2
+    DELAY = 3
+    DVFS_UP = 4
+    DVFS_DOWN = 5
+    STALL = 6
+
+    def __str__(self):
+        return self.name.lower().replace('_', '-')
+
+TRACE_DTYPE = np.dtype([('kind', np.uint8), ('start', np.int64), ('end', np.int64), ('task', np.int32), ('ptask', np.int32),
+                        ('dvfs-level', np.uint8), ('energy', np.int64)])
+DELTA_COLUMNS = ('start', 'energy')
+FILE_HEADER = struct.Struct('<6sHI')
+CHUNK_HEADER = struct.Struct(f'<4sIqqiiQ{len(TRACE_DTYPE.names)}I')
+FILE_MAGIC = b'QTRACE'
+CHUNK_MAGIC = b'QTCH'
+FORMAT_VERSION = 1
+
+def ptask_mask(ptask_ids: np.ndarray) -> int:
+    bits = np.unique(ptask_ids[ptask_ids >= 0] % 64)
+    return int(np.bitwise_or.reduce(np.left_shift(np.uint64(1), bits.astype(np.uint64)), initial=np.uint64(0)))
+
+class TraceWriter:
+    def __init__(self, path, second_slice_size, chunk_size: int = 4096, compression_level: int = 6):
+        if chunk_size <= 0:
+            raise ValueError('Trace chunk size is not valid.')
+        self.path = path
+        self.second_slice_size = second_slice_size
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.buffer = np.zeros(chunk_size, dtype=TRACE_DTYPE)
+        self.size = 0
+        self.events = 0
+        self.file = None
+
+    def __getstate__(self):
+        return {**self.__dict__, 'file': None, 'buffer': None, 'size': 0}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.buffer = np.zeros(self.chunk_size, dtype=TRACE_DTYPE)
+
+    def reset(self):
+        self.close()
+        self.file = open(self.path, 'wb')
+        self.file.write(FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, self.second_slice_size))
+        self.size, self.events = 0, 0
+
+    def append(self, kind: TraceEvent, start: int, end: int, task: int, ptask: int, dvfs_level: int, energy: int):
+        if self.file is None:
+            self.reset()
+        self.buffer[self.size] = (kind, start, end, task, ptask, dvfs_level, energy)
+        self.size += 1
+        self.events += 1
+        if self.size == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.file is None or self.size == 0:
+            return
+        rows = self.buffer[:self.size]
+        payloads = []
+        for name in TRACE_DTYPE.names:
+            column = rows[name]
+            if name in DELTA_COLUMNS:
+                column = np.diff(column, prepend=column.dtype.type(0))
+            elif name == 'end':
+                column = column - rows['start']
+            payloads.append(zlib.compress(np.ascontiguousarray(column).tobytes(), self.compression_level))
+        ptasks = rows['ptask']
+        self.file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, self.size, int(rows['start'].min()), int(rows['end'].max()), int(ptasks.min()),
+                                          int(ptasks.max()), ptask_mask(ptasks), *(len(payload) for payload in payloads)))
+        for payload in payloads:
+            self.file.write(payload)
+        self.file.flush()
+        self.size = 0
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+
+class TraceReader:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mmap) < FILE_HEADER.size:
+            raise ValueError('Trace file is not valid.')
+        (magic, version, self.second_slice_size,) = FILE_HEADER.unpack_from(self.mmap, 0)
+        if magic != FILE_MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Trace format is not supported.')
+        self.chunks = self.index_chunks()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return sum(chunk[1] for chunk in self.chunks)
+
+    def index_chunks(self) -> list[tuple]:
+        chunks, offset, file_size = [], FILE_HEADER.size, len(self.mmap)
+        while offset + CHUNK_HEADER.size <= file_size:
+            header = CHUNK_HEADER.unpack_from(self.mmap, offset)
+            if header[0] != CHUNK_MAGIC:
+                raise ValueError('Trace file is not valid.')
+            payload_size = sum(header[7:])
+            if offset + CHUNK_HEADER.size + payload_size > file_size:
+                break
+            chunks.append((offset + CHUNK_HEADER.size, *header[1:]))
+            offset += CHUNK_HEADER.size + payload_size
+        return chunks
+
+    def chunk_matches(self, chunk: tuple, start, end, ptask_id) -> bool:
+        (offset, no_rows, min_time, max_time, min_ptask, max_ptask, mask,) = chunk[:7]
+        if start is not None and max_time < start:
+            return False
+        if end is not None and min_time >= end:
+            return False
+        if ptask_id is not None and (ptask_id < min_ptask or ptask_id > max_ptask or not mask >> (ptask_id % 64) & 1):
+            return False
+        return True
+
+    def read_chunk(self, chunk: tuple) -> np.ndarray:
+        (offset, no_rows,) = chunk[:2]
+        rows = np.empty(no_rows, dtype=TRACE_DTYPE)
+        for (name, payload_size,) in zip(TRACE_DTYPE.names, chunk[7:]):
+            column = np.frombuffer(zlib.decompress(self.mmap[offset:offset + payload_size]), dtype=TRACE_DTYPE[name])
+            if name in DELTA_COLUMNS:
+                column = np.cumsum(column, dtype=TRACE_DTYPE[name])
+            elif name == 'end':
+                column = column + rows['start']
+            rows[name] = column
+            offset += payload_size
+        return rows
+
+    def read(self, start=None, end=None, ptask_id=None, kinds: tuple[TraceEvent] = None) -> np.ndarray:
+        parts = []
+        for chunk in self.chunks:
+            if not self.chunk_matches(chunk, start, end, ptask_id):
+                continue
+            rows = self.read_chunk(chunk)
+            selected = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                selected &= rows['end'] >= start
+            if end is not None:
+                selected &= rows['start'] < end
+            if ptask_id is not None:
+                selected &= rows['ptask'] == ptask_id
+            if kinds is not None:
+                selected &= np.isin(rows['kind'], [int(kind) for kind in kinds])
+            parts.append(rows[selected])
+        return (np.concatenate(parts) if len(parts) > 0 else np.empty(0, dtype=TRACE_DTYPE))
+
+    def close(self):
+        self.mmap.close()
+        self.file.close()
+
+if __name__ == '__main__':
+    import csv
+    import sys
+    import argparse
+    parser = argparse.ArgumentParser(description='Print the events of a schedule trace as CSV, filtered by time window or ptask.')
+    parser.add_argument('path')
+    parser.add_argument('--start', type=float, default=None, help='window start in seconds')
+    parser.add_argument('--end', type=float, default=None, help='window end in seconds')
+    parser.add_argument('--ptask', type=int, default=None)
+    args = parser.parse_args()
+
+    with TraceReader(args.path) as reader:
+        rows = reader.read((round(args.start * reader.second_slice_size) if args.start is not None else None),
+                           (round(args.end * reader.second_slice_size) if args.end is not None else None), args.ptask)
+        writer = csv.writer(sys.stdout)
+        writer.writerow(TRACE_DTYPE.names)
+        for row in rows.tolist():
+            writer.writerow((str(TraceEvent(row[0])), *row[1:]))
@@ -0,0 +1,58 @@
+import math
+from qstate import QState
+from transition import Transition
+
+class ExactStateEncoder:
+    exact = True
+
+    def encode(self, qstate: QState, status: int, model: Transition) -> QState:
+        return qstate
+
+    def config(self) -> dict:
+        return {'state-encoder': 'exact'}
+
+class BucketedStateEncoder:
+    exact = False
+    FINISHED_KEY = QState(0, -1, 0, 0, 0, ())
+    FAILURE_KEY = QState(0, -2, 0, 0, 0, ())
+
+    def __init__(self, time_granularity, energy_buckets: int, max_delayed: int, second_slice_size):
+        if time_granularity <= 0 or energy_buckets <= 0 or max_delayed < 0:
+            raise ValueError('State encoder granularity is not valid.')
+        self.time_granularity = time_granularity
+        self.energy_buckets = energy_buckets
+        self.max_delayed = max_delayed
+        self.time_bucket_size = max(round(time_granularity * second_slice_size), 1)
+
+    def encode(self, qstate: QState, status: int, model: Transition) -> QState:
+        if status == Transition.FINISHED:
+            return BucketedStateEncoder.FINISHED_KEY
+        elif status == Transition.FAILURE:
+            return BucketedStateEncoder.FAILURE_KEY
+
+        (time, task_num, dvfs_level, dvfs_lock_from,) = (qstate.time, qstate.task_num, qstate.dvfs_level, qstate.dvfs_lock_from,)
+        (consumed_energy, delayed,) = (qstate.consumed_energy, qstate.delayed,)
+        next_deadline = (model.tasks.deadline.item(task_num) if task_num < model.no_tasks else model.horizon)
+        if len(delayed) > 0:
+            next_deadline = min(next_deadline, model.tasks.deadline.item(delayed[0]))
+        time_bucket = (next_deadline - time) // self.time_bucket_size
+        lock_bucket = -(-max(model.dvfs_change_lock - (time - dvfs_lock_from), 0) // self.time_bucket_size)
+        energy_bucket = (math.floor((model.energy_budget - consumed_energy) * self.energy_buckets / model.energy_budget)
+                         if model.energy_budget > 0 else 0)
+        delayed_key = (len(delayed), *(task_num - task_index for task_index in delayed[:self.max_delayed]))
+        return QState(time_bucket, task_num, dvfs_level, lock_bucket, energy_bucket, delayed_key)
+
+    def config(self) -> dict:
+        return {
+            'state-encoder': 'bucketed',
+            'time-granularity': self.time_granularity,
+            'energy-buckets': self.energy_buckets,
+            'max-delayed': self.max_delayed
+        }
+
+def build_state_encoder(state_encoder, time_granularity, energy_buckets, max_delayed, second_slice_size):
+    if state_encoder == 'exact':
+        return ExactStateEncoder()
+    elif state_encoder == 'bucketed':
+        return BucketedStateEncoder(time_granularity, energy_buckets, max_delayed, second_slice_size)
+    raise ValueError('State encoder is not supported.')
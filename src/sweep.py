@@ -0,0 +1,143 @@
+import os
+import csv
+import copy
+import json
+import random
+import hashlib
+import argparse
+import itertools
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from core import Core
+from ptask_stat import PTaskStat
+from launcher import load_configs, simulate, draw_charts
+
+PTASK_FIELDS = ['id', 'instruction-count', 'period', 'priority', 'number-of-tasks', 'missed-tasks', 'delayed-tasks', 'average-execution-time',
+                'average-waiting-time', 'average-slack-time', 'average-response-time', 'processing-core', 'p50-response-time', 
+                'p95-response-time', 'p99-response-time', 'p50-slack-time', 'p95-slack-time', 'p99-slack-time', 'max-lateness']
+CORE_FIELDS = ['core', 'energy-mJ', 'energy-budget-mJ', 'core-scheduled-tasks', 'core-missed-tasks', 'miss-ratio']
+
+def configs_digest(configs: dict) -> str:
+    return hashlib.sha1(json.dumps(configs, sort_keys=True).encode()).hexdigest()
+
+def expand_runs(sweep_config, configs: dict) -> list[dict]:
+    base_configs = configs_digest(configs)
+    grid = sweep_config.get('grid', {})
+    grid_keys = list(grid.keys())
+    runs = []
+    for base_overrides in sweep_config.get('runs', [{}]):
+        for values in itertools.product(*[grid[key] for key in grid_keys]):
+            overrides = {**base_overrides, **dict(zip(grid_keys, values))}
+            for seed in sweep_config.get('seeds', [0]):
+                run_key = json.dumps({'configs': base_configs, 'overrides': overrides, 'seed': seed}, sort_keys=True)
+                runs.append({'run-id': hashlib.sha1(run_key.encode()).hexdigest()[:12], 'seed': seed, 'overrides': overrides})
+    return runs
+
+def apply_overrides(configs: dict, overrides: dict) -> dict:
+    configs = copy.deepcopy(configs)
+    for (path, value,) in overrides.items():
+        keys = path.split('.')
+        if keys[0] not in configs:
+            raise ValueError(f'Unknown config section in override: {path}')
+        target = configs[keys[0]]
+        for key in keys[1:-1]:
+            target = target[key]
+        target[keys[-1]] = value
+    return configs
+
+def core_record(core: Core, duration) -> dict:
+    no_tasks = len(core.scheduled_tasks) + len(core.missed_tasks)
+    return {
+        'core': core.get_full_name(),
+        'energy-mJ': core.energy_history[-1][1],
+        'energy-budget-mJ': core.allowed_avg_power * duration,
+        'core-scheduled-tasks': len(core.scheduled_tasks),
+        'core-missed-tasks': len(core.missed_tasks),
+        'miss-ratio': (len(core.missed_tasks) / no_tasks if no_tasks > 0 else None)
+    }
+
+def run_simulation(configs: dict, run: dict, charts=False):
+    configs = apply_overrides(configs, run['overrides'])
+    configs['qscheduler']['seed'] = run['seed']
+    configs['qscheduler']['execution-mode'] = 'sequential'
+    random.seed(run['seed'])
+
+    try:
+        cores, ptask_stats = simulate(configs['core'], configs['qscheduler'], configs['simulation'])
+    except ValueError as e:
+        return [{'record': 'run', 'status': 'failed', 'error': str(e)}], None
+
+    rows = [{'record': 'ptask', 'status': 'finished', **PTaskStat.ptask_stat_to_dict(ptask_stat)} for ptask_stat in ptask_stats]
+    rows += [{'record': 'core', 'status': 'finished', **core_record(core, configs['simulation']['duration'])} for core in cores]
+    return rows, (([core.chart_view() for core in cores], ptask_stats, configs['simulation'],) if charts else None)
+
+def load_progress(progress_path) -> set[str]:
+    if not os.path.exists(progress_path):
+        return set()
+    with open(progress_path, 'r') as progress_file:
+        return {json.loads(line)['run-id'] for line in progress_file if line.strip() != ''}
+
+def drop_unfinished_rows(results_path, completed: set[str], fieldnames: list[str]) -> list[str]:
+    if not os.path.exists(results_path):
+        return fieldnames
+    with open(results_path, 'r', newline='') as results_file:
+        reader = csv.DictReader(results_file)
+        rows = [row for row in reader if row['run-id'] in completed]
+        fieldnames = [*fieldnames, *(fieldname for fieldname in (reader.fieldnames or []) if fieldname not in fieldnames)]
+    with open(results_path, 'w', newline='') as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return fieldnames
+
+def sweep(sweep_config, config_path='configs', workers=None, charts=None):
+    core_config, qscheduler_config, simulation_config = load_configs(config_path)
+    configs = {'core': core_config, 'qscheduler': qscheduler_config, 'simulation': simulation_config}
+    output_path = sweep_config.get('output', 'sweep-results')
+    results_path, progress_path = f'{output_path}/results.csv', f'{output_path}/progress.jsonl'
+    workers = workers if workers is not None else sweep_config.get('workers')
+    charts = charts if charts is not None else sweep_config.get('charts', False)
+    os.makedirs(output_path, exist_ok=True)
+
+    runs = expand_runs(sweep_config, configs)
+    override_keys = sorted({key for run in runs for key in run['overrides']})
+    fieldnames = ['run-id', 'seed', *override_keys, 'record', 'status', 'error', *CORE_FIELDS, *PTASK_FIELDS]
+    completed = load_progress(progress_path)
+    fieldnames = drop_unfinished_rows(results_path, completed, fieldnames)
+    pending = [run for run in runs if run['run-id'] not in completed]
+    print(f'{len(runs) - len(pending)} of {len(runs)} runs already finished, {len(pending)} to go.')
+
+    write_header = not os.path.exists(results_path)
+    with open(results_path, 'a', newline='') as results_file, open(progress_path, 'a') as progress_file, \
+         ProcessPoolExecutor(max_workers=workers) as executor, \
+         (ProcessPoolExecutor(max_workers=1) if charts else nullcontext()) as chart_executor:
+        writer = csv.DictWriter(results_file, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            writer.writeheader()
+        futures = {executor.submit(run_simulation, configs, run, charts): run for run in pending}
+        chart_futures = []
+        for future in as_completed(futures):
+            run = futures[future]
+            run_columns = {'run-id': run['run-id'], 'seed': run['seed'], **run['overrides']}
+            (rows, chart_job,) = future.result()
+            for row in rows:
+                writer.writerow({**run_columns, **row})
+            if chart_job is not None:
+                os.makedirs(f'{output_path}/charts/{run["run-id"]}', exist_ok=True)
+                chart_futures.append(chart_executor.submit(draw_charts, *chart_job, f'{output_path}/charts/{run["run-id"]}'))
+            results_file.flush()
+            os.fsync(results_file.fileno())
+            progress_file.write(json.dumps({'run-id': run['run-id'], 'seed': run['seed'], 'overrides': run['overrides']}) + '\n')
+            progress_file.flush()
+            os.fsync(progress_file.fileno())
+        for chart_future in chart_futures:
+            chart_future.result()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a batch of simulations over a grid of config overrides and seeds.')
+    parser.add_argument('--sweep-config', default='configs/sweep_config.json')
+    parser.add_argument('--config-path', default='configs')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--charts', action='store_true', default=None)
+    args = parser.parse_args()
+    sweep(json.load(open(args.sweep_config, 'r')), args.config_path, args.workers, args.charts)
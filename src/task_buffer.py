@@ -0,0 +1,25 @@
+import numpy as np
+
+class TaskBuffer:
+    DTYPE = np.dtype([('start-time', np.int64), ('finish-time', np.int64), ('is-delayed', np.bool_)])
+    EMPTY = (-1, -1, False)
+
+    def __init__(self, size: int):
+        self.records = np.empty(size, dtype=TaskBuffer.DTYPE)
+        self.bind()
+        self.reset()
+
+    def bind(self):
+        self.start_time = self.records['start-time']
+        self.finish_time = self.records['finish-time']
+        self.is_delayed = self.records['is-delayed']
+
+    def reset(self):
+        self.records.fill(TaskBuffer.EMPTY)
+
+    def __getstate__(self):
+        return self.records
+
+    def __setstate__(self, records: np.ndarray):
+        self.records = records
+        self.bind()
@@ -0,0 +1,92 @@
+import numpy as np
+from ptask import PTask
+from task import Task
+from task_buffer import TaskBuffer
+from priority import Priority
+
+class TaskTable:
+    SOFT = Priority.SOFT
+    FIRM = Priority.FIRM
+    HARD = Priority.HARD
+
+    def __init__(self, ptask_id: np.ndarray, ins_count: np.ndarray, arrival_time: np.ndarray, deadline: np.ndarray, priority: np.ndarray):
+        self.ptask_id = ptask_id
+        self.ins_count = ins_count
+        self.arrival_time = arrival_time
+        self.deadline = deadline
+        self.priority = priority
+        self.buffer = TaskBuffer(len(ptask_id))
+
+    def __len__(self):
+        return len(self.ptask_id)
+
+    @property
+    def start_time(self) -> np.ndarray:
+        return self.buffer.start_time
+
+    @property
+    def finish_time(self) -> np.ndarray:
+        return self.buffer.finish_time
+
+    @property
+    def is_delayed(self) -> np.ndarray:
+        return self.buffer.is_delayed
+
+    def reset(self):
+        self.buffer.reset()
+
+    def task(self, index: int) -> Task:
+        task = Task(self.ptask_id.item(index), self.ins_count.item(index), self.arrival_time.item(index), self.deadline.item(index),
+                    Priority(self.priority.item(index)))
+        task.start_time = self.start_time.item(index)
+        task.finish_time = self.finish_time.item(index)
+        task.is_delayed = self.is_delayed.item(index)
+        return task
+
+    @staticmethod
+    def from_ptasks(ptasks: list[PTask], horizon, whole_periods=False) -> 'TaskTable':
+        if whole_periods:
+            counts = [int(horizon // ptask.period) for ptask in ptasks]
+        else:
+            counts = [max(0, int(-(-horizon // ptask.period)) - 1) for ptask in ptasks]
+        offsets = np.zeros(len(ptasks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        ptask_id = np.repeat(np.array([ptask.id for ptask in ptasks], dtype=np.int64), counts)
+        ins_count = np.repeat(np.array([ptask.ins_count for ptask in ptasks], dtype=np.int64), counts)
+        priority = np.repeat(np.array([ptask.priority for ptask in ptasks], dtype=np.int8), counts)
+        period = np.repeat(np.array([ptask.period for ptask in ptasks], dtype=np.int64), counts)
+        arrival_time = (np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], counts)) * period
+        deadline = arrival_time + period
+
+        runs = [(deadline[offsets[i]:offsets[i + 1]], np.arange(offsets[i], offsets[i + 1], dtype=np.int64)) for i in range(len(ptasks))]
+        order = TaskTable.merge_runs(runs) if len(runs) > 0 else np.zeros(0, dtype=np.int64)
+        return TaskTable(ptask_id[order], ins_count[order], arrival_time[order], deadline[order], priority[order])
+
+    @staticmethod
+    def tile(window: 'TaskTable', hyperperiod: int, horizon) -> 'TaskTable':
+        no_tiles = int(-(-horizon // hyperperiod))
+        offsets = np.repeat(np.arange(no_tiles, dtype=np.int64) * hyperperiod, len(window))
+        deadline = np.tile(window.deadline, no_tiles) + offsets
+        kept = deadline <= horizon
+        return TaskTable(np.tile(window.ptask_id, no_tiles)[kept], np.tile(window.ins_count, no_tiles)[kept], 
+                         (np.tile(window.arrival_time, no_tiles) + offsets)[kept], deadline[kept], np.tile(window.priority, no_tiles)[kept])
+
+    @staticmethod
+    def merge_runs(runs: list[tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        while len(runs) > 1:
+            merged_runs = [TaskTable.merge_two_runs(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+            if len(runs) % 2 == 1:
+                merged_runs.append(runs[-1])
+            runs = merged_runs
+        return runs[0][1]
+
+    @staticmethod
+    def merge_two_runs(left: tuple[np.ndarray, np.ndarray], right: tuple[np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        (left_keys, left_values,), (right_keys, right_values,) = left, right
+        right_positions = np.searchsorted(left_keys, right_keys, side='right') + np.arange(len(right_keys))
+        left_mask = np.ones(len(left_keys) + len(right_keys), dtype=np.bool_)
+        left_mask[right_positions] = False
+        keys, values = np.empty(len(left_mask), dtype=left_keys.dtype), np.empty(len(left_mask), dtype=left_values.dtype)
+        keys[right_positions], values[right_positions] = right_keys, right_values
+        keys[left_mask], values[left_mask] = left_keys, left_values
+        return keys, values
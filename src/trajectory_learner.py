@@ -0,0 +1,37 @@
+import random
+from collections import deque
+from action import Action
+from qtable import QTable
+
+class TrajectoryLearner:
+    def __init__(self, learning_rate: float, n_step: int, replay_buffer_size: int, replay_updates: int):
+        if n_step < 1 or replay_buffer_size < 0 or replay_updates < 0:
+            raise ValueError('Trajectory learner settings are not valid.')
+        self.learning_rate = learning_rate
+        self.n_step = n_step
+        self.replay_updates = replay_updates
+        self.replay_buffer: deque[list[tuple[int, Action, int, int, bool]]] = deque(maxlen=replay_buffer_size)
+
+    def learn(self, qtable: QTable, trajectory: list[tuple[int, Action, int, int, bool]], finished: bool):
+        self.replay(qtable, trajectory)
+        if finished and self.replay_buffer.maxlen > 0:
+            self.replay_buffer.append(trajectory)
+        for i in range(min(self.replay_updates, len(self.replay_buffer))):
+            self.replay(qtable, random.choice(self.replay_buffer))
+
+    def replay(self, qtable: QTable, trajectory: list[tuple[int, Action, int, int, bool]]):
+        reward_sums = [0.0] * (len(trajectory) + 1)
+        for step in range(len(trajectory) - 1, -1, -1):
+            (state_id, action, next_state_id, next_action_mask, explored,) = trajectory[step]
+            reward_sums[step] = reward_sums[step + 1] + qtable.rewards.item(state_id, action)
+        next_explored_step = len(trajectory)
+        for step in range(len(trajectory) - 1, -1, -1):
+            (state_id, action, next_state_id, next_action_mask, explored,) = trajectory[step]
+            last_step = min(step + self.n_step, next_explored_step) - 1
+            (last_state_id, last_action, bootstrap_state_id, bootstrap_action_mask, last_explored,) = trajectory[last_step]
+            target = reward_sums[step] - reward_sums[last_step + 1] + qtable.max_qvalue(bootstrap_state_id, bootstrap_action_mask)
+            if target == float('-inf') and last_step > step:
+                target = qtable.rewards.item(state_id, action) + qtable.max_qvalue(next_state_id, next_action_mask)
+            qtable.update_towards(state_id, action, target, self.learning_rate)
+            if explored:
+                next_explored_step = step
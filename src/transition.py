@@ -0,0 +1,140 @@
+import numpy as np
+from core import Core
+from task_table import TaskTable
+from qstate import QState
+from action import Action, action_mask
+from priority import Priority
+
+class Transition:
+    ACTIVE = 0
+    FAILURE = 1
+    FINISHED = 2
+    NO_TASK = len(Priority)
+    STALL_TO_FINISH_MASK = action_mask(Action.STALL_TO_FINISH)
+    STALL_TO_DVFS_LOCK_MASK = action_mask(Action.STALL_TO_DVFS_LOCK)
+    SCHEDULE_MASK = action_mask(Action.SCHEDULE)
+    SCHEDULE_DELAYED_MASK = action_mask(Action.SCHEDULE_DELAYED)
+    DVFS_UP_MASK = action_mask(Action.DVFS_UP)
+    DVFS_DOWN_MASK = action_mask(Action.DVFS_DOWN)
+
+    def __init__(self, core: Core, tasks: TaskTable, duration, second_slice_size, schedule_rewards: tuple, miss_rewards: tuple,
+                 delay_rewards: tuple, dvfs_up_reward, dvfs_down_reward, steady_state=False):
+        self.tasks = tasks
+        self.is_delayed = tasks.is_delayed
+        self.no_tasks = len(tasks)
+        self.horizon = round(duration * second_slice_size)
+        self.energy_budget = core.allowed_avg_power * duration
+        self.no_dvfs_levels = len(core.dvfs_levels)
+        self.dvfs_change_lock = core.dvfs_change_lock
+        self.execution_times = core.execution_times
+        self.energy_consumption = core.energy_consumption
+        self.schedule_rewards = schedule_rewards
+        self.miss_rewards = miss_rewards
+        self.delay_rewards = delay_rewards
+        self.dvfs_up_reward = dvfs_up_reward
+        self.dvfs_down_reward = dvfs_down_reward
+        self.steady_state = steady_state
+        self.initial_dvfs_level = (core.default_dvfs_level if steady_state else self.no_dvfs_levels - 1)
+        self.initial_dvfs_lock_from = (-self.dvfs_change_lock if steady_state else 0)
+        self.task_masks = tuple((action_mask(Action.MISS) if miss_rewards[priority] is not None else 0) | 
+                                (action_mask(Action.DELAY) if delay_rewards[priority] is not None else 0) for priority in Priority)
+        self.reward_vectors = np.zeros((len(Priority) + 1, len(Action)))
+        self.reward_vectors[:, Action.DVFS_UP] = dvfs_up_reward
+        self.reward_vectors[:, Action.DVFS_DOWN] = dvfs_down_reward
+        for priority in Priority:
+            self.reward_vectors[priority, Action.SCHEDULE] = schedule_rewards[priority]
+            self.reward_vectors[priority, Action.MISS] = (miss_rewards[priority] if miss_rewards[priority] is not None else 0)
+            self.reward_vectors[priority, Action.DELAY] = (delay_rewards[priority] if delay_rewards[priority] is not None else 0)
+
+    def initial_state(self) -> QState:
+        return QState(0, 0, self.initial_dvfs_level, self.initial_dvfs_lock_from, 0, ())
+
+    def is_schedulable(self, state: QState, task_index: int):
+        arrival_time, deadline = self.tasks.arrival_time.item(task_index), self.tasks.deadline.item(task_index)
+        final_deadline = (deadline if not self.is_delayed.item(task_index) else deadline + (deadline - arrival_time))
+        return max(arrival_time, state.time) + self.execution_times.item(task_index, state.dvfs_level) <= final_deadline
+
+    def actions(self, state: QState) -> tuple[int, int, np.ndarray]:
+        if self.energy_budget < state.consumed_energy:
+            return Transition.FAILURE, 0, None
+
+        mask, rewards = 0, self.reward_vectors[Transition.NO_TASK]
+        if len(state.delayed) == 0 and state.task_num == self.no_tasks:
+            if state.time == self.horizon:
+                if self.steady_state and not self.is_start_dvfs_state(state):
+                    return Transition.FAILURE, 0, None
+                return Transition.FINISHED, 0, None
+            else:
+                mask |= Transition.STALL_TO_FINISH_MASK
+
+                time_interval = self.dvfs_change_lock - (state.time - state.dvfs_lock_from)
+                if time_interval > 0 and state.time + time_interval <= self.horizon:
+                    mask |= Transition.STALL_TO_DVFS_LOCK_MASK
+
+        if state.task_num < self.no_tasks:
+            priority = self.tasks.priority.item(state.task_num)
+            if self.is_schedulable(state, state.task_num):
+                mask |= Transition.SCHEDULE_MASK
+            elif priority == Priority.HARD:
+                return Transition.FAILURE, 0, None
+            mask |= self.task_masks[priority]
+            rewards = self.reward_vectors[priority]
+
+        if len(state.delayed) > 0:
+            if self.is_schedulable(state, state.delayed[0]):
+                mask |= Transition.SCHEDULE_DELAYED_MASK
+            else:
+                return Transition.FAILURE, 0, None
+
+        if self.dvfs_change_lock + state.dvfs_lock_from <= state.time:
+            if state.dvfs_level < self.no_dvfs_levels - 1 and (not self.steady_state or self.can_return(state.time, state.dvfs_level + 1)):
+                mask |= Transition.DVFS_UP_MASK
+            if state.dvfs_level > 0 and (not self.steady_state or self.can_return(state.time, state.dvfs_level - 1)):
+                mask |= Transition.DVFS_DOWN_MASK
+
+        return Transition.ACTIVE, mask, rewards
+
+    def is_start_dvfs_state(self, state: QState):
+        return state.dvfs_level == self.initial_dvfs_level and state.dvfs_lock_from + self.dvfs_change_lock <= self.horizon
+
+    def can_return(self, time, dvfs_level):
+        return time + (abs(dvfs_level - self.initial_dvfs_level) + 1) * self.dvfs_change_lock <= self.horizon
+
+    def step(self, state: QState, action: Action) -> tuple[QState, int, int]:
+        if action == Action.SCHEDULE:
+            priority = self.tasks.priority.item(state.task_num)
+            (finish_time, energy,) = self.run_task(state, state.task_num)
+            return (QState(finish_time, state.task_num + 1, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy + energy, state.delayed),
+                    self.schedule_rewards[priority], energy)
+        elif action == Action.SCHEDULE_DELAYED:
+            (finish_time, energy,) = self.run_task(state, state.delayed[0])
+            return (QState(finish_time, state.task_num, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy + energy, state.delayed[1:]),
+                    0, energy)
+        elif action == Action.MISS:
+            priority = self.tasks.priority.item(state.task_num)
+            return (QState(state.time, state.task_num + 1, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy, state.delayed),
+                    self.miss_rewards[priority], 0)
+        elif action == Action.DELAY:
+            priority = self.tasks.priority.item(state.task_num)
+            return (QState(state.time, state.task_num + 1, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy, (*state.delayed, state.task_num,)),
+                    self.delay_rewards[priority], 0)
+        elif action == Action.DVFS_UP:
+            return (QState(state.time, state.task_num, state.dvfs_level + 1, state.time, state.consumed_energy, state.delayed),
+                    self.dvfs_up_reward, 0)
+        elif action == Action.DVFS_DOWN:
+            return (QState(state.time, state.task_num, state.dvfs_level - 1, state.time, state.consumed_energy, state.delayed),
+                    self.dvfs_down_reward, 0)
+        elif action == Action.STALL_TO_FINISH:
+            energy = self.energy_consumption(self.horizon - state.time, state.dvfs_level)
+            return (QState(self.horizon, state.task_num, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy + energy, state.delayed),
+                    0, energy)
+        else:
+            time_interval = self.dvfs_change_lock - (state.time - state.dvfs_lock_from)
+            energy = self.energy_consumption(time_interval, state.dvfs_level)
+            return (QState(state.time + time_interval, state.task_num, state.dvfs_level, state.dvfs_lock_from, state.consumed_energy + energy,
+                           state.delayed), 0, energy)
+
+    def run_task(self, state: QState, task_index: int) -> tuple[int, int]:
+        start_time = max(self.tasks.arrival_time.item(task_index), state.time)
+        finish_time = start_time + self.execution_times.item(task_index, state.dvfs_level)
+        return finish_time, self.energy_consumption(finish_time - state.time, state.dvfs_level)
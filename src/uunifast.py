@@ -1,12 +1,14 @@
 import random
+import numpy as np
 
-def generate_uunifastdiscard(nsets: int, u: float, n: int):
+def generate_uunifastdiscard(nsets: int, u: float, n: int, rng: random.Random = None):
+    rng = (rng if rng is not None else random)
     sets = []
     while len(sets) < nsets:
         utilizations = []
         sumU = u
         for i in range(1, n):
-            nextSumU = sumU * random.random() ** (1.0 / (n - i))
+            nextSumU = sumU * rng.random() ** (1.0 / (n - i))
             utilizations.append(sumU - nextSumU)
             sumU = nextSumU
         utilizations.append(sumU)
@@ -14,4 +16,26 @@ def generate_uunifastdiscard(nsets: int, u: float, n: int):
         if all(ut <= 1 for ut in utilizations):
             sets.append(utilizations)
 
-    return sets
\ No newline at end of file
+    return sets
+
+def generate_uunifastdiscard_batch(nsets: int, u: float, n: int, rng: np.random.Generator, max_elements=1 << 22, 
+                                   max_empty_batches=16) -> np.ndarray:
+    exponents = 1.0 / np.arange(n - 1, 0, -1, dtype=np.float64)
+    max_batch_size = max(max_elements // (n + 1), 1)
+    sets, no_sets, acceptance, empty_batches = [], 0, 1.0, 0
+    while no_sets < nsets:
+        batch_size = min(max_batch_size, max(64, int(1.1 * (nsets - no_sets) / acceptance)))
+        sums = np.empty((batch_size, n + 1), dtype=np.float64)
+        sums[:, 0] = u
+        sums[:, -1] = 0.0
+        sums[:, 1:-1] = u * np.cumprod(rng.random((batch_size, n - 1)) ** exponents, axis=1)
+        utilizations = sums[:, :-1] - sums[:, 1:]
+        accepted = utilizations[(utilizations <= 1).all(axis=1)]
+        empty_batches = (empty_batches + 1 if len(accepted) == 0 else 0)
+        if empty_batches == max_empty_batches:
+            raise ValueError('Utilization is not supported for the task set size.')
+        acceptance = max(len(accepted) / batch_size, 1.0 / batch_size)
+        sets.append(accepted[:nsets - no_sets])
+        no_sets += len(sets[-1])
+
+    return np.concatenate(sets) if len(sets) > 0 else np.empty((0, n), dtype=np.float64)
@@ -0,0 +1,32 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import json
+import random
+import pytest
+from core import Core
+from ptask_generator import PTaskGenerator
+from qscheduler import QScheduler
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs')
+
+def build_core(core_id='1'):
+    core_config = json.load(open(f'{CONFIG_PATH}/core_config.json', 'r'))
+    simulation_config = json.load(open(f'{CONFIG_PATH}/simulation_config.json', 'r'))
+    core_name = simulation_config['cores'][core_id]['name']
+    return Core(core_name, core_id, core_config[core_name]['average-cpi'], core_config[core_name]['1-GHz-power-mW'],
+                core_config[core_name]['dvfs-change-lock'], core_config[core_name]['dfvs-levels'],
+                simulation_config['cores'][core_id]['default-dvfs-level'], simulation_config['cores'][core_id]['allowed-average-power-mW'],
+                simulation_config['second-slice-size']), simulation_config
+
+def build_scheduler(episodes=300, **kwargs):
+    return QScheduler('worst-fit', 0.5, 0.2, 0.999, episodes, 2, 1, -18, 5, -45, -10, 10, 1000, 3, 1000000, **kwargs)
+
+@pytest.fixture
+def small_workload():
+    (core, simulation_config,) = build_core()
+    ptasks = PTaskGenerator().generate(5, 0.3, core.available_resource, simulation_config['task-periods'], simulation_config['real-time-modes'],
+                                       simulation_config['second-slice-size'], rng=random.Random(1))
+    for ptask in ptasks:
+        core.add_ptask(ptask)
+    return core, ptasks
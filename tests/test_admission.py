@@ -0,0 +1,33 @@
+import random
+from admission import AdmissionTest
+from priority import Priority
+from ptask import PTask
+from conftest import build_core, build_scheduler
+
+def test_energy_bound_holds_for_learned_schedules(small_workload):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler()
+    tasks = qscheduler.extract_tasks_from_ptasks(core.ptasks, 5)
+    random.seed(0)
+    (trajectory, model,) = qscheduler.learn_schedule(core, tasks, 5)
+    (last_state, state_id, action,) = trajectory[-1]
+    consumed_energy = model.step(last_state, action)[0].consumed_energy
+    admission = AdmissionTest(core, tasks, 5, core.second_slice_size)
+    assert admission.check()
+    assert admission.energy_lower_bound() <= consumed_energy <= admission.energy_budget
+
+def test_rejects_low_energy_budget(small_workload):
+    (core, ptasks,) = small_workload
+    core.allowed_avg_power = 1
+    admission = AdmissionTest(core, build_scheduler().extract_tasks_from_ptasks(core.ptasks, 5), 5, core.second_slice_size)
+    assert not admission.check()
+    assert admission.reason == 'the energy lower bound exceeds the energy budget'
+
+def test_rejects_hard_overload():
+    (core, simulation_config,) = build_core()
+    period = core.second_slice_size // 2
+    core.add_ptask(PTask(0, int(4 * core.instruction_per_time_unit(len(core.dvfs_levels) - 1) * period), period, Priority.HARD))
+    admission = AdmissionTest(core, build_scheduler().extract_tasks_from_ptasks(core.ptasks, 5), 5, core.second_slice_size)
+    assert not admission.check()
+    assert admission.reason == 'hard tasks exceed the core capacity at the highest DVFS level'
+    assert admission.hard_utilization(len(core.dvfs_levels) - 1) > 1
@@ -0,0 +1,46 @@
+import random
+from conftest import build_scheduler
+from convergence import ConvergenceMonitor
+
+def stable(point, tolerance):
+    return (point['finished'] and point['return-delta'] is not None and point['qvalue-delta'] is not None and
+            point['return-delta'] <= tolerance and point['qvalue-delta'] <= tolerance)
+
+def test_monitor_stops_after_patience_stable_checks():
+    monitor = ConvergenceMonitor(2, 1.0)
+    assert not monitor.observe(10, 5.0, True, {(0, 2): 1.0})
+    assert not monitor.observe(20, 5.5, True, {(0, 2): 1.5})
+    assert not monitor.observe(30, 9.0, True, {(0, 2): 1.5})
+    assert not monitor.observe(40, 9.0, True, {(0, 2): 1.75})
+    assert monitor.observe(50, 9.0, True, {(0, 2): 1.75})
+    assert monitor.stopping_episode == 50
+    report = monitor.report(50)
+    assert (report['episodes'], report['stopping-episode'],) == (50, 50)
+    assert [(point['return-delta'], point['qvalue-delta'],) for point in report['curve']] == [
+        (None, None,), (0.5, 0.5,), (3.5, 0.0,), (0.0, 0.25,), (0.0, 0.0,)]
+
+def test_monitor_needs_finished_rollouts_over_the_same_path():
+    monitor = ConvergenceMonitor(1, 1.0)
+    monitor.observe(10, 5.0, True, {(0, 2): 1.0})
+    assert not monitor.observe(20, 5.0, False, {(0, 2): 1.0})
+    assert not monitor.observe(30, 5.0, True, {(0, 3): 1.0})
+    assert monitor.report(30)['curve'][-1]['qvalue-delta'] is None
+    assert monitor.observe(40, 5.0, True, {(0, 3): 1.0})
+
+def test_learning_stops_once_converged(small_workload):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler(episodes=3000, early_stopping=True, convergence_check_interval=50, convergence_patience=3)
+    random.seed(0)
+    qscheduler.learn_qtable(core, qscheduler.extract_tasks_from_ptasks(core.ptasks, 5), 5)
+    report = core.learning_report
+    assert report['stopping-episode'] == report['episodes'] < 3000
+    assert [point['episode'] for point in report['curve']] == list(range(50, report['episodes'] + 1, 50))
+    assert all(stable(point, 1.0) for point in report['curve'][-3:])
+    assert len(report['curve']) == 3 or not stable(report['curve'][-4], 1.0)
+
+def test_learning_without_early_stopping_runs_every_episode(small_workload):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler(episodes=200)
+    random.seed(0)
+    qscheduler.learn_qtable(core, qscheduler.extract_tasks_from_ptasks(core.ptasks, 5), 5)
+    assert core.learning_report == {'episodes': 200, 'stopping-episode': None, 'curve': []}
@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from action import Action
+from qtable import QTable
+from transition import Transition
+from conftest import build_scheduler
+from log_histogram import LogHistogram
+from decision_service import DecisionService, record_latency, latency_report
+
+@pytest.fixture
+def service(small_workload):
+    (core, ptasks,) = small_workload
+    service = DecisionService(build_scheduler(), [core], 5)
+    service.prepare(seed=0)
+    return service
+
+def test_decisions_follow_the_masked_argmax(service):
+    model, qtable, qtable_decisions = service.models['1'], service.qtables['1'], 0
+    while True:
+        qstate = service.states['1']
+        (status, action_mask, rewards,) = model.actions(qstate)
+        (decided_status, action, source,) = service.decide('1')
+        if status != Transition.ACTIVE:
+            assert decided_status == status and action is None
+            break
+        state_id = qtable.state_id(service.qscheduler.state_encoder.encode(qstate, status, model))
+        if source == 'edf':
+            assert state_id is None or not qtable.is_explored(state_id)
+        else:
+            assert action == Action(int((qtable.qvalues[state_id] + QTable.MASK_QVALUES[action_mask]).argmax()))
+            assert action in qtable.legal_actions(state_id)
+            qtable_decisions += 1
+        if '1' in service.running:
+            service.completion('1', service.running['1'][0], service.states['1'].time)
+    assert decided_status == Transition.FINISHED and qtable_decisions > 0
+
+def test_unexplored_states_fall_back_to_edf(service):
+    qtable = service.qtables['1']
+    state_id = qtable.state_id(service.qscheduler.state_encoder.encode(service.states['1'], Transition.ACTIVE, service.models['1']))
+    qtable.action_masks[state_id] = 0
+    assert not qtable.is_explored(state_id)
+    assert service.decide('1')[2] == 'edf'
+
+def test_completion_corrects_time_and_energy(service):
+    model = service.models['1']
+    while '1' not in service.running:
+        service.decide('1')
+    (task_index, started_from,) = service.running['1']
+    with pytest.raises(ValueError):
+        service.decide('1')
+    finish = service.states['1'].time + 7
+    qstate = service.completion('1', task_index, finish)
+    assert qstate.time == finish
+    assert qstate.consumed_energy == started_from.consumed_energy + model.energy_consumption(finish - started_from.time, started_from.dvfs_level)
+    with pytest.raises(ValueError):
+        service.completion('1', task_index, finish)
+
+def test_arrival_moves_release_until_reset(service):
+    model = service.models['1']
+    nominal = model.tasks.arrival_time.item(1)
+    service.arrival('1', 1, nominal + 3)
+    assert model.tasks.arrival_time.item(1) == nominal + 3
+    with pytest.raises(ValueError):
+        service.arrival('1', 1, model.tasks.deadline.item(1))
+    service.reset_core('1')
+    assert model.tasks.arrival_time.item(1) == nominal
+
+def test_requests_track_state_in_the_service(service):
+    async def replay():
+        await service.start()
+        try:
+            response = await service.request({'type': 'decide', 'core': '1'})
+            while 'task' not in response:
+                response = await service.request({'type': 'decide', 'core': '1'})
+            completed = await service.request({'type': 'completion', 'core': '1', 'task': response['task'], 'time': response['finish']})
+            with pytest.raises(ValueError):
+                await service.request({'type': 'decide', 'core': '2'})
+            return response, completed
+        finally:
+            await service.stop()
+    (response, completed,) = asyncio.run(replay())
+    assert response['status'] == 'active' and response['start'] <= response['finish']
+    assert completed['state']['time'] == response['finish']
+
+def test_latency_report_is_in_microseconds():
+    latencies = LogHistogram()
+    for microseconds in range(1, 1001):
+        record_latency(latencies, microseconds / 1_000_000)
+    report = latency_report(latencies)
+    assert report['count'] == 1000 and report['max-us'] == 1000
+    assert report['mean-us'] == pytest.approx(500.5)
+    for (percentile, value,) in ((50, 500), (95, 950), (99, 990)):
+        assert report[f'p{percentile}-us'] == pytest.approx(value, rel=0.03)
+    assert latency_report(LogHistogram())['p99-us'] is None
@@ -0,0 +1,43 @@
+import random
+import pytest
+from conftest import build_core, build_scheduler
+from ptask_generator import PTaskGenerator
+from task_table import TaskTable
+from transition import Transition
+from action import Action
+from qstate import QState
+
+def harmonic_core(seed):
+    (core, simulation_config,) = build_core()
+    ptasks = PTaskGenerator().generate(4, 0.3, core.available_resource, simulation_config['task-periods'], simulation_config['real-time-modes'],
+                                       simulation_config['second-slice-size'], harmonic_periods=True, rng=random.Random(seed))
+    for ptask in ptasks:
+        core.add_ptask(ptask)
+    return core
+
+@pytest.mark.parametrize('seed', range(4))
+def test_tiling_respects_dvfs_lock(seed):
+    core, changes = harmonic_core(seed), []
+    (dvfs_up, dvfs_down,) = (core.dvfs_up, core.dvfs_down)
+    core.dvfs_up = lambda time: (changes.append(time), dvfs_up(time))
+    core.dvfs_down = lambda time: (changes.append(time), dvfs_down(time))
+    random.seed(seed)
+    assert build_scheduler(hyperperiod_mode=True).schedule_hyperperiod(core, 10)
+    assert core.last_finish_time() == 10 * core.second_slice_size
+    assert all(later - earlier >= core.dvfs_change_lock for (earlier, later,) in zip(changes, changes[1:]))
+
+def test_steady_state_episodes_end_in_the_start_dvfs_state():
+    core = harmonic_core(0)
+    window = TaskTable.from_ptasks(core.ptasks, core.second_slice_size, whole_periods=True)
+    model = build_scheduler().transition_model(core, window, 1, steady_state=True)
+    state = model.initial_state()
+    assert model.actions(state)[1] & (Transition.DVFS_UP_MASK | Transition.DVFS_DOWN_MASK) == 0
+
+    model.dvfs_change_lock = model.horizon // 4
+    state = QState(0, 0, model.initial_dvfs_level, -model.dvfs_change_lock, 0, ())
+    assert model.actions(state)[1] & Transition.DVFS_DOWN_MASK
+    lowered = model.step(state, Action.DVFS_DOWN)[0]
+    late = QState(model.horizon // 2 + 1, model.no_tasks, lowered.dvfs_level, lowered.dvfs_lock_from, 0, ())
+    assert model.actions(late)[1] & (Transition.DVFS_UP_MASK | Transition.DVFS_DOWN_MASK) == Transition.DVFS_UP_MASK
+    assert model.actions(QState(model.horizon, model.no_tasks, lowered.dvfs_level, 0, 0, ()))[0] == Transition.FAILURE
+    assert model.actions(QState(model.horizon, model.no_tasks, model.initial_dvfs_level, 0, 0, ()))[0] == Transition.FINISHED
@@ -0,0 +1,30 @@
+import tracemalloc
+from metrics import CoreMetrics
+
+def test_phase_peaks_cover_nested_phases():
+    metrics = CoreMetrics('core')
+    tracemalloc.start()
+    try:
+        with metrics.phase('learn'):
+            with metrics.phase('convergence-check'):
+                block = bytearray(4 * 1024 * 1024)
+                del block
+            block = bytearray(1024 * 1024)
+            del block
+        with metrics.phase('replay'):
+            pass
+    finally:
+        tracemalloc.stop()
+    peaks = metrics.report()['phase-peak-allocated-kB']
+    assert peaks['convergence-check'] >= 4096
+    assert peaks['learn'] >= peaks['convergence-check']
+    assert peaks['replay'] < 1024
+    assert metrics.csv_row()['learn-peak-allocated-kB'] == peaks['learn']
+
+def test_phase_peaks_need_tracing():
+    metrics = CoreMetrics('core')
+    with metrics.phase('learn'):
+        pass
+    metrics.record_process_peak_rss()
+    report = metrics.report()
+    assert report['phase-peak-allocated-kB'] == {} and report['process-peak-rss-kB'] > 0
@@ -0,0 +1,90 @@
+import random
+import pytest
+from core import Core
+from ptask_generator import PTaskGenerator
+from partitioner import PARTITIONERS, energy_cost, map_ptasks
+from conftest import build_core
+
+def random_cores(seed, no_cores):
+    rng = random.Random(seed)
+    return [Core('Cortex-A7', str(core_id + 1), rng.choice((0.5, 1.0, 1.5)), rng.choice((30, 45, 60)), 1, [0.2, 0.6, 1.0, 1.4, 1.8],
+                 rng.randint(1, 4), rng.choice((50, 100, 200)), 1000000) for core_id in range(no_cores)]
+
+def random_ptasks(cores, seed, utilization):
+    (core, simulation_config,) = build_core()
+    return PTaskGenerator().generate(4 * len(cores), utilization, sum(core.available_resource for core in cores), 
+                                     simulation_config['task-periods'], simulation_config['real-time-modes'], 
+                                     simulation_config['second-slice-size'], rng=random.Random(seed))
+
+def scan_fit(choose):
+    def fit(cores, ptasks, order=None):
+        available, assignment = [core.available_resource for core in cores], [None] * len(ptasks)
+        for ptask_index in (order if order is not None else range(len(ptasks))):
+            needed_resource = ptasks[ptask_index].needed_resource()
+            candidates = [core_index for core_index in range(len(cores)) if available[core_index] >= needed_resource]
+            if len(candidates) == 0:
+                raise ValueError('Core mapping failed.')
+            core_index = choose(candidates, available)
+            available[core_index] -= needed_resource
+            assignment[ptask_index] = core_index
+        return assignment
+    return fit
+
+first_fit = scan_fit(lambda candidates, available: candidates[0])
+best_fit = scan_fit(lambda candidates, available: min(candidates, key=lambda core_index: available[core_index]))
+worst_fit = scan_fit(lambda candidates, available: max(candidates, key=lambda core_index: available[core_index]))
+
+def decreasing(ptasks):
+    return sorted(range(len(ptasks)), key=lambda ptask_index: ptasks[ptask_index].needed_resource(), reverse=True)
+
+def energy_aware(cores, ptasks):
+    core_order = sorted(range(len(cores)), key=lambda core_index: energy_cost(cores[core_index]))
+    available = {core_index: cores[core_index].available_resource for core_index in core_order}
+    headroom = {core_index: cores[core_index].allowed_avg_power for core_index in core_order}
+    assignment = [None] * len(ptasks)
+    for ptask_index in decreasing(ptasks):
+        needed_resource = ptasks[ptask_index].needed_resource()
+        core_index = next((core_index for core_index in core_order 
+                           if min(available[core_index], headroom[core_index] / energy_cost(cores[core_index])) >= needed_resource), None)
+        if core_index is None:
+            raise ValueError('Core mapping failed.')
+        available[core_index] -= needed_resource
+        headroom[core_index] -= needed_resource * energy_cost(cores[core_index])
+        assignment[ptask_index] = core_index
+    return assignment
+
+REFERENCES = {
+    'first-fit': first_fit,
+    'best-fit': best_fit,
+    'worst-fit': worst_fit,
+    'worst-fit-decreasing': lambda cores, ptasks: worst_fit(cores, ptasks, decreasing(ptasks)),
+    'energy-aware': energy_aware
+}
+
+def outcome(partitioner, cores, ptasks):
+    try:
+        return partitioner(cores, ptasks)
+    except ValueError:
+        return None
+
+@pytest.mark.parametrize('name', sorted(PARTITIONERS))
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('utilization', [0.3, 0.9, 1.2])
+def test_partitioners_match_linear_scans(name, seed, utilization):
+    cores = random_cores(seed, 12)
+    ptasks = random_ptasks(cores, seed, utilization)
+    assert outcome(PARTITIONERS[name], cores, ptasks) == outcome(REFERENCES[name], cores, ptasks)
+
+def test_map_ptasks_adds_ptasks_to_cores():
+    cores = random_cores(0, 4)
+    ptasks = random_ptasks(cores, 0, 0.3)
+    map_ptasks('worst-fit', cores, ptasks)
+    assert sorted(ptask.id for core in cores for ptask in core.ptasks) == sorted(ptask.id for ptask in ptasks)
+    with pytest.raises(ValueError):
+        map_ptasks('next-fit', cores, ptasks)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_best_fit_breaks_ties_by_core_index(seed):
+    cores = [Core('Cortex-A7', str(core_id + 1), 1.0, 45, 1, [0.2, 0.6, 1.0, 1.4, 1.8], 2, 100, 1000000) for core_id in range(200)]
+    ptasks = random_ptasks(cores, seed, 0.8)
+    assert outcome(PARTITIONERS['best-fit'], cores, ptasks) == outcome(REFERENCES['best-fit'], cores, ptasks)
@@ -0,0 +1,51 @@
+import os
+import math
+import random
+import numpy as np
+from launcher import load_configs, build_cores, build_ptasks
+from ptask_generator import PTaskGenerator
+from priority import Priority
+from uunifast import generate_uunifastdiscard_batch
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'configs')
+
+def ptask_fields(seed):
+    core_config, qscheduler_config, simulation_config = load_configs(CONFIG_PATH)
+    return [(ptask.id, ptask.ins_count, ptask.period, ptask.priority,)
+            for ptask in build_ptasks(build_cores(core_config, simulation_config), simulation_config, seed)]
+
+def test_seed_reproduces_workload():
+    random.seed(1)
+    first = ptask_fields(7)
+    random.seed(2)
+    assert ptask_fields(7) == first
+    assert ptask_fields(8) != first
+
+def generate_batch(seed, harmonic_periods=False):
+    core_config, qscheduler_config, simulation_config = load_configs(CONFIG_PATH)
+    return PTaskGenerator().generate_batch(500, 8, 2.5, 3.0, simulation_config['task-periods'], simulation_config['real-time-modes'],
+                                           simulation_config['second-slice-size'], harmonic_periods, seed), simulation_config
+
+def test_batch_fields_follow_the_utilizations():
+    (batch, simulation_config,) = generate_batch(5)
+    second_slice_size = simulation_config['second-slice-size']
+    (low, high,) = simulation_config['task-periods']['small']
+    assert (len(batch), batch.task_set_size(),) == (500, 8)
+    assert np.allclose(batch.utilization.sum(axis=1), 2.5)
+    assert ((batch.period >= low * second_slice_size) & (batch.period <= high * second_slice_size)).all()
+    assert (batch.ins_count == np.floor(batch.utilization * 3.0 * batch.period)).all()
+    assert set(batch.priority.flatten().tolist()) <= {Priority.parse(mode) for mode in simulation_config['real-time-modes']}
+
+def test_batch_is_reproducible_from_its_seed():
+    (first, simulation_config,) = generate_batch(5)
+    (second, simulation_config,) = generate_batch(5)
+    for field in ('utilization', 'ins_count', 'period', 'priority'):
+        assert (getattr(first, field) == getattr(second, field)).all()
+    assert (first.utilization == generate_uunifastdiscard_batch(500, 2.5, 8, np.random.default_rng(5))).all()
+    assert not (generate_batch(6)[0].period == first.period).all()
+
+def test_batch_harmonic_periods_match_scalar_harmonization():
+    (batch, simulation_config,) = generate_batch(5, harmonic_periods=True)
+    (plain, simulation_config,) = generate_batch(5)
+    base_period = math.floor(simulation_config['task-periods']['small'][0] * simulation_config['second-slice-size'])
+    assert batch.period.tolist() == [[PTaskGenerator().harmonize_period(period, base_period) for period in row] for row in plain.period.tolist()]
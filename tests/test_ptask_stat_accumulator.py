@@ -0,0 +1,39 @@
+import random
+import numpy as np
+from log_histogram import LogHistogram
+from ptask_stat_accumulator import PTaskStatAccumulator
+
+def test_histogram_percentiles_are_close_to_exact():
+    rng = np.random.default_rng(0)
+    values = np.concatenate((rng.integers(-5000, 0, 2000), rng.integers(0, 200000, 20000)))
+    histogram = LogHistogram()
+    histogram.add_array(values)
+    for (percentile, value,) in zip((1, 50, 95, 99), histogram.percentiles((1, 50, 95, 99))):
+        exact = np.percentile(values, percentile)
+        assert abs(value - exact) <= 0.03 * abs(exact) + 1
+
+def test_add_merge_and_add_array_agree():
+    values = [random.Random(i).randint(-100, 10000) for i in range(1000)]
+    added, merged, batched = LogHistogram(), LogHistogram(), LogHistogram()
+    for value in values:
+        added.add(value)
+    halves = (LogHistogram(), LogHistogram())
+    halves[0].add_array(np.array(values[:500]))
+    halves[1].add_array(np.array(values[500:]))
+    merged.merge(halves[0])
+    merged.merge(halves[1])
+    batched.add_array(np.array(values))
+    assert added.counts == merged.counts == batched.counts
+    assert (added.min_value, added.max_value) == (merged.min_value, merged.max_value) == (min(values), max(values))
+
+def test_accumulator_memory_does_not_grow_with_jobs():
+    accumulator = PTaskStatAccumulator(1000)
+    for i in range(100000):
+        arrival = i * 10
+        accumulator.add_scheduled(i % 3, arrival, arrival + 50, arrival + 5, arrival + 5 + i % 40, False)
+    assert max(len(histogram.counts) for histogram in accumulator.response_times) < 200
+    summary = accumulator.summary(0)
+    assert summary['no-tasks'] == 33334
+    (p50, p95, p99,) = summary['response-percentiles']
+    assert 0.020 <= p50 <= 0.030 and p50 <= p95 <= p99 <= 0.045
+    assert summary['max-lateness'] == -0.006
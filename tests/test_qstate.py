@@ -0,0 +1,32 @@
+import pickle
+import pytest
+from qstate import QState
+
+def test_qstate_behaves_as_six_fields():
+    qstate = QState(10, 2, 3, 0, 50, (1,))
+    (time, task_num, dvfs_level, dvfs_lock_from, consumed_energy, delayed,) = qstate
+    assert (time, task_num, dvfs_level, dvfs_lock_from, consumed_energy, delayed,) == (10, 2, 3, 0, 50, (1,))
+    assert len(qstate) == 6
+    assert qstate != (10, 2, 3, 0, 50, (1,))
+    assert qstate != (10, 2, 3, 0, 50, (1,), hash(qstate))
+
+def test_qstate_equality_and_hash():
+    qstate = QState(10, 2, 3, 0, 50, ())
+    assert qstate == QState(10, 2, 3, 0, 50, ())
+    assert hash(qstate) == hash(QState(10, 2, 3, 0, 50, ()))
+    assert qstate != QState(10, 2, 3, 0, 50, (2,))
+    assert {qstate: 1}[QState(10, 2, 3, 0, 50, ())] == 1
+
+def test_qstate_pickle_round_trip():
+    qstate = QState(10, 2, 3, 0, 50, (4, 5,))
+    restored = pickle.loads(pickle.dumps(qstate))
+    assert restored == qstate and hash(restored) == hash(qstate)
+    assert not hasattr(restored, '__dict__')
+
+def test_qstate_is_immutable():
+    qstate = QState(10, 2, 3, 0, 50, ())
+    with pytest.raises(AttributeError):
+        qstate.time = 11
+    with pytest.raises(AttributeError):
+        del qstate.delayed
+    assert qstate == QState(10, 2, 3, 0, 50, ()) and hash(qstate) == hash(QState(10, 2, 3, 0, 50, ()))
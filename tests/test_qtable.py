@@ -0,0 +1,38 @@
+import numpy as np
+from action import Action, action_mask
+from qstate import QState
+from qtable import QTable
+
+def qstate(time):
+    return QState(time, 0, 0, 0, 0, ())
+
+def test_states_are_interned():
+    qtable = QTable(2)
+    state_ids = [qtable.add_state(qstate(time)) for time in range(5)]
+    assert state_ids == list(range(5)) and len(qtable) == 5
+    assert qtable.state_id(qstate(3)) == 3 and qstate(3) in qtable and qstate(7) not in qtable
+    assert qtable.qstate(4) == qstate(4)
+    assert qtable.qvalues.shape[0] >= 5 and qtable.rewards.shape == qtable.qvalues.shape
+
+def test_rows_mask_illegal_actions():
+    qtable = QTable(1)
+    state_id = qtable.add_state(qstate(0))
+    mask = action_mask(Action.SCHEDULE, Action.DVFS_DOWN)
+    qtable.set_actions(state_id, mask, np.arange(len(Action), dtype=np.float64) + 1)
+    assert qtable.legal_actions(state_id) == (Action.SCHEDULE, Action.DVFS_DOWN)
+    assert qtable.qvalues[state_id].tolist() == [(0.0 if action in (Action.SCHEDULE, Action.DVFS_DOWN) else float('-inf')) for action in Action]
+    assert qtable.rewards[state_id].tolist() == [(action + 1.0 if action in (Action.SCHEDULE, Action.DVFS_DOWN) else 0.0) for action in Action]
+    assert qtable.max_qvalue_action(state_id) == Action.SCHEDULE
+
+def test_update_and_terminal_rows():
+    qtable = QTable(1)
+    (state_id, next_state_id,) = (qtable.add_state(qstate(0)), qtable.add_state(qstate(1)))
+    rewards = np.full(len(Action), 2.0)
+    qtable.set_actions(state_id, action_mask(Action.SCHEDULE, Action.MISS), rewards)
+    qtable.set_finished(next_state_id, 10)
+    qtable.update(state_id, Action.MISS, next_state_id, 0.5)
+    assert qtable.qvalues[state_id, Action.MISS] == 6.0
+    assert qtable.max_qvalue_action(state_id) == Action.MISS
+    assert qtable.is_finished(next_state_id) and qtable.is_terminal(next_state_id) and not qtable.is_terminal(state_id)
+    qtable.set_failure(state_id)
+    assert qtable.is_terminal(state_id) and qtable.max_qvalue(state_id) == float('-inf')
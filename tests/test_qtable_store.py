@@ -0,0 +1,74 @@
+import random
+import numpy as np
+from conftest import build_scheduler
+from qstate import QState
+from qtable_store import QTableStore
+
+def learned_table(qscheduler, core, seed=1, qtable=None):
+    tasks = qscheduler.extract_tasks_from_ptasks(core.ptasks, 5)
+    random.seed(seed)
+    return qscheduler.learn_qtable(core, tasks, 5, qtable), tasks
+
+def test_load_resolves_states_lazily(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler()
+    (qtable, tasks,) = learned_table(qscheduler, core)
+    store = QTableStore(str(tmp_path))
+    store.save('table', qtable)
+    loaded = store.load('table')
+
+    assert len(loaded) == len(qtable) and len(loaded.state_ids) == 0
+    for (state_id, qstate,) in enumerate(qtable.qstates):
+        assert loaded.state_id(qstate) == state_id
+        assert loaded.qstate(state_id) == qstate
+    assert loaded.state_id(QState(-1, 0, 0, 0, 0, ())) is None
+    assert np.array_equal(loaded.qvalues, qtable.qvalues[:len(qtable)])
+    assert loaded.action_masks == qtable.action_masks and loaded.status == qtable.status
+
+def test_continued_learning_round_trip(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler(episodes=50)
+    (qtable, tasks,) = learned_table(qscheduler, core)
+    store = QTableStore(str(tmp_path))
+    store.save('table', qtable)
+    (continued, tasks,) = learned_table(qscheduler, core, 2, store.load('table'))
+    assert len(continued) > len(qtable)
+    store.save('table', continued)
+    reloaded = store.load('table')
+    assert len(reloaded) == len(continued)
+    for state_id in range(len(continued)):
+        qstate = continued.qstate(state_id)
+        assert reloaded.state_id(qstate) == state_id and reloaded.qstate(state_id) == qstate
+    assert np.array_equal(reloaded.qvalues, continued.qvalues[:len(continued)])
+
+def test_key_depends_on_learner(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    tasks = build_scheduler().extract_tasks_from_ptasks(core.ptasks, 5)
+    keys = set()
+    for kwargs in ({}, {'learner': 'backward'}, {'learner': 'n-step', 'n_step': 4}, {'learner': 'n-step', 'n_step': 8},
+                   {'state_encoder': 'bucketed'}):
+        qscheduler = build_scheduler(qtable_cache=str(tmp_path), **kwargs)
+        keys.add(qscheduler.qtable_key(core, tasks, 5))
+    assert len(keys) == 5
+
+def test_abstract_table_round_trip(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler(state_encoder='bucketed')
+    (qtable, tasks,) = learned_table(qscheduler, core)
+    store = QTableStore(str(tmp_path))
+    store.save('table', qtable)
+    loaded = store.load('table', qscheduler.new_qtable(0))
+    assert type(loaded) is type(qtable)
+    assert loaded.seen_masks == qtable.seen_masks
+    model = qscheduler.transition_model(core, tasks, 5)
+    assert qscheduler.greedy_rollout(loaded, model)[0] == qscheduler.greedy_rollout(qtable, model)[0]
+
+def test_key_ignores_runtime_buffers(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler(qtable_cache=str(tmp_path))
+    tasks = qscheduler.extract_tasks_from_ptasks(core.ptasks, 5)
+    key = qscheduler.qtable_key(core, tasks, 5)
+    tasks.is_delayed[:] = True
+    assert qscheduler.qtable_key(core, tasks, 5) == key
+    tasks.deadline[0] += 1
+    assert qscheduler.qtable_key(core, tasks, 5) != key
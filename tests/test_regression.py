@@ -0,0 +1,26 @@
+import random
+from priority import Priority
+from ptask import PTask
+from conftest import build_core, build_scheduler
+
+PTASKS = [(1, 237806247, 739496, Priority.FIRM), (2, 55131115, 682974, Priority.FIRM), (3, 218704934, 1386850, Priority.SOFT)]
+SCHEDULED = [(2, 0, 0, 45942,), (1, 0, 45942, 244113,), (2, 682974, 682974, 728916,), (3, 0, 728916, 911170,), (1, 739496, 911170, 1109341,),
+             (2, 1365948, 1365948, 1425017,), (1, 1478992, 1478992, 1733784,), (3, 1386850, 1733784, 1968110,)]
+MISSED = [(2, 2048922,), (1, 2218488,)]
+FREQ_HISTORY = [(0, 1.8,), (0.045942, 1.8,), (0.244113, 1.8,), (0.728916, 1.8,), (0.91117, 1.8,), (1.109341, 1.8,), (1.425017, 1.4,),
+                (1.733784, 1.4,), (1.96811, 1.4,), (2.109341, 1.4,), (3.0, 1.0,)]
+ENERGY_HISTORY = [(0, 0,), (0.045942, 8,), (0.244113, 42,), (0.728916, 126,), (0.91117, 157,), (1.109341, 191,), (1.425017, 216,),
+                  (1.733784, 241,), (1.96811, 260,), (2.109341, 271,), (3.0, 297,)]
+
+def test_fixed_seed_schedule_matches_baseline():
+    (core, simulation_config,) = build_core()
+    for ptask in PTASKS:
+        core.add_ptask(PTask(*ptask))
+    random.seed(0)
+    build_scheduler().schedule(core, 3)
+    tasks = core.tasks
+    assert [(tasks.ptask_id.item(i), tasks.arrival_time.item(i), tasks.start_time.item(i), tasks.finish_time.item(i),) 
+            for i in core.scheduled_tasks] == SCHEDULED
+    assert [(tasks.ptask_id.item(i), tasks.arrival_time.item(i),) for i in core.missed_tasks] == MISSED
+    assert [tuple(entry) for entry in core.freq_history] == FREQ_HISTORY
+    assert [tuple(entry) for entry in core.energy_history] == ENERGY_HISTORY
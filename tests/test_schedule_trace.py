@@ -0,0 +1,56 @@
+import numpy as np
+from conftest import build_scheduler
+from schedule_trace import TRACE_DTYPE, TraceEvent, TraceReader, TraceWriter
+
+def write_events(path, no_events, chunk_size=64):
+    rng = np.random.default_rng(0)
+    events = np.zeros(no_events, dtype=TRACE_DTYPE)
+    events['kind'] = rng.integers(0, len(TraceEvent), no_events)
+    events['start'] = np.cumsum(rng.integers(0, 1000, no_events))
+    events['end'] = events['start'] + rng.integers(0, 500, no_events)
+    events['task'] = np.arange(no_events)
+    events['ptask'] = rng.integers(-1, 100, no_events)
+    events['dvfs-level'] = rng.integers(0, 4, no_events)
+    events['energy'] = np.cumsum(rng.integers(0, 50, no_events))
+    writer = TraceWriter(path, 1000000, chunk_size)
+    for event in events.tolist():
+        writer.append(*event)
+    writer.close()
+    return events
+
+def test_round_trip(tmp_path):
+    events = write_events(tmp_path / 'trace.bin', 1000)
+    with TraceReader(tmp_path / 'trace.bin') as reader:
+        assert reader.second_slice_size == 1000000
+        assert len(reader) == 1000 and len(reader.chunks) == 16
+        assert np.array_equal(reader.read(), events)
+
+def test_filters_match_a_full_scan(tmp_path):
+    events = write_events(tmp_path / 'trace.bin', 1000)
+    (start, end,) = (int(events['start'][300]), int(events['start'][600]))
+    with TraceReader(tmp_path / 'trace.bin') as reader:
+        window = reader.read(start, end)
+        assert np.array_equal(window, events[(events['end'] >= start) & (events['start'] < end)])
+        ptask = reader.read(ptask_id=7, kinds=(TraceEvent.SCHEDULE, TraceEvent.MISS,))
+        assert np.array_equal(ptask, events[(events['ptask'] == 7) & np.isin(events['kind'], [TraceEvent.SCHEDULE, TraceEvent.MISS])])
+        assert not any(reader.chunk_matches(chunk, events['end'].max() + 1, None, None) for chunk in reader.chunks)
+
+def test_truncated_trace_keeps_complete_chunks(tmp_path):
+    events = write_events(tmp_path / 'trace.bin', 1000)
+    data = (tmp_path / 'trace.bin').read_bytes()
+    (tmp_path / 'cut.bin').write_bytes(data[:len(data) - 10])
+    with TraceReader(tmp_path / 'cut.bin') as reader:
+        assert len(reader.chunks) == 15
+        assert np.array_equal(reader.read(), events[:15 * 64])
+
+def test_core_schedule_is_traced(small_workload, tmp_path):
+    (core, ptasks,) = small_workload
+    core.trace = TraceWriter(tmp_path / 'trace-core-1.bin', core.second_slice_size, 16)
+    build_scheduler().schedule_core(core, 5, 0)
+    with TraceReader(tmp_path / 'trace-core-1.bin') as reader:
+        jobs = reader.read(kinds=(TraceEvent.SCHEDULE, TraceEvent.SCHEDULE_DELAYED,))
+    scheduled = np.array(core.scheduled_tasks)
+    assert np.array_equal(jobs['task'], scheduled)
+    assert np.array_equal(jobs['start'], core.tasks.start_time[scheduled])
+    assert np.array_equal(jobs['end'], core.tasks.finish_time[scheduled])
+    assert np.array_equal(jobs['ptask'], core.tasks.ptask_id[scheduled])
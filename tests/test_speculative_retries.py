@@ -0,0 +1,56 @@
+import random
+import pytest
+from conftest import build_scheduler
+
+EXPLORATION_PROBS = [0.2, 0.5, 0.9]
+
+def speculative_scheduler(retry_selection, workers=1, **kwargs):
+    return build_scheduler(episodes=200, retry_mode='speculative', retry_selection=retry_selection, workers=workers, 
+                           retry_exploration_probs=EXPLORATION_PROBS, **kwargs)
+
+def attempts(qscheduler, core, tasks):
+    random.seed(0)
+    seeds = [random.getrandbits(64) for attempt in range(qscheduler.retry)]
+    return [qscheduler.learn_attempt(attempt, core, tasks, 5, None, False, seed) for (attempt, seed,) in enumerate(seeds)]
+
+def actions(trajectory):
+    return [action for (qstate, state_id, action,) in trajectory]
+
+def test_attempts_are_reproducible_from_their_seed(small_workload):
+    (core, ptasks,) = small_workload
+    qscheduler = speculative_scheduler('best')
+    tasks = qscheduler.extract_tasks_from_ptasks(core.ptasks, 5)
+    (first, second,) = (attempts(qscheduler, core, tasks), attempts(qscheduler, core, tasks))
+    assert [result[1] if result is not None else None for result in first] == [result[1] if result is not None else None for result in second]
+    assert [result[1][2] for result in first if result is not None] == [attempt for (attempt, result,) in enumerate(first) if result is not None]
+
+@pytest.mark.parametrize('retry_selection', ['first', 'best'])
+def test_selection_picks_the_expected_attempt(small_workload, retry_selection):
+    (core, ptasks,) = small_workload
+    qscheduler = speculative_scheduler(retry_selection)
+    tasks = qscheduler.extract_tasks_from_ptasks(core.ptasks, 5)
+    results = [result for result in attempts(qscheduler, core, tasks) if result is not None]
+    expected = (results[0] if retry_selection == 'first' else min(results, key=lambda result: result[1]))
+    random.seed(0)
+    (trajectory, qtable,) = qscheduler.speculative_retries(core, tasks, 5)
+    assert actions(trajectory) == actions(expected[0])
+    assert len(qtable) == len(expected[3])
+
+def test_parallel_attempts_match_sequential_selection(small_workload):
+    (core, ptasks,) = small_workload
+    tasks = speculative_scheduler('best').extract_tasks_from_ptasks(core.ptasks, 5)
+    random.seed(0)
+    (sequential, qtable,) = speculative_scheduler('best').speculative_retries(core, tasks, 5)
+    random.seed(0)
+    (parallel, qtable,) = speculative_scheduler('best', workers=3).speculative_retries(core, tasks, 5)
+    assert actions(parallel) == actions(sequential)
+
+def test_failed_attempts_raise(small_workload):
+    (core, ptasks,) = small_workload
+    core.allowed_avg_power = 1
+    qscheduler = speculative_scheduler('best', admission_test=False)
+    random.seed(0)
+    with pytest.raises(ValueError, match='Scheduling failed.'):
+        qscheduler.learn_schedule(core, qscheduler.extract_tasks_from_ptasks(core.ptasks, 5), 5)
+    with pytest.raises(ValueError, match='Retry mode is not supported.'):
+        build_scheduler(retry_mode='eager', admission_test=False).learn_schedule(core, qscheduler.extract_tasks_from_ptasks(core.ptasks, 5), 5)
@@ -0,0 +1,65 @@
+import pytest
+from conftest import build_scheduler
+from qstate import QState
+from transition import Transition
+from state_encoder import BucketedStateEncoder, ExactStateEncoder, build_state_encoder
+
+@pytest.fixture
+def model(small_workload):
+    (core, ptasks,) = small_workload
+    qscheduler = build_scheduler()
+    return qscheduler.transition_model(core, qscheduler.extract_tasks_from_ptasks(core.ptasks, 5), 5)
+
+@pytest.fixture
+def encoder(model):
+    return BucketedStateEncoder(0.01, 10, 2, 1000000)
+
+def encode(encoder, model, time=0, task_num=0, dvfs_lock_from=None, consumed_energy=0, delayed=()):
+    dvfs_lock_from = (-model.dvfs_change_lock if dvfs_lock_from is None else dvfs_lock_from)
+    return encoder.encode(QState(time, task_num, 2, dvfs_lock_from, consumed_energy, delayed), Transition.ACTIVE, model)
+
+def test_time_buckets_count_whole_granules_to_the_next_deadline(encoder, model):
+    deadline = model.tasks.deadline.item(0)
+    assert encode(encoder, model, deadline - 1).time == 0
+    assert encode(encoder, model, deadline - 10000).time == 1
+    assert encode(encoder, model, deadline - 10001).time == 1
+    assert encode(encoder, model, deadline - 20000).time == 2
+    assert encode(encoder, model, deadline + 1).time == -1
+    assert encode(encoder, model, deadline, model.no_tasks).time == (model.horizon - deadline) // 10000
+
+def test_lock_buckets_round_the_remaining_lock_up(encoder, model):
+    lock = model.dvfs_change_lock
+    assert encode(encoder, model, lock, dvfs_lock_from=0).dvfs_lock_from == 0
+    assert encode(encoder, model, lock - 1, dvfs_lock_from=0).dvfs_lock_from == 1
+    assert encode(encoder, model, lock - 10000, dvfs_lock_from=0).dvfs_lock_from == 1
+    assert encode(encoder, model, lock - 10001, dvfs_lock_from=0).dvfs_lock_from == 2
+
+def test_energy_buckets_split_the_remaining_budget(encoder, model):
+    budget = model.energy_budget
+    assert encode(encoder, model, consumed_energy=0).consumed_energy == 10
+    assert encode(encoder, model, consumed_energy=budget * 0.9 - 1).consumed_energy == 1
+    assert encode(encoder, model, consumed_energy=budget * 0.9 + 1).consumed_energy == 0
+    assert encode(encoder, model, consumed_energy=budget).consumed_energy == 0
+
+def test_delayed_queue_is_capped(encoder, model):
+    assert encode(encoder, model, task_num=4, delayed=(1, 3, 0,)).delayed == (3, 3, 1,)
+    assert encode(encoder, model, task_num=4, delayed=(1, 3, 2,)) == encode(encoder, model, task_num=4, delayed=(1, 3, 0,))
+    assert encode(encoder, model, task_num=4, delayed=(1, 3,)) != encode(encoder, model, task_num=4, delayed=(1, 3, 0,))
+
+def test_states_in_one_bucket_share_a_key(encoder, model):
+    deadline = model.tasks.deadline.item(0)
+    keys = {encode(encoder, model, time, consumed_energy=energy) for time in range(deadline - 29999, deadline - 19999, 997)
+            for energy in range(1, int(model.energy_budget * 0.1), 7)}
+    assert keys == {QState(2, 0, 2, 0, 9, (0,))}
+    assert encode(encoder, model, deadline - 20000) != encode(encoder, model, deadline - 19999)
+
+def test_terminal_states_and_settings(encoder, model):
+    qstate = QState(5, 1, 2, 0, 3, ())
+    assert encoder.encode(qstate, Transition.FINISHED, model) == BucketedStateEncoder.FINISHED_KEY
+    assert encoder.encode(qstate, Transition.FAILURE, model) == BucketedStateEncoder.FAILURE_KEY
+    assert ExactStateEncoder().encode(qstate, Transition.ACTIVE, model) is qstate
+    assert build_state_encoder('bucketed', 0.01, 10, 2, 1000000).config() == encoder.config()
+    with pytest.raises(ValueError):
+        BucketedStateEncoder(0, 10, 2, 1000000)
+    with pytest.raises(ValueError):
+        build_state_encoder('coarse', 0.01, 10, 2, 1000000)
@@ -0,0 +1,31 @@
+import csv
+from sweep import expand_runs, apply_overrides, drop_unfinished_rows
+
+SWEEP_CONFIG = {'grid': {'simulation.utilization': [0.3, 0.5]}, 'seeds': [0, 1]}
+CONFIGS = {'core': {}, 'qscheduler': {'episodes': 100}, 'simulation': {'utilization': 0.4, 'duration': 5}}
+
+def test_run_ids_are_stable_and_unique():
+    runs = expand_runs(SWEEP_CONFIG, CONFIGS)
+    assert len(runs) == 4
+    assert len({run['run-id'] for run in runs}) == 4
+    assert [run['run-id'] for run in runs] == [run['run-id'] for run in expand_runs(SWEEP_CONFIG, CONFIGS)]
+
+def test_run_ids_change_with_base_configs():
+    changed = apply_overrides(CONFIGS, {'qscheduler.episodes': 200})
+    assert ({run['run-id'] for run in expand_runs(SWEEP_CONFIG, CONFIGS)}.isdisjoint(
+            run['run-id'] for run in expand_runs(SWEEP_CONFIG, changed)))
+
+def test_resume_keeps_rows_under_the_union_of_headers(tmp_path):
+    results_path = str(tmp_path / 'results.csv')
+    with open(results_path, 'w', newline='') as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=['run-id', 'seed', 'simulation.duration', 'record'])
+        writer.writeheader()
+        writer.writerows([{'run-id': 'a', 'seed': 0, 'simulation.duration': 5, 'record': 'core'},
+                          {'run-id': 'b', 'seed': 1, 'simulation.duration': 5, 'record': 'core'}])
+    fieldnames = drop_unfinished_rows(results_path, {'a'}, ['run-id', 'seed', 'simulation.utilization', 'record'])
+    assert fieldnames == ['run-id', 'seed', 'simulation.utilization', 'record', 'simulation.duration']
+    with open(results_path, 'a', newline='') as results_file:
+        csv.DictWriter(results_file, fieldnames=fieldnames).writerow({'run-id': 'c', 'seed': 2, 'simulation.utilization': 0.5, 'record': 'core'})
+    with open(results_path, 'r', newline='') as results_file:
+        rows = list(csv.DictReader(results_file))
+    assert [(row['run-id'], row['simulation.duration'], row['simulation.utilization'],) for row in rows] == [('a', '5', '',), ('c', '', '0.5',)]
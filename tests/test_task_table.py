@@ -0,0 +1,46 @@
+import random
+import numpy as np
+import pytest
+from ptask import PTask
+from priority import Priority
+from task_table import TaskTable
+
+def random_ptasks(seed, no_ptasks):
+    rng = random.Random(seed)
+    return [PTask(ptask_id, rng.randint(1, 1000), rng.choice((250, 500, 750, 1000, 1500)), rng.choice(list(Priority)))
+            for ptask_id in range(no_ptasks)]
+
+def baseline_jobs(ptasks, horizon):
+    jobs = []
+    for ptask in ptasks:
+        time = 0
+        while time + ptask.period < horizon:
+            jobs.append((ptask.id, ptask.ins_count, time, time + ptask.period, ptask.priority))
+            time += ptask.period
+    return sorted(jobs, key=lambda job: job[3])
+
+def table_jobs(tasks: TaskTable):
+    return list(zip(tasks.ptask_id.tolist(), tasks.ins_count.tolist(), tasks.arrival_time.tolist(), tasks.deadline.tolist(),
+                    tasks.priority.tolist()))
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('horizon', [1, 1000, 4500, 10001])
+def test_from_ptasks_matches_baseline(seed, horizon):
+    ptasks = random_ptasks(seed, 7)
+    assert table_jobs(TaskTable.from_ptasks(ptasks, horizon)) == baseline_jobs(ptasks, horizon)
+
+def test_whole_periods_end_at_the_horizon():
+    tasks = TaskTable.from_ptasks(random_ptasks(0, 7), 3000, whole_periods=True)
+    assert tasks.deadline.max() == 3000
+    assert all(np.count_nonzero(tasks.ptask_id == ptask.id) == 3000 // ptask.period for ptask in random_ptasks(0, 7))
+    assert np.all(np.diff(tasks.deadline) >= 0)
+
+def test_empty_ptasks():
+    assert len(TaskTable.from_ptasks([], 1000)) == 0
+
+@pytest.mark.parametrize('horizon', [3000, 7500, 8999])
+def test_tile_repeats_the_window(horizon):
+    ptasks = [PTask(0, 10, 500, Priority.SOFT), PTask(1, 20, 750, Priority.FIRM), PTask(2, 30, 1500, Priority.HARD)]
+    window = TaskTable.from_ptasks(ptasks, 1500, whole_periods=True)
+    tiled = TaskTable.tile(window, 1500, horizon)
+    assert table_jobs(tiled) == table_jobs(TaskTable.from_ptasks(ptasks, horizon, whole_periods=True))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from action import Action, action_mask
+from qstate import QState
+from qtable import QTable
+from trajectory_learner import TrajectoryLearner
+
+MASK = action_mask(Action.SCHEDULE, Action.MISS)
+
+def chain(explored=(False, False, False)):
+    qtable = QTable()
+    state_ids = [qtable.add_state(QState(time, 0, 0, 0, 0, ())) for time in range(4)]
+    for state_id in state_ids[:-1]:
+        qtable.set_actions(state_id, MASK, np.ones(len(Action)))
+    qtable.set_finished(state_ids[-1], 10)
+    trajectory = [(state_ids[step], Action.SCHEDULE, state_ids[step + 1], (MASK if step < 2 else 0), explored[step]) for step in range(3)]
+    return qtable, trajectory
+
+def schedule_qvalues(qtable):
+    return qtable.qvalues[:3, Action.SCHEDULE].tolist()
+
+def test_backward_updates_from_the_last_step():
+    (qtable, trajectory,) = chain()
+    TrajectoryLearner(0.5, 1, 0, 0).learn(qtable, trajectory, True)
+    assert schedule_qvalues(qtable) == [2.125, 3.25, 5.5]
+
+def test_n_step_targets_sum_rewards():
+    (qtable, trajectory,) = chain()
+    TrajectoryLearner(0.5, 3, 0, 0).learn(qtable, trajectory, True)
+    assert schedule_qvalues(qtable) == [6.5, 6.0, 5.5]
+
+def test_n_step_returns_stop_at_exploratory_actions():
+    (qtable, trajectory,) = chain((False, True, False))
+    TrajectoryLearner(0.5, 3, 0, 0).learn(qtable, trajectory, True)
+    assert schedule_qvalues(qtable) == [3.5, 6.0, 5.5]
+
+def test_replay_buffer_keeps_finished_episodes():
+    (qtable, trajectory,) = chain()
+    learner = TrajectoryLearner(0.5, 1, 2, 1)
+    learner.learn(qtable, trajectory, False)
+    assert len(learner.replay_buffer) == 0
+    learner.learn(qtable, trajectory, True)
+    assert len(learner.replay_buffer) == 1
+    assert qtable.qvalues[2, Action.SCHEDULE] == 11 * (1 - 0.5 ** 3)
+
+def test_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TrajectoryLearner(0.5, 0, 0, 0)
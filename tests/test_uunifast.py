@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from uunifast import generate_uunifastdiscard, generate_uunifastdiscard_batch
+
+class StreamRandom:
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def random(self):
+        return self.rng.random()
+
+class RecordingGenerator:
+    def __init__(self, seed):
+        self.rng, self.batch_sizes = np.random.default_rng(seed), []
+
+    def random(self, shape):
+        self.batch_sizes.append(shape[0])
+        return self.rng.random(shape)
+
+def test_batch_sets_sum_to_utilization():
+    sets = generate_uunifastdiscard_batch(5000, 2.5, 8, np.random.default_rng(0))
+    assert sets.shape == (5000, 8)
+    assert np.allclose(sets.sum(axis=1), 2.5)
+    assert (sets >= 0).all() and (sets <= 1).all()
+    assert np.allclose(sets.mean(axis=0), 2.5 / 8, atol=0.01)
+
+def test_batch_matches_scalar_generator_on_the_same_stream():
+    batch = generate_uunifastdiscard_batch(200, 2.5, 8, np.random.default_rng(3))
+    scalar = generate_uunifastdiscard(200, 2.5, 8, StreamRandom(3))
+    assert np.allclose(batch, np.array(scalar))
+
+def test_batch_rows_are_capped_by_element_count():
+    rng = RecordingGenerator(0)
+    sets = generate_uunifastdiscard_batch(3000, 5, 10, rng, max_elements=1000)
+    assert len(sets) == 3000
+    assert max(rng.batch_sizes) == 1000 // 11
+
+def test_batch_fails_when_no_set_is_accepted():
+    with pytest.raises(ValueError):
+        generate_uunifastdiscard_batch(10, 9, 10, np.random.default_rng(0), max_elements=1 << 12)